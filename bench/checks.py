@@ -0,0 +1,259 @@
+# ==========================================
+# CHECKS: skenario regresi kebenaran data terhadap SQLiteBackend
+# Contoh:
+#   python -m bench.checks            # semua skenario
+#   python -m bench.checks tombstone  # skenario yang namanya mengandung kata ini
+# Tiap skenario memakai database :memory: sendiri dan mem-configure ulang service.
+# Exit code 1 bila ada skenario yang gagal.
+# ==========================================
+
+import sys
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import pandas as pd
+
+from bench.datagen import make_inventory
+from sn_tracker import service
+from sn_tracker.backends import create_backend
+from sn_tracker.utils import ttl_cache
+
+CHECKS = []
+
+
+def check(fn):
+    CHECKS.append(fn)
+    return fn
+
+
+def fresh(n=200, seed=0):
+    """Backend SQLite baru berisi n SN sintetis, sudah dipasang ke service."""
+    db = create_backend('sqlite')
+    inv = make_inventory(n, seed)
+    db.table('inventory').insert(inv.to_dict('records')).execute()
+    service.configure(db)
+    return db, inv
+
+
+@check
+def tombstone_reinsert():
+    """SN yang dihapus lalu diinsert ulang tetap ada di store setelah tombstone-nya lewat overlap."""
+    db, inv = fresh()
+    store = service.inventory_store(); store.snapshot()
+    store.overlap = 0.5   # jendela overlap dipersingkat supaya skenario cukup beberapa detik
+    x = inv.iloc[0].to_dict()
+    db.table('inventory').delete().eq('sn', x['sn']).execute(); store.sync()
+    assert x['sn'] not in set(store.df['sn']), "delete tidak tersinkron"
+    db.table('inventory').insert([x]).execute(); store.sync()
+    assert not db.table('inventory_deleted').select('sn').eq('sn', x['sn']).execute().data, "tombstone tidak dibuang saat insert ulang"
+    # Tombstone basi dari server yang belum punya trigger pembersih: store tetap harus menyaringnya
+    stale = store.deleted_hwm.isoformat()
+    db.table('inventory_deleted').insert([{'sn': x['sn'], 'deleted_at': stale}]).execute()
+    for i in range(3):
+        time.sleep(0.7)
+        db.table('inventory').update({'price': 1000 + i}).eq('sn', inv.iloc[5 + i]['sn']).execute(); store.sync()
+        assert x['sn'] in set(store.df['sn']), f"SN insert ulang hilang dari store setelah sync ke-{i + 1}"
+
+
+@check
+def cold_store_write():
+    """Tulis pertama setelah restart (store belum di-load) tidak menjadikan baris baru satu-satunya isi store."""
+    fresh(n=2000)
+    service.add_stock_batch('cek', 'BRAND', 'SKU BARU', 1000, ['NEW1'])
+    df = service.get_inventory_df()
+    assert len(df) == 2001, f"store berisi {len(df)} baris, bukan 2001"
+    assert 'NEW1' in set(df['sn'])
+
+
+@check
+def derived_write_during_build():
+    """Tulis yang masuk selama build tidak membuat hasil derived basi tersimpan sebagai versi terkini."""
+    fresh()
+    store = service.inventory_store(); store.snapshot()
+    sn = service.get_inventory_df(service.READY_COLS, status='Ready')['sn'].iloc[0]
+    def build(df):
+        ready = set(df.loc[df['status'] == 'Ready', 'sn'])
+        store.update([sn], {'status': 'Sold'})   # checkout kasir lain di tengah build
+        return ready
+    assert sn in store.derived('ready_sns', build)
+    assert sn not in store.derived('ready_sns', lambda df: set(df.loc[df['status'] == 'Ready', 'sn'])), "SN terjual masih dianggap Ready"
+    assert sn not in set(service.get_inventory_df(status='Ready')['sn'])
+
+
+@check
+def import_rejects_bad_price():
+    """Harga yang tidak terbaca dilaporkan gagal, bukan disimpan sebagai Rp 0."""
+    fresh(n=10)
+    df = pd.DataFrame({'brand': ['B'] * 5, 'sku': ['S'] * 5, 'sn': [f"HRG{i}" for i in range(5)],
+                       'price': ['6000000', '6.000.000', 'Rp 6.000.000', '', '5500000.0']})
+    res = service.import_stock_from_df('cek', df)
+    assert res['added'] == 2 and res['failed_rows'] == 3, res
+    assert {f['sn_awal'] for f in res['failed']} == {'HRG1', 'HRG2', 'HRG3'}, res['failed']
+    rows = service.supabase.table('inventory').select('sn,price').in_('sn', df['sn'].tolist()).execute().data
+    stored = {r['sn']: r['price'] for r in rows}
+    assert stored == {'HRG0': 6000000, 'HRG4': 5500000}, stored
+
+
+@check
+def checkout_retry_same_key():
+    """Retry bersamaan dengan idempotency key yang sama = satu transaksi, keduanya sukses tanpa konflik."""
+    fresh()
+    ready = service.get_inventory_df(service.READY_COLS, status='Ready').head(2).to_dict('records')
+    cart = [dict(r, price=int(r['price'])) for r in ready]
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(lambda _: service.process_checkout('cek', cart, 'key-retry'), range(4)))
+    assert {tid for tid, _, _ in results} == {results[0][0]} and results[0][0], results
+    assert all(not konflik for _, _, konflik in results), results
+    assert service.count_rows('transactions') == 1
+
+
+@check
+def queued_checkout_holds_sns():
+    """Checkout yang masih di antrean menahan reservasinya; konflik saat flush tetap melepasnya."""
+    fresh()
+    q = service.enable_checkout_queue(':memory:'); q.stop()   # flush manual lewat flush_once
+    try:
+        ready = service.get_inventory_df(service.READY_COLS, status='Ready').head(2).to_dict('records')
+        a, b = [dict(r, price=int(r['price'])) for r in ready]
+        for key, item in (('key-ok', a), ('key-konflik', b)):
+            assert service.reserve_cart('A', [item])[0], "reservasi awal ditolak"
+            tid, _, _ = service.process_checkout('A', [item], key)
+            assert tid and q.get(key)['status'] == 'pending'
+            service.release_after_checkout('A', [item['sn']], key)
+            assert service._reserve('B', [item['sn']])[item['sn']]['held_by_other'], "SN pending bisa direservasi kasir lain"
+        # Kasir lain menjual SN b langsung ke server sebelum antrean sempat flush
+        service.supabase.rpc('checkout', {'p_trx_id': 'LAIN', 'p_user': 'B', 'p_items': [b], 'p_idempotency_key': 'key-lain'}).execute()
+        q.flush_once()
+        assert q.get('key-ok')['status'] == 'synced' and q.get('key-konflik')['status'] == 'conflict'
+        for item in (a, b):
+            assert not service._reserve('B', [item['sn']])[item['sn']]['held_by_other'], "reservasi tidak dilepas setelah final"
+        assert [c['idempotency_key'] for c in service.checkout_conflicts()] == ['key-konflik']
+    finally:
+        service.disable_checkout_queue()
+
+
+@check
+def bulk_status_keeps_sold():
+    """SN Sold tidak bisa dikembalikan ke Ready lewat ubah status massal (cegah jual dua kali)."""
+    fresh()
+    ready = service.get_inventory_df(service.READY_COLS, status='Ready').head(2).to_dict('records')
+    cart = [dict(r, price=int(r['price'])) for r in ready]
+    tid, _, _ = service.process_checkout('cek', cart)
+    assert tid
+    changed, skipped = service.bulk_set_status([x['sn'] for x in cart] + ['TIDAKADA'], 'Ready')
+    assert (changed, skipped) == (0, 3), (changed, skipped)
+    assert set(service.find_sn(x['sn'])[1] for x in cart) == {'Sold'}
+    _, _, konflik = service.process_checkout('cek', cart)
+    assert sorted(konflik) == sorted(x['sn'] for x in cart), "SN terjual bisa di-checkout lagi"
+
+
+@check
+def full_load_delete_during_fetch():
+    """Hapus di tengah full load tidak membuat baris lain terlewat (halaman keyset, bukan OFFSET)."""
+    db, inv = fresh(n=2000)
+    bounds = service._key_bounds
+    doomed = list(inv['sn'].sort_values().iloc[150:450])
+    def bounds_then_delete(*args):
+        out = bounds(*args)
+        db.table('inventory').delete().in_('sn', doomed).execute()   # admin menghapus selagi halaman diambil
+        return out
+    service._key_bounds = bounds_then_delete
+    try: df = service.fetch_table_df('inventory', service.STORE_INVENTORY_COLS, page_size=100)
+    finally: service._key_bounds = bounds
+    missing = set(inv['sn']) - set(doomed) - set(df['sn'])
+    assert not missing, f"{len(missing)} SN terlewat"
+    assert df['sn'].is_unique
+
+
+@check
+def archived_sales_still_counted():
+    """Transaksi yang diarsipkan tetap masuk omzet total, riwayat, dan detail transaksi."""
+    fresh()
+    ready = service.get_inventory_df(service.READY_COLS, status='Ready').head(3).to_dict('records')
+    tids = [service.process_checkout('cek', [dict(r, price=int(r['price']))])[0] for r in ready]
+    before = service.get_history_summary()
+    moved = service.archive_sold(date.today() + timedelta(days=2))   # lewati selisih hari UTC vs WIB
+    assert moved['transactions'] == 3, moved
+    assert service.get_history_summary() == before, (service.get_history_summary(), before)
+    df, _ = service.get_history_page()
+    assert set(tids) <= set(df['trx_id']), "transaksi arsip hilang dari riwayat"
+    assert service.get_transaction_detail(tids[0]) is not None
+
+
+@check
+def reset_clears_archive():
+    """Hapus riwayat / reset pabrik ikut mengosongkan arsip, jadi omzet & riwayat ikut nol."""
+    for reset in (lambda: service.factory_reset('transactions'), service.factory_reset_all):
+        fresh()
+        ready = service.get_inventory_df(service.READY_COLS, status='Ready').head(2).to_dict('records')
+        for r in ready: service.process_checkout('cek', [dict(r, price=int(r['price']))])
+        service.archive_sold(date.today() + timedelta(days=2))
+        service.reserve_cart('keranjang', service.get_inventory_df(service.READY_COLS, status='Ready').head(1).to_dict('records'))
+        reset()
+        assert service.get_history_summary() == {'omzet': 0, 'count': 0}, service.get_history_summary()
+        assert service.get_history_page()[0].empty, "transaksi arsip masih muncul di riwayat"
+        semua = reset is service.factory_reset_all
+        assert (service.count_rows('inventory_archive') == 0) == semua, "arsip inventory salah ikut/tidak ikut direset"
+
+
+@check
+def history_cursor_ties():
+    """Halaman riwayat tidak melewatkan transaksi yang timestamp-nya sama di batas halaman."""
+    db, _ = fresh(n=10)
+    ts = '2026-01-01T10:00:00+00:00'
+    rows = [{'trx_id': f"TRX-{i:03d}", 'timestamp': ts if i % 10 else '2026-01-01T09:00:00+00:00', 'user': 'cek',
+             'total_bill': 1000, 'items_count': 1, 'item_details': [], 'idempotency_key': f"k{i}"} for i in range(45)]
+    db.table('transactions').insert(rows).execute()
+    seen, cursor = [], None
+    while True:
+        df, cursor = service.get_history_page(cursor=cursor, limit=7)
+        seen += df['trx_id'].tolist()
+        if cursor is None: break
+    assert len(seen) == len(set(seen)) == 45, f"{45 - len(set(seen))} transaksi terlewat, {len(seen) - len(set(seen))} dobel"
+
+
+@check
+def ttl_cache_evicts():
+    """ttl_cache tidak menumpuk entri kedaluwarsa maupun lock per argumen."""
+    @ttl_cache(0.05)
+    def square(x): return x * x
+    for i in range(100): square(i)
+    assert square.cache_info() == {'memo': 100, 'inflight': 0}, square.cache_info()
+    time.sleep(0.06)
+    assert square(1000) == 10 ** 6
+    assert square.cache_info() == {'memo': 1, 'inflight': 0}, square.cache_info()
+    @ttl_cache(60)
+    def boom(x): raise ValueError(x)
+    for i in range(5):
+        try: boom(i)
+        except ValueError: pass
+    assert boom.cache_info() == {'memo': 0, 'inflight': 0}, boom.cache_info()
+    # clear() di tengah panggilan (mis. checkout selesai saat query riwayat jalan): hasil lama tidak disimpan
+    calls = []
+    @ttl_cache(60)
+    def slow(x):
+        calls.append(x)
+        if len(calls) == 1: slow.clear()
+        return len(calls)
+    assert slow(1) == 1 and slow(1) == 2, "hasil dari sebelum clear() tersimpan"
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    selected = [c for c in CHECKS if not argv or any(a in c.__name__ for a in argv)]
+    failed = 0
+    for c in selected:
+        t = time.perf_counter()
+        try: c(); status = "OK"
+        except Exception:
+            failed += 1; status = "GAGAL"
+            traceback.print_exc()
+        print(f"  {c.__name__:<32} {status:<6} {time.perf_counter() - t:6.2f}s", flush=True)
+    print(f"{len(selected) - failed}/{len(selected)} skenario lolos.")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,76 @@
+# ==========================================
+# DATAGEN: inventory & transaksi sintetis dengan skew brand/SKU realistis
+# Popularitas brand dan SKU mengikuti Zipf: sedikit brand/SKU mendominasi stok.
+# ==========================================
+
+import numpy as np
+import pandas as pd
+
+BRANDS = ['SAMSUNG', 'APPLE', 'XIAOMI', 'OPPO', 'VIVO', 'REALME', 'INFINIX', 'ASUS',
+          'LENOVO', 'HUAWEI', 'NOKIA', 'TECNO', 'POCO', 'ADVAN', 'SONY', 'JBL']
+STATUS_MIX = {'Ready': 0.75, 'Sold': 0.22, 'Returned': 0.02, 'Defective': 0.01}
+SKUS_PER_BRAND = 60
+HISTORY_DAYS = 365
+
+
+def _zipf_weights(n, s=1.1):
+    w = 1.0 / np.arange(1, n + 1) ** s
+    return w / w.sum()
+
+def make_catalog(seed=0):
+    """Daftar (brand, sku, price) — tiap brand punya SKU dengan harga tetap."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for b in BRANDS:
+        for i in range(SKUS_PER_BRAND):
+            price = int(rng.integers(8, 400)) * 50_000
+            rows.append((b, f"{b[:3]}-{i:03d} {rng.choice(['4/64', '6/128', '8/256', '12/512'])}", price))
+    return pd.DataFrame(rows, columns=['brand', 'sku', 'price'])
+
+def _pick_products(catalog, n, rng):
+    brand_w = _zipf_weights(len(BRANDS))
+    sku_w = _zipf_weights(SKUS_PER_BRAND, 1.3)
+    b = rng.choice(len(BRANDS), size=n, p=brand_w)
+    s = rng.choice(SKUS_PER_BRAND, size=n, p=sku_w)
+    return catalog.iloc[b * SKUS_PER_BRAND + s].reset_index(drop=True)
+
+def make_sns(n, rng, prefix="SN"):
+    codes = rng.choice(16 ** 11, size=n, replace=False)
+    return [f"{prefix}{c:011X}" for c in codes]
+
+def make_inventory(n, seed=0, now=None):
+    """DataFrame n SN: sn, brand, sku, price, status, created_at, sold_at."""
+    rng = np.random.default_rng(seed)
+    now = pd.Timestamp(now or pd.Timestamp.now(tz='UTC'))
+    df = _pick_products(make_catalog(seed), n, rng)
+    df.insert(0, 'sn', make_sns(n, rng))
+    df['status'] = rng.choice(list(STATUS_MIX), size=n, p=list(STATUS_MIX.values()))
+    age = pd.to_timedelta(rng.integers(0, HISTORY_DAYS * 86400, size=n), unit='s')
+    created = now - age
+    sold = created + (age * rng.random(n))
+    df['created_at'] = created.strftime('%Y-%m-%dT%H:%M:%S.%f+00:00')
+    df['sold_at'] = np.where(df['status'] == 'Sold', sold.strftime('%Y-%m-%dT%H:%M:%S.%f+00:00'), None)
+    return df
+
+def make_transactions(inventory, seed=0, max_items=3):
+    """Kelompokkan SN Sold jadi transaksi 1..max_items item (urut waktu jual)."""
+    rng = np.random.default_rng(seed + 1)
+    sold = inventory[inventory['status'] == 'Sold'].sort_values('sold_at')
+    out, i, n = [], 0, len(sold)
+    recs = sold[['sn', 'brand', 'sku', 'price', 'sold_at']].to_dict('records')
+    while i < n:
+        k = int(rng.integers(1, max_items + 1))
+        items = recs[i:i + k]; i += k
+        out.append({'trx_id': f"TRX-BENCH-{len(out):08d}", 'timestamp': items[0]['sold_at'], 'user': 'kasir',
+                    'total_bill': sum(int(x['price']) for x in items), 'items_count': len(items),
+                    'item_details': [{'sn': x['sn'], 'brand': x['brand'], 'sku': x['sku'], 'price': int(x['price'])} for x in items]})
+    return out
+
+def make_import_df(n, existing_sns, dup_rate=0.05, seed=1):
+    """Sheet upload n baris dengan sebagian SN yang sudah ada di DB (harus ditolak sebagai duplikat)."""
+    rng = np.random.default_rng(seed)
+    df = _pick_products(make_catalog(0), n, rng)
+    sns = make_sns(n, rng, prefix="IM")
+    n_dup = min(int(n * dup_rate), len(existing_sns))
+    if n_dup: sns[:n_dup] = list(rng.choice(np.asarray(existing_sns, dtype=object), size=n_dup, replace=False))
+    return pd.DataFrame({'SN': sns, 'Brand': df['brand'], 'SKU': df['sku'], 'Price': df['price']})
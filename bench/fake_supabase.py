@@ -0,0 +1,462 @@
+# ==========================================
+# FAKE SUPABASE: stand-in PostgREST di dalam proses untuk benchmark
+# Meniru bagian API supabase-py yang dipakai sn_tracker.service (table/select/
+# filter/order/range/limit/insert/update/delete/rpc) plus view stock_summary /
+# stock_aging / transactions_all, rollup sql/008, penanda perubahan sql/009 dan RPC di sql/. Setiap execute() dihitung & bisa diberi latency jaringan.
+# ==========================================
+
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from functools import lru_cache
+from itertools import islice
+
+import pandas as pd
+
+from sn_tracker.backends import parse_or
+
+PRIMARY_KEYS = {'inventory': 'sn', 'transactions': 'trx_id', 'import_logs': 'id',
+                'inventory_archive': 'sn', 'transactions_archive': 'trx_id', 'inventory_deleted': 'sn'}
+TIMESTAMP_COLS = {'created_at', 'sold_at', 'updated_at', 'timestamp', 'deleted_at'}
+TOUCH_UPDATED_AT = {'inventory'}   # trigger sql/001
+ROLLUPS = {'transactions': 'sales_daily', 'inventory': 'intake_daily'}   # trigger sql/008
+LOCAL_OFFSET = pd.Timedelta(hours=7)   # WIB
+
+
+class FakeAPIError(Exception):
+    pass
+
+
+class FakeResponse:
+    def __init__(self, data, count=None):
+        self.data, self.count = data, count
+
+
+@lru_cache(maxsize=4096)
+def _ts(value):
+    """Normalisasi timestamp ke ISO UTC seragam supaya bisa dibanding sebagai string."""
+    ts = pd.Timestamp(value)
+    ts = ts.tz_localize('UTC') if ts.tzinfo is None else ts.tz_convert('UTC')
+    return ts.strftime('%Y-%m-%dT%H:%M:%S.%f+00:00')
+
+def _norm(col, value):
+    if value is None or col not in TIMESTAMP_COLS: return value
+    if isinstance(value, float) and value != value: return None
+    if isinstance(value, str) and len(value) == 32 and value.endswith('+00:00'): return value   # sudah seragam
+    return _ts(value)
+
+@lru_cache(maxsize=65536)
+def _local_day(utc_hour):
+    """'YYYY-MM-DDTHH' UTC -> tanggal lokal toko (cukup sampai jam karena offset WIB bulat)."""
+    return (pd.Timestamp(utc_hour + ':00') + LOCAL_OFFSET).strftime('%Y-%m-%d')
+
+@lru_cache(maxsize=65536)
+def _period(day, grain):
+    if grain == 'day': return day
+    d = pd.Timestamp(day)
+    return (d - pd.Timedelta(days=d.weekday()) if grain == 'week' else d.replace(day=1)).strftime('%Y-%m-%d')
+
+def _now():
+    return _ts(pd.Timestamp.now(tz='UTC'))
+
+
+class _Table:
+    def __init__(self, key):
+        self.key = key
+        self.rows = {}
+        self._keys = []
+        self._dirty = False
+
+    def keys(self):
+        if self._dirty: self._keys, self._dirty = sorted(self.rows), False
+        return self._keys
+
+    def put(self, row):
+        if row[self.key] not in self.rows: self._dirty = True
+        self.rows[row[self.key]] = row
+
+    def pop(self, key):
+        self._dirty = True
+        return self.rows.pop(key)
+
+
+_OPS = {
+    'eq': lambda a, b: a == b, 'neq': lambda a, b: a != b,
+    'gt': lambda a, b: a is not None and a > b, 'gte': lambda a, b: a is not None and a >= b,
+    'lt': lambda a, b: a is not None and a < b, 'lte': lambda a, b: a is not None and a <= b,
+    'in_': lambda a, b: a in b,
+}
+
+
+def _like(pattern):
+    p = pattern.upper()
+    if p.startswith('%') and p.endswith('%'): return lambda v: v is not None and p[1:-1] in str(v).upper()
+    if p.endswith('%'): return lambda v: v is not None and str(v).upper().startswith(p[:-1])
+    return lambda v: v is not None and str(v).upper() == p
+
+def _logic(node):
+    """Pohon parse_or -> predikat baris."""
+    if node[0] in ('and', 'or'):
+        tests, combine = [_logic(x) for x in node[1]], all if node[0] == 'and' else any
+        return lambda r: combine(t(r) for t in tests)
+    op, col, val = node
+    test, val = _OPS[op], _norm(col, val)
+    return lambda r: test(r.get(col), val)
+
+def _keep(cand, op, col, val):
+    if op == 'ilike': return (r for r in cand if val(r.get(col)))
+    if op == 'or_': return (r for r in cand if val(r))
+    test = _OPS[op]
+    return (r for r in cand if test(r.get(col), val))
+
+
+class _Query:
+    """Builder berantai; dieksekusi oleh FakeSupabase.execute()."""
+
+    def __init__(self, db, table):
+        self._db, self.table = db, table
+        self.op, self.payload, self.columns, self.count = 'select', None, None, None
+        self.filters, self.orders, self.offset, self.limit_n = [], [], 0, None
+
+    # --- operasi ---
+    def select(self, columns="*", count=None):
+        self.columns = None if columns.strip() == "*" else [c.strip() for c in columns.split(",")]
+        self.count = count
+        return self
+
+    def insert(self, rows):
+        self.op, self.payload = 'insert', rows if isinstance(rows, list) else [rows]
+        return self
+
+    def update(self, changes):
+        self.op, self.payload = 'update', changes
+        return self
+
+    def delete(self):
+        self.op = 'delete'
+        return self
+
+    # --- filter ---
+    def _filter(self, op, col, val):
+        val = [_norm(col, v) for v in val] if op == 'in_' else _norm(col, val)
+        self.filters.append((op, col, set(val) if op == 'in_' else val))
+        return self
+
+    def eq(self, col, val): return self._filter('eq', col, val)
+    def neq(self, col, val): return self._filter('neq', col, val)
+    def gt(self, col, val): return self._filter('gt', col, val)
+    def gte(self, col, val): return self._filter('gte', col, val)
+    def lt(self, col, val): return self._filter('lt', col, val)
+    def lte(self, col, val): return self._filter('lte', col, val)
+    def in_(self, col, vals): return self._filter('in_', col, list(vals))
+
+    def ilike(self, col, pattern):
+        self.filters.append(('ilike', col, _like(pattern)))
+        return self
+
+    def or_(self, filters):
+        self.filters.append(('or_', None, _logic(parse_or(filters))))
+        return self
+
+    # --- urutan & halaman ---
+    def order(self, col, desc=False):
+        self.orders.append((col, desc))
+        return self
+
+    def limit(self, n):
+        self.limit_n = n
+        return self
+
+    def range(self, start, end):
+        self.offset, self.limit_n = start, end - start + 1
+        return self
+
+    def execute(self):
+        return self._db.execute(self)
+
+
+class _Rpc:
+    def __init__(self, db, fn, params):
+        self._db, self.fn, self.params = db, fn, params
+
+    def execute(self):
+        return self._db.call(self.fn, self.params)
+
+
+class FakeSupabase:
+    """Client palsu thread-safe. `latency` (detik) disimulasikan per round trip di luar lock,
+    jadi request paralel tetap saling tumpang tindih seperti ke server asli."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self._lock = threading.RLock()
+        self._tables = {name: _Table(key) for name, key in PRIMARY_KEYS.items()}
+        self.requests = Counter()
+        self._next_log_id = 1
+        self._rollups = {name: {} for name in ROLLUPS.values()}
+        self._version = {'version': 0, 'reset': 0}
+        self._reservations = {}   # sn -> (holder, kedaluwarsa epoch)
+
+    # --- API supabase-py ---
+    def table(self, name):
+        return _Query(self, name)
+
+    def rpc(self, fn, params=None):
+        return _Rpc(self, fn, params or {})
+
+    # --- utilitas benchmark ---
+    def load(self, table, rows):
+        """Isi tabel langsung (tanpa dihitung sebagai request)."""
+        with self._lock:
+            t = self._tables[table]
+            rows = [{c: _norm(c, v) for c, v in r.items()} for r in rows]
+            for r in rows: t.put(r)
+            self._rollup(table, rows)
+
+    def reset_counters(self):
+        with self._lock: self.requests.clear()
+
+    def request_count(self):
+        with self._lock: return sum(self.requests.values())
+
+    def rows(self, table):
+        with self._lock: return len(self._tables[table].rows)
+
+    # --- eksekusi ---
+    def _roundtrip(self, label):
+        with self._lock: self.requests[label] += 1
+        if self.latency: time.sleep(self.latency)
+
+    def execute(self, q):
+        self._roundtrip(f"{q.table}.{q.op}")
+        with self._lock:
+            if q.table == 'stock_summary': return self._select(self._stock_summary(), None, q)
+            if q.table == 'stock_aging': return self._select(self._stock_aging(), None, q)
+            if q.table == 'transactions_all': return self._select(self._transactions_all(), None, q)
+            if q.table == 'inventory_version': return self._select([dict(self._version)], None, q)
+            if q.table in self._rollups and q.op == 'select':
+                value = 'revenue' if q.table == 'sales_daily' else 'value'
+                rows = [{'day': d, 'brand': b, 'sku': k, 'units': u, value: v} for (d, b, k), (u, v) in self._rollups[q.table].items()]
+                return self._select(rows, None, q)
+            if q.table not in self._tables: raise FakeAPIError(f'relation "{q.table}" does not exist')
+            t = self._tables[q.table]
+            if q.op == 'insert': return FakeResponse(self._insert(q.table, t, q.payload))
+            if q.op == 'select': return self._select(t.rows, t, q)
+            hits = list(self._match(t.rows, t, q.filters))
+            if q.op == 'delete':
+                out = [dict(t.pop(r[t.key])) for r in hits]
+                self._changed(q.table, [r[t.key] for r in out])
+                return FakeResponse(out)
+            changes = {c: _norm(c, v) for c, v in q.payload.items()}
+            if q.table in TOUCH_UPDATED_AT: changes['updated_at'] = _now()
+            for r in hits: r.update(changes)
+            self._changed(q.table)
+            return FakeResponse([dict(r) for r in hits])
+
+    def _changed(self, name, deleted=(), inserted=()):
+        """Padanan trigger sql/009: naikkan versi inventory, catat tombstone SN yang dihapus dan
+        buang tombstone SN yang diinsert ulang."""
+        if name != 'inventory': return
+        self._version['version'] += 1
+        tomb = self._tables['inventory_deleted']
+        for sn in inserted:
+            if sn in tomb.rows: tomb.pop(sn)
+        if deleted:
+            now, tomb = _now(), self._tables['inventory_deleted']
+            for sn in deleted: tomb.put({'sn': sn, 'deleted_at': now})
+
+    def _insert(self, name, t, rows):
+        now = _now()
+        out = []
+        for r in rows:
+            r = {c: _norm(c, v) for c, v in r.items()}
+            if name == 'import_logs' and 'id' not in r: r['id'] = self._next_log_id; self._next_log_id += 1
+            if t.key not in r: raise FakeAPIError(f'null value in column "{t.key}"')
+            if r[t.key] in t.rows: raise FakeAPIError(f'duplicate key value violates unique constraint "{name}_pkey"')
+            if name in TOUCH_UPDATED_AT: r['updated_at'] = now
+            out.append(r)
+        for r in out: t.put(r)
+        self._rollup(name, out)
+        self._changed(name, inserted=[r[t.key] for r in out])
+        return [dict(r) for r in out]
+
+    def _rollup(self, name, rows):
+        """Padanan trigger sql/008: tambah unit & nilai ke rollup harian (hari lokal toko)."""
+        if name not in ROLLUPS: return
+        agg = self._rollups[ROLLUPS[name]]
+        if name == 'transactions':
+            lines = ((r['timestamp'], x) for r in rows for x in r.get('item_details') or [])
+        else:
+            lines = ((r.get('created_at') or _now(), r) for r in rows)
+        for ts, x in lines:
+            key = (_local_day(ts[:13]), x.get('brand') or '', x.get('sku') or '')
+            units, value = agg.get(key, (0, 0))
+            agg[key] = (units + 1, value + int(x.get('price') or 0))
+
+    def _match(self, rows, t, filters):
+        """Kandidat lewat primary key bila bisa (eq/in_/rentang pada kunci terurut), sisanya scan."""
+        key = t.key if t is not None else None
+        rest = list(filters)
+        for f in filters:
+            op, col, val = f
+            if col == key and op in ('eq', 'in_'):
+                rest.remove(f)
+                cand = [rows[k] for k in ([val] if op == 'eq' else sorted(val)) if k in rows]
+                break
+        else:
+            if key is not None:
+                keys = t.keys()
+                lo, hi = 0, len(keys)
+                for f in filters:
+                    op, col, val = f
+                    if col != key or op not in ('gt', 'gte', 'lt', 'lte'): continue
+                    rest.remove(f)
+                    if op == 'gt': lo = max(lo, bisect_right(keys, val))
+                    elif op == 'gte': lo = max(lo, bisect_left(keys, val))
+                    elif op == 'lt': hi = min(hi, bisect_left(keys, val))
+                    else: hi = min(hi, bisect_right(keys, val))
+                cand = (rows[k] for k in keys[lo:hi])
+            else:
+                cand = iter(rows.values() if isinstance(rows, dict) else rows)
+        # Satu generator per filter lewat _keep, supaya op/col/val tiap filter terikat sendiri
+        for op, col, val in rest: cand = _keep(cand, op, col, val)
+        return cand
+
+    def _select(self, rows, t, q):
+        hits = self._match(rows, t, q.filters)
+        end = None if q.limit_n is None else q.offset + q.limit_n
+        pk_order = t is not None and (not q.orders or q.orders == [(t.key, False)])
+        if pk_order and q.count != 'exact':
+            # Urutan kunci sudah benar: cukup ambil window-nya, tanpa materialisasi semua kandidat
+            page = list(islice(hits, q.offset, end))
+            count = None
+        else:
+            hits = list(hits)
+            if not pk_order:
+                for col, desc in reversed(q.orders):
+                    hits.sort(key=lambda r: (r.get(col) is None, r.get(col) if r.get(col) is not None else 0), reverse=desc)
+            count = len(hits) if q.count == 'exact' else None
+            page = hits[q.offset:end]
+        cols = q.columns
+        return FakeResponse([{c: r.get(c) for c in cols} if cols else dict(r) for r in page], count)
+
+    def _stock_aging(self):
+        now = pd.Timestamp.now(tz='UTC')
+        agg = Counter()
+        for r in self._tables['inventory'].rows.values():
+            if r['status'] != 'Ready': continue
+            age = (now - pd.Timestamp(r['created_at'])).days if r.get('created_at') else 10 ** 6
+            bucket = 0 if age <= 30 else 31 if age <= 60 else 61 if age <= 90 else 91 if age <= 180 else 181
+            agg[(r['brand'], r['sku'], bucket, 'units')] += 1
+            agg[(r['brand'], r['sku'], bucket, 'value')] += int(r['price'])
+        return [{'brand': b, 'sku': s, 'age_from': a, 'units': n, 'value': agg[(b, s, a, 'value')]}
+                for (b, s, a, k), n in agg.items() if k == 'units']
+
+    def _transactions_all(self):
+        return [*self._tables['transactions'].rows.values(), *self._tables['transactions_archive'].rows.values()]
+
+    def _stock_summary(self):
+        units = Counter((r['brand'], r['sku'], r['price']) for r in self._tables['inventory'].rows.values() if r['status'] == 'Ready')
+        return [{'brand': b, 'sku': s, 'price': p, 'units': n} for (b, s, p), n in units.items()]
+
+    # --- RPC (padanan fungsi di sql/) ---
+    def call(self, fn, params):
+        self._roundtrip(f"rpc.{fn}")
+        handler = getattr(self, f"_rpc_{fn}", None)
+        if handler is None: raise FakeAPIError(f"function {fn} does not exist")
+        with self._lock: return FakeResponse(handler(**params))
+
+    def _rpc_checkout(self, p_trx_id, p_user, p_items, p_idempotency_key, p_sold_at=None):
+        trx = self._tables['transactions']
+        prev = next((r for r in trx.rows.values() if r.get('idempotency_key') == p_idempotency_key), None)
+        if prev:
+            return {'status': 'duplicate', 'trx_id': prev['trx_id'], 'total': prev['total_bill'], 'sold_at': prev['timestamp'], 'conflicts': []}
+        inv = self._tables['inventory'].rows
+        sns = [x['sn'] for x in p_items]
+        conflicts = [s for s in sns if s not in inv or inv[s]['status'] != 'Ready']
+        if conflicts: return {'status': 'conflict', 'conflicts': conflicts}
+        now = _norm('sold_at', p_sold_at) or _now()
+        for s in sns: inv[s].update({'status': 'Sold', 'sold_at': now, 'updated_at': _now()})
+        total = sum(int(x['price']) for x in p_items)
+        row = {'trx_id': p_trx_id, 'timestamp': now, 'user': p_user, 'total_bill': total,
+               'items_count': len(sns), 'item_details': p_items, 'idempotency_key': p_idempotency_key}
+        trx.put(row)
+        self._rollup('transactions', [row])
+        self._changed('inventory')
+        return {'status': 'ok', 'trx_id': p_trx_id, 'total': total, 'sold_at': now, 'conflicts': []}
+
+    def _rpc_checkout_batch(self, p_batch):
+        return [dict(self._rpc_checkout(x['trx_id'], x['user'], x['items'], x['idempotency_key'], x.get('sold_at')),
+                     idempotency_key=x['idempotency_key']) for x in p_batch]
+
+    def _rpc_transactions_summary(self, p_from=None, p_to=None):
+        p_from, p_to = _norm('timestamp', p_from), _norm('timestamp', p_to)
+        bills = [r['total_bill'] for r in self._transactions_all()
+                 if (p_from is None or r['timestamp'] >= p_from) and (p_to is None or r['timestamp'] < p_to)]
+        return {'omzet': sum(bills), 'count': len(bills)}
+
+    def _rpc_sales_rollup(self, p_from=None, p_to=None, p_grain='day'):
+        out = {}
+        for name, cols in (('sales_daily', ('units_sold', 'revenue')), ('intake_daily', ('units_in', 'value_in'))):
+            for (day, brand, sku), (units, value) in self._rollups[name].items():
+                if (p_from and day < p_from) or (p_to and day > p_to): continue
+                period = _period(day, p_grain)
+                row = out.setdefault((period, brand, sku), {'period': period, 'brand': brand, 'sku': sku,
+                                                            'units_sold': 0, 'revenue': 0, 'units_in': 0, 'value_in': 0})
+                row[cols[0]] += units; row[cols[1]] += value
+        return list(out.values())
+
+    def _rpc_reserve_sns(self, p_sns, p_holder, p_ttl_s=900):
+        now, res, inv = time.time(), self._reservations, self._tables['inventory'].rows
+        for sn in [k for k, (_, exp) in res.items() if exp < now]: del res[sn]
+        out = []
+        for sn in p_sns:
+            row = inv.get(sn)
+            if row and row['status'] == 'Ready' and res.get(sn, (p_holder,))[0] == p_holder: res[sn] = (p_holder, now + p_ttl_s)
+            holder = res.get(sn, (None,))[0]
+            out.append({'sn': sn, 'status': row and row['status'], 'price': row and row['price'], 'brand': row and row['brand'],
+                        'sku': row and row['sku'], 'held_by_other': holder is not None and holder != p_holder})
+        return out
+
+    def _rpc_release_sns(self, p_holder, p_sns=None):
+        victims = [sn for sn, (h, _) in self._reservations.items() if h == p_holder and (p_sns is None or sn in p_sns)]
+        for sn in victims: del self._reservations[sn]
+        return len(victims)
+
+    def _rpc_purge_batch(self, p_table, p_batch=5000):
+        if p_table == 'cart_reservations':
+            victims = list(self._reservations)[:p_batch]
+            for sn in victims: del self._reservations[sn]
+            return len(victims)
+        if p_table in self._rollups:
+            agg = self._rollups[p_table]
+            victims = list(agg)[:p_batch]
+            for k in victims: del agg[k]
+            return len(victims)
+        t = self._tables[p_table]
+        victims = list(t.rows)[:p_batch]
+        for k in victims: t.pop(k)
+        self._changed(p_table, victims)
+        return len(victims)
+
+    def _rpc_truncate_tables(self, p_tables):
+        for name in p_tables:
+            if name == 'cart_reservations': self._reservations = {}
+            elif name in self._rollups: self._rollups[name] = {}
+            else: self._tables[name] = _Table(PRIMARY_KEYS[name])
+        if 'inventory' in p_tables:
+            self._tables['inventory_deleted'] = _Table('sn')
+            self._version = {'version': self._version['version'] + 1, 'reset': self._version['reset'] + 1}
+
+    def _rpc_archive_sold(self, p_before, p_batch=5000):
+        p_before = _norm('timestamp', p_before)
+        moved = {}
+        for src, dst, pred in (('inventory', 'inventory_archive', lambda r: r['status'] == 'Sold' and r.get('sold_at') and r['sold_at'] < p_before),
+                               ('transactions', 'transactions_archive', lambda r: r['timestamp'] < p_before)):
+            t, arc = self._tables[src], self._tables[dst]
+            victims = [k for k, r in t.rows.items() if pred(r)][:p_batch]
+            for k in victims: arc.put(t.pop(k))
+            self._changed(src, victims)
+            moved[src] = len(victims)
+        return moved
@@ -0,0 +1,239 @@
+# ==========================================
+# LOAD TEST: N kasir scan & checkout bersamaan, admin import + export
+# Contoh:
+#   python -m bench.load                                 # 1, 4, 8 kasir, 20 detik per run
+#   python -m bench.load --tills 16 --duration 60 --latency-ms 30
+#   python -m bench.load --backend sqlite --queue         # checkout lewat antrean lokal
+#   python -m bench.load --json hasil.json               # simpan laporan untuk dibandingkan
+# Tiap kasir = satu sesi Streamlit di proses app yang sama (thread, service & store
+# bersama), menjalankan alur layar Kasir: rerun -> scan/pilih SN -> reservasi ->
+# validasi -> checkout. Laporan: throughput, latency p50/p95/p99 per operasi,
+# round trip DB dan konflik SN. Di akhir tiap run seluruh transaksi dicek: SN yang
+# terjual lebih dari sekali (double-sell) harus 0.
+# ==========================================
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from bench.datagen import make_import_df
+from bench.run import setup
+from sn_tracker import service
+
+DEFAULT_TILLS = (1, 4, 8)
+PERCENTILES = (50, 95, 99)
+DRAIN_TIMEOUT = 60.0   # detik menunggu antrean checkout kosong di akhir run
+
+
+class Recorder:
+    """Latency per operasi + penghitung konflik, aman dipakai banyak thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.ms = {}
+        self.errors = Counter()
+        self.conflicts = Counter()
+
+    def timed(self, op, fn, *args, **kwargs):
+        t = time.perf_counter()
+        try: return fn(*args, **kwargs)
+        except Exception:
+            with self._lock: self.errors[op] += 1
+            raise
+        finally:
+            self.add(op, (time.perf_counter() - t) * 1000)
+
+    def add(self, op, ms):
+        with self._lock: self.ms.setdefault(op, []).append(ms)
+
+    def conflict(self, kind, n=1):
+        with self._lock: self.conflicts[kind] += n
+
+    def table(self, seconds):
+        rows = []
+        for op, ms in sorted(self.ms.items()):
+            a = np.asarray(ms)
+            rows.append({'op': op, 'count': len(a), 'per_s': round(len(a) / seconds, 2),
+                         **{f"p{p}": round(float(np.percentile(a, p)), 1) for p in PERCENTILES},
+                         'max': round(float(a.max()), 1), 'errors': self.errors[op]})
+        return pd.DataFrame(rows)
+
+
+def till(name, rec, stop, rng, max_items, think, scan_ratio):
+    """Satu kasir: ulangi penjualan sampai `stop`."""
+    holder = f"{name}-{uuid.uuid4().hex[:6]}"
+    while not stop.is_set():
+        t_sale = time.perf_counter()
+        try:
+            # Rerun layar Kasir: rekap sidebar + index Ready, dimulai bersamaan seperti di app.py
+            idx = rec.timed('rerun', lambda: [f.result() for f in service.prefetch(service.get_stock_summary, service.get_ready_index)][1])
+            if not len(idx): time.sleep(0.05); continue
+            sns = idx.sns(idx.products[rng.choice(idx.labels)]['sku'])
+            k = min(rng.randint(1, max_items), len(sns))
+            if rng.random() < scan_ratio:
+                # Scan barcode: SN acak dari rak, dicek satu per satu (find_sn) lalu dikunci sekaligus
+                rows = []
+                for sn in rng.sample(sns, k):
+                    row, status = rec.timed('scan', service.find_sn, sn)
+                    if row is None or status != 'Ready': rec.conflict('scan_not_ready'); continue
+                    rows.append(row)
+            else:
+                # Pemilih produk: kasir mengambil SN teratas di daftar (paling sering bentrok)
+                rows = [idx.row(sn) for sn in sns[:k]]
+            cart, ditolak = rec.timed('reserve', service.reserve_cart, holder, rows)
+            for alasan in ditolak.values(): rec.conflict(f"reserve: {alasan}")
+            if think: time.sleep(think)
+            if not cart: rec.conflict('cart_empty'); continue
+            cart, dikeluarkan, _ = rec.timed('validate', service.validate_cart, holder, cart)
+            if dikeluarkan: rec.conflict('validate_removed', len(dikeluarkan))
+            if not cart: continue
+            key = uuid.uuid4().hex
+            tid, _, konflik = rec.timed('checkout', service.process_checkout, name, cart, key)
+            if tid: rec.timed('release', service.release_after_checkout, holder, [x['sn'] for x in cart], key)
+            else: rec.timed('release', service.release_cart, holder, [x['sn'] for x in cart])
+            if konflik: rec.conflict('checkout_conflict', len(konflik)); continue
+            if tid: rec.add('sale', (time.perf_counter() - t_sale) * 1000)
+        except Exception as e:
+            rec.conflict(f"error: {type(e).__name__}")
+            time.sleep(0.05)
+
+def admin(rec, stop, import_rows, export_fmt, refresh, pause):
+    """Admin: import stok, export backup, (opsional) Refresh Data, berulang sampai `stop`."""
+    labels = {v: k for k, v in service.BACKUP_FORMATS.items()}
+    seed = 100
+    while not stop.is_set():
+        existing = service.get_inventory_df(('sn',))['sn'].sample(min(import_rows, 1000), random_state=seed).tolist()
+        df = make_import_df(import_rows, existing, seed=seed); seed += 1
+        try: rec.timed('admin_import', service.import_stock_from_df, 'admin', df)
+        except Exception as e: rec.conflict(f"error: {type(e).__name__}")
+        if export_fmt and not stop.is_set():
+            try:
+                for _, f, _ in rec.timed('admin_export', service.build_backup, labels[export_fmt]): f.close()
+            except ImportError as e: print(f"  export dilewati ({e})"); export_fmt = None
+            except Exception as e: rec.conflict(f"error: {type(e).__name__}")
+        if refresh and not stop.is_set(): rec.timed('admin_refresh', service.clear_cache)
+        stop.wait(pause)
+
+def wait_queue_drained(timeout=DRAIN_TIMEOUT):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        status = service.checkout_queue_status()
+        if not status or not status['pending']: return True
+        time.sleep(0.2)
+    return False
+
+def double_sold():
+    """SN yang muncul di lebih dari satu transaksi."""
+    seen = Counter(x['sn'] for page in service.iter_table_pages('transactions', ['trx_id', 'item_details'], key='trx_id')
+                   for row in page for x in row['item_details'] or [])
+    return {sn: n for sn, n in seen.items() if n > 1}
+
+
+def run_load(n_tills, args):
+    prof, _ = setup(args.size, args.latency_ms / 1000, args.backend)
+    queue_path = None
+    if args.queue:
+        queue_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), f".load_queue_{uuid.uuid4().hex[:8]}.db")
+        service.enable_checkout_queue(queue_path)
+    if args.watch: service.enable_inventory_watch(args.watch)
+    service.get_ready_index()   # store & index sudah hangat, yang diukur kondisi steady-state
+    prof.clear()
+
+    rec, stop = Recorder(), threading.Event()
+    threads = [threading.Thread(target=till, name=f"till-{i}", daemon=True,
+                                args=(f"KASIR{i}", rec, stop, random.Random(args.seed + i), args.max_items, args.think_ms / 1000, args.scan_ratio))
+               for i in range(n_tills)]
+    if not args.no_admin:
+        threads.append(threading.Thread(target=admin, name="admin", daemon=True,
+                                        args=(rec, stop, args.import_rows, args.export, args.refresh, args.admin_pause)))
+    t = time.perf_counter()
+    for th in threads: th.start()
+    stop.wait(args.duration)
+    stop.set()
+    for th in threads: th.join()
+    seconds = time.perf_counter() - t
+
+    drained = wait_queue_drained() if args.queue else True
+    if args.queue:
+        queue_conflicts = service.checkout_conflicts()
+        if queue_conflicts: rec.conflict('queue_conflict', sum(len(c['conflicts']) for c in queue_conflicts))
+        service.disable_checkout_queue()
+        for ext in ('', '-wal', '-shm'):
+            try: os.remove(queue_path + ext)
+            except OSError: pass
+    if args.watch: service.inventory_store().stop_watch()
+    dups = double_sold()
+
+    ops = rec.table(seconds)
+    db = pd.DataFrame([e for e in prof.events() if e['kind'] == 'db'])
+    requests = db['name'].value_counts().to_dict() if not db.empty else {}
+    sales = len(rec.ms.get('sale', []))
+    sale_ms = np.asarray(rec.ms.get('sale', [0.0]))
+    return {
+        'tills': n_tills, 'seconds': round(seconds, 2), 'sales': sales, 'sales_per_s': round(sales / seconds, 2),
+        'sale_p50_ms': round(float(np.percentile(sale_ms, 50)), 1), 'sale_p95_ms': round(float(np.percentile(sale_ms, 95)), 1),
+        'requests': int(sum(requests.values())), 'requests_per_sale': round(sum(requests.values()) / sales, 1) if sales else None,
+        'conflicts': dict(rec.conflicts), 'double_sold': len(dups), 'queue_drained': drained,
+        'ops': ops.to_dict('records'), 'requests_by_name': requests,
+    }
+
+def print_report(r):
+    print(f"  {r['sales']} penjualan dalam {r['seconds']}s = {r['sales_per_s']}/s · sale p50 {r['sale_p50_ms']} ms, p95 {r['sale_p95_ms']} ms")
+    print(pd.DataFrame(r['ops']).to_string(index=False))
+    top = sorted(r['requests_by_name'].items(), key=lambda x: -x[1])[:8]
+    print(f"  round trip DB: {r['requests']} ({r['requests_per_sale']}/penjualan) · " + ", ".join(f"{k}={v}" for k, v in top))
+    print(f"  konflik: {r['conflicts'] or '-'}")
+    print(f"  double-sell: {r['double_sold']}" + ("" if r['queue_drained'] else " · ! antrean checkout belum kosong"))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Load test kasir + admin SN Tracker (offline).")
+    ap.add_argument('--tills', type=int, nargs='+', default=list(DEFAULT_TILLS), help="jumlah kasir; beberapa nilai = sweep kapasitas")
+    ap.add_argument('--duration', type=float, default=20.0, help="detik per run")
+    ap.add_argument('--size', type=int, default=20_000, help="jumlah SN awal")
+    ap.add_argument('--backend', choices=('fake', 'sqlite'), default='fake')
+    ap.add_argument('--latency-ms', type=float, default=0.0, help="latency simulasi per round trip (backend fake)")
+    ap.add_argument('--max-items', type=int, default=3, help="SN per keranjang maksimum")
+    ap.add_argument('--think-ms', type=float, default=0.0, help="jeda antara reservasi dan bayar")
+    ap.add_argument('--scan-ratio', type=float, default=0.5, help="porsi penjualan lewat scan barcode (sisanya pemilih produk)")
+    ap.add_argument('--queue', action='store_true', help="checkout lewat antrean lokal (enable_checkout_queue)")
+    ap.add_argument('--watch', type=float, default=0.0, help="interval cek versi inventory (detik), 0 = mati")
+    ap.add_argument('--no-admin', action='store_true', help="tanpa thread admin")
+    ap.add_argument('--import-rows', type=int, default=2000)
+    ap.add_argument('--export', choices=('csv.gz', 'xlsx', 'parquet', ''), default='csv.gz', help="format export admin ('' = tanpa export)")
+    ap.add_argument('--refresh', action='store_true', help="admin juga menekan Refresh Data (clear_cache) tiap putaran")
+    ap.add_argument('--admin-pause', type=float, default=2.0, help="detik antar putaran admin")
+    ap.add_argument('--seed', type=int, default=0)
+    ap.add_argument('--json', help="simpan laporan ke file JSON")
+    args = ap.parse_args(argv)
+
+    reports = []
+    for n in args.tills:
+        print(f"== {n} kasir, {args.size:,} SN ({args.backend}, latency {args.latency_ms:g} ms, {args.duration:g}s)", flush=True)
+        r = run_load(n, args)
+        print_report(r)
+        reports.append(r)
+
+    if len(reports) > 1:
+        print("== Kapasitas")
+        cols = ('tills', 'sales_per_s', 'sale_p50_ms', 'sale_p95_ms', 'requests_per_sale', 'double_sold')
+        print(pd.DataFrame([dict({k: r[k] for k in cols}, conflicts=sum(r['conflicts'].values())) for r in reports]).to_string(index=False))
+    if args.json:
+        meta = {'date': datetime.now().isoformat(timespec='seconds'), **{k: v for k, v in vars(args).items() if k != 'json'}}
+        with open(args.json, 'w', encoding='utf-8') as f: json.dump({'meta': meta, 'runs': reports}, f, indent=2, default=str)
+        print(f"Laporan disimpan: {args.json}")
+    return 1 if any(r['double_sold'] for r in reports) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,181 @@
+# ==========================================
+# BENCHMARK: fungsi data sn_tracker.service terhadap FakeSupabase
+# Contoh:
+#   python -m bench.run                              # 10k & 100k, bandingkan dengan baseline
+#   python -m bench.run --sizes 1000000 --latency-ms 30
+#   python -m bench.run --save                       # tulis hasil jadi baseline baru
+#   python -m bench.run --backend sqlite             # backend SQLite lokal, bukan FakeSupabase
+# Tiap kasus mencatat waktu, puncak memori Python (tracemalloc) dan jumlah round trip.
+# Exit code 1 bila ada regresi terhadap baseline (waktu/memori > toleransi, request bertambah)
+# atau baseline belum ada. Baseline default (bench/baselines/baseline.json) ikut di-commit.
+# ==========================================
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from bench.datagen import make_inventory, make_transactions, make_import_df, make_sns
+from bench.fake_supabase import FakeSupabase
+from sn_tracker import analytics, service
+from sn_tracker.backends import create_backend
+from sn_tracker.perf import Profiler, TracedClient
+from sn_tracker.ready_index import ReadyIndex
+
+DEFAULT_SIZES = (10_000, 100_000)
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baselines', 'baseline.json')
+BACKUP_FMTS = ('csv.gz', 'xlsx', 'parquet')
+CHECKOUTS = 20
+MIN_DELTA_S = 0.005    # selisih waktu di bawah ini dianggap noise
+MIN_DELTA_MB = 1.0
+
+
+def measure(prof, fn):
+    """Jalankan fn sekali. Return (hasil, metrik)."""
+    prof.clear()
+    tracemalloc.start()
+    t = time.perf_counter()
+    try: result = fn()
+    finally:
+        seconds = time.perf_counter() - t
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, {'seconds': round(seconds, 4), 'peak_mb': round(peak / 2 ** 20, 2), 'requests': sum(1 for e in prof.events() if e['kind'] == 'db')}
+
+
+def setup(n, latency, backend='fake', seed=0):
+    """Isi backend dengan data sintetis lalu pasang ke service lewat TracedClient
+    (round trip dihitung dari event profiler, sama seperti panel Performa)."""
+    inv = make_inventory(n, seed)
+    trx = make_transactions(inv, seed)
+    if backend == 'fake':
+        db = FakeSupabase(latency)
+        db.load('inventory', inv.to_dict('records'))
+        db.load('transactions', trx)
+    else:
+        db = create_backend('sqlite')
+        db.table('inventory').insert(inv.to_dict('records')).execute()
+        db.table('transactions').insert(trx).execute()
+    prof = Profiler(window=1_000_000)
+    service.configure(TracedClient(db, prof))
+    return prof, inv
+
+
+def bench_size(n, latency, fmts, backend='fake'):
+    prof, inv = setup(n, latency, backend)
+    out = {}
+    def case(name, fn, **extra):
+        res, m = measure(prof, fn)
+        out[name] = dict(m, **extra)
+        print(f"  {name:<24} {m['seconds']:>9.3f}s {m['peak_mb']:>9.1f}MB {m['requests']:>6} req", flush=True)
+        return res
+
+    case('get_inventory_df_cold', service.get_inventory_df)
+    case('get_inventory_df_warm', service.get_inventory_df)
+    case('ready_index_build', lambda: ReadyIndex(service.get_inventory_df(service.READY_COLS, status='Ready')))
+
+    row = inv.iloc[0]
+    manual = make_sns(50, np.random.default_rng(7), prefix="AD")
+    case('add_stock_batch', lambda: service.add_stock_batch('bench', row['brand'], row['sku'], int(row['price']), manual))
+
+    df_import = make_import_df(max(min(n // 10, 20_000), 100), inv['sn'].tolist())
+    res = case('import_stock_from_df', lambda: service.import_stock_from_df('bench', df_import), rows=len(df_import))
+    if res['failed']: print(f"    ! import gagal sebagian: {res['failed'][:1]}")
+
+    ready = service.get_inventory_df(service.READY_COLS, status='Ready').head(CHECKOUTS * 2).to_dict('records')
+    carts = [[dict(r, price=int(r['price'])) for r in ready[i:i + 2]] for i in range(0, len(ready), 2)]
+    def checkouts():
+        return [service.process_checkout('bench', c) for c in carts]
+    results = case('process_checkout', checkouts, ops=len(carts))
+    conflicts = sum(1 for tid, _, c in results if c or not tid)
+    if conflicts: print(f"    ! {conflicts} checkout konflik/gagal")
+
+    service.get_sales_rollup.clear()
+    def dashboard():
+        rollup = service.get_sales_rollup(None, None, 'day')
+        return analytics.by_period(rollup), analytics.by_brand(rollup), analytics.top_skus(rollup)
+    case('sales_rollup', dashboard)
+
+    labels = {v: k for k, v in service.BACKUP_FORMATS.items()}
+    for fmt in fmts:
+        def backup():
+            files = service.build_backup(labels[fmt])
+            size = 0
+            for _, f, _ in files:
+                f.seek(0, os.SEEK_END); size += f.tell(); f.close()
+            return size
+        try: case(f"backup_{fmt}", backup)
+        except ImportError as e: print(f"  backup_{fmt:<17} dilewati ({e})")
+    return out
+
+
+def compare(results, baseline, tolerance):
+    """Return list pesan regresi (kosong = aman)."""
+    regressions = []
+    for size, cases in results.items():
+        base_cases = baseline.get('results', {}).get(size, {})
+        for name, m in cases.items():
+            b = base_cases.get(name)
+            if not b: continue
+            if m['seconds'] > b['seconds'] * (1 + tolerance) and m['seconds'] - b['seconds'] > MIN_DELTA_S:
+                regressions.append(f"{size} {name}: waktu {b['seconds']:.3f}s -> {m['seconds']:.3f}s")
+            if m['peak_mb'] > b['peak_mb'] * (1 + tolerance) and m['peak_mb'] - b['peak_mb'] > MIN_DELTA_MB:
+                regressions.append(f"{size} {name}: memori {b['peak_mb']:.1f}MB -> {m['peak_mb']:.1f}MB")
+            if m['requests'] > b['requests']:
+                regressions.append(f"{size} {name}: request {b['requests']} -> {m['requests']}")
+    return regressions
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark fungsi data SN Tracker (offline).")
+    ap.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    ap.add_argument('--backend', choices=('fake', 'sqlite'), default='fake')
+    ap.add_argument('--latency-ms', type=float, default=0.0, help="latency simulasi per round trip (backend fake)")
+    ap.add_argument('--formats', nargs='*', default=list(BACKUP_FMTS), choices=BACKUP_FMTS)
+    ap.add_argument('--baseline', default=DEFAULT_BASELINE)
+    ap.add_argument('--save', action='store_true', help="simpan hasil sebagai baseline")
+    ap.add_argument('--tolerance', type=float, default=0.25)
+    args = ap.parse_args(argv)
+
+    results = {}
+    for n in args.sizes:
+        print(f"== {n:,} SN ({args.backend}, latency {args.latency_ms:g} ms)", flush=True)
+        results[str(n)] = bench_size(n, args.latency_ms / 1000, args.formats, args.backend)
+
+    meta = {'date': datetime.now().isoformat(timespec='seconds'), 'backend': args.backend, 'latency_ms': args.latency_ms,
+            'python': platform.python_version(), 'pandas': pd.__version__, 'machine': platform.machine()}
+    if args.save:
+        baseline = {'meta': meta, 'results': results}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding='utf-8') as f: old = json.load(f)
+            # Ukuran yang tidak dijalankan kali ini tetap dipertahankan
+            baseline['results'] = dict(old.get('results', {}), **results)
+        os.makedirs(os.path.dirname(args.baseline) or '.', exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f: json.dump(baseline, f, indent=2)
+        print(f"Baseline disimpan: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        # Tanpa baseline tidak ada yang dibandingkan: gagal, jangan diam-diam lolos
+        print(f"Baseline tidak ditemukan: {args.baseline} (rekam dengan --save lalu commit).")
+        return 1
+    with open(args.baseline, encoding='utf-8') as f: baseline = json.load(f)
+    base_meta = baseline.get('meta', {})
+    if (base_meta.get('backend', 'fake'), base_meta.get('latency_ms')) != (args.backend, args.latency_ms):
+        print(f"Baseline direkam dengan backend {base_meta.get('backend', 'fake')} / latency {base_meta.get('latency_ms')} ms, tidak dibandingkan.")
+        return 0
+    regressions = compare(results, baseline, args.tolerance)
+    for r in regressions: print(f"REGRESI {r}")
+    if not regressions: print("Tidak ada regresi terhadap baseline.")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,50 @@
+# ==========================================
+# ANALYTICS: olahan rollup penjualan untuk dashboard admin
+# Input = frame kecil dari service (get_sales_rollup, get_stock_aging,
+# get_stock_summary); semua vectorized, tanpa akses DB dan tanpa membongkar
+# item_details transaksi.
+# ==========================================
+
+import pandas as pd
+
+GRAINS = {'Harian': 'day', 'Mingguan': 'week', 'Bulanan': 'month'}
+FREQ = {'day': 'D', 'week': 'W-MON', 'month': 'MS'}
+SUM_COLS = ['units_sold', 'revenue', 'units_in', 'value_in']
+AGING_LABELS = {0: '0-30 hari', 31: '31-60 hari', 61: '61-90 hari', 91: '91-180 hari', 181: '> 180 hari'}
+
+
+def totals(rollup):
+    return {c: int(rollup[c].sum()) for c in SUM_COLS}
+
+def by_period(rollup, grain='day'):
+    """Total per periode; periode tanpa transaksi tetap muncul sebagai 0 supaya grafik tidak bolong."""
+    if rollup.empty: return pd.DataFrame(columns=['period', *SUM_COLS])
+    out = rollup.groupby('period')[SUM_COLS].sum()
+    return out.asfreq(FREQ[grain], fill_value=0).rename_axis('period').reset_index()
+
+def by_brand(rollup):
+    out = rollup.groupby('brand', observed=True)[SUM_COLS].sum()
+    return out.sort_values('revenue', ascending=False).reset_index()
+
+def top_skus(rollup, n=10, by='revenue'):
+    out = rollup.groupby(['brand', 'sku'], observed=True)[SUM_COLS].sum()
+    return out[out[by] > 0].nlargest(n, by).reset_index()
+
+def sell_through(rollup, stock):
+    """Per brand: unit terjual di periode / (terjual + stok Ready sekarang)."""
+    sold = rollup.groupby(rollup['brand'].astype(str))['units_sold'].sum()
+    ready = stock.groupby(stock['brand'].astype(str))['units'].sum() if not stock.empty else pd.Series(dtype='int64')
+    out = pd.concat({'terjual': sold, 'ready': ready}, axis=1).fillna(0).astype('int64')
+    base = out['terjual'] + out['ready']
+    out['sell_through'] = (out['terjual'] / base.where(base > 0)).fillna(0.0)
+    return out.sort_values(['terjual', 'ready'], ascending=False).rename_axis('brand').reset_index()
+
+def aging_by_brand(aging):
+    """Unit & nilai stok Ready per brand x kelompok umur (urut dari yang termuda)."""
+    out = aging.groupby([aging['brand'].astype(str), 'age_from'])[['units', 'value']].sum().reset_index()
+    out['umur'] = pd.Categorical(out['age_from'].map(AGING_LABELS), categories=list(AGING_LABELS.values()), ordered=True)
+    return out.sort_values(['brand', 'umur'], ignore_index=True)
+
+def aging_totals(aging):
+    out = aging.groupby('age_from')[['units', 'value']].sum().reindex(list(AGING_LABELS), fill_value=0)
+    return out.rename(index=AGING_LABELS).rename_axis('umur').reset_index()
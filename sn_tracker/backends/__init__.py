@@ -0,0 +1,51 @@
+# ==========================================
+# BACKENDS: sumber data untuk sn_tracker.service
+# Kontrak backend = subset API client supabase-py yang dipakai service:
+#   table(name) -> builder select(cols, count=None) / insert(rows) / update(changes) / delete()
+#                  + eq/neq/gt/gte/lt/lte/in_/ilike, or_("a.lt.x,and(a.eq.x,b.lt.y)"),
+#                  order(col, desc=False), limit(n), range(a, b)
+#                  .execute() -> objek dengan .data (list dict) dan .count
+#   rpc(fn, params).execute() -> .data   (checkout, checkout_batch, transactions_summary,
+#                                          sales_rollup, reserve_sns, release_sns, purge_batch,
+#                                          truncate_tables, archive_sold; lihat sql/)
+# Client Supabase memenuhi kontrak ini apa adanya; SQLiteBackend menerjemahkannya ke
+# SQL lokal (test, store offline). Library backend di-import saat dipakai saja.
+# ==========================================
+
+import re
+
+
+def create_backend(kind, **cfg):
+    """kind 'supabase' (url, key) atau 'sqlite' (path, default ':memory:')."""
+    if kind == 'supabase':
+        from supabase import create_client
+        return create_client(cfg['url'], cfg['key'])
+    if kind == 'sqlite':
+        from sn_tracker.backends.sqlite import SQLiteBackend
+        return SQLiteBackend(cfg.get('path', ':memory:'))
+    raise ValueError(f"Backend tidak dikenal: {kind}")
+
+def parse_or(filters):
+    """String filter or_() PostgREST -> pohon ('or', [anak]); anak = (op, kolom, nilai teks)
+    atau ('and'|'or', [anak]). Nilai boleh dikutip ganda ("..." dengan escape backslash)."""
+    return ('or', _parse_logic(filters))
+
+def _parse_logic(expr):
+    parts, buf, depth, quoted, esc = [], [], 0, False, False
+    for ch in expr:
+        if esc: esc = False
+        elif quoted and ch == '\\': esc = True
+        elif ch == '"': quoted = not quoted
+        elif not quoted and ch == '(': depth += 1
+        elif not quoted and ch == ')': depth -= 1
+        elif not quoted and not depth and ch == ',': parts.append(''.join(buf)); buf = []; continue
+        buf.append(ch)
+    parts.append(''.join(buf))
+    out = []
+    for part in parts:
+        logic = part.split('(', 1)[0]
+        if logic in ('and', 'or') and part.endswith(')'): out.append((logic, _parse_logic(part[len(logic) + 1:-1]))); continue
+        col, op, val = part.split('.', 2)
+        if len(val) > 1 and val[0] == val[-1] == '"': val = re.sub(r'\\(.)', r'\1', val[1:-1])
+        out.append((op, col, val))
+    return out
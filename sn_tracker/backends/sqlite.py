@@ -0,0 +1,395 @@
+# ==========================================
+# SQLITE BACKEND: padanan lokal Supabase untuk test & store offline
+# Builder bergaya PostgREST dikompilasi ke SQL berparameter. RPC di sql/
+# diimplementasi ulang di Python dalam satu transaksi SQLite (BEGIN IMMEDIATE).
+# Timestamp disimpan sebagai ISO UTC seragam supaya urutan teks = urutan waktu.
+# ==========================================
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, date, timedelta, timezone
+
+from sn_tracker.backends import parse_or
+
+SCHEMA = """
+create table if not exists inventory (
+  sn text primary key, brand text, sku text, price integer, status text,
+  created_at text, sold_at text, updated_at text, import_batch_id text);
+create index if not exists inventory_updated_at_idx on inventory (updated_at);
+create index if not exists inventory_status_sku_idx on inventory (status, brand, sku, price);
+create table if not exists transactions (
+  trx_id text primary key, "timestamp" text, "user" text, total_bill integer, items_count integer,
+  item_details text, idempotency_key text unique);
+create index if not exists transactions_timestamp_idx on transactions ("timestamp");
+create table if not exists import_logs (
+  id integer primary key autoincrement, "timestamp" text, "user" text, method text,
+  total_items integer, items_detail text, batch_id text unique, total_value integer,
+  dups integer, failed_rows integer, brands text);
+create table if not exists inventory_archive as select * from inventory where 0;
+create table if not exists transactions_archive as select * from transactions where 0;
+create view if not exists transactions_all as select * from transactions union all select * from transactions_archive;
+create view if not exists stock_summary as
+  select brand, sku, price, count(*) as units from inventory where status = 'Ready' group by brand, sku, price;
+create table if not exists sales_daily (
+  day text not null, brand text not null, sku text not null, units integer not null default 0,
+  revenue integer not null default 0, primary key (day, brand, sku));
+create table if not exists intake_daily (
+  day text not null, brand text not null, sku text not null, units integer not null default 0,
+  value integer not null default 0, primary key (day, brand, sku));
+create view if not exists stock_aging as
+  select brand, sku,
+         case when age <= 30 then 0 when age <= 60 then 31 when age <= 90 then 61 when age <= 180 then 91 else 181 end as age_from,
+         count(*) as units, sum(price) as value
+  from (select brand, sku, price, cast(julianday('now') - julianday(created_at) as integer) as age from inventory where status = 'Ready')
+  group by 1, 2, 3;
+create table if not exists inventory_version (
+  id integer primary key check (id = 1), version integer not null default 0, reset integer not null default 0);
+insert or ignore into inventory_version (id) values (1);
+create table if not exists inventory_deleted (sn text primary key, deleted_at text not null);
+create index if not exists inventory_deleted_at_idx on inventory_deleted (deleted_at);
+create table if not exists cart_reservations (sn text primary key, holder text not null, expires_at text not null);
+create index if not exists cart_reservations_holder_idx on cart_reservations (holder);
+"""
+
+# Padanan trigger rollup sql/008. SQLite tidak punya zona waktu: WIB = UTC+7 tanpa DST.
+SALES_ROLLUP_SQL = """
+insert into sales_daily (day, brand, sku, units, revenue)
+select date(t."timestamp", '+7 hours'), coalesce(json_extract(j.value, '$.brand'), ''), coalesce(json_extract(j.value, '$.sku'), ''),
+       count(*), coalesce(sum(json_extract(j.value, '$.price')), 0)
+  from {source} t, json_each(t.item_details) j where true
+ group by 1, 2, 3
+on conflict (day, brand, sku) do update set units = units + excluded.units, revenue = revenue + excluded.revenue;
+"""
+INTAKE_ROLLUP_SQL = """
+insert into intake_daily (day, brand, sku, units, value)
+select date(coalesce(i.created_at, datetime('now')), '+7 hours'), coalesce(i.brand, ''), coalesce(i.sku, ''),
+       count(*), coalesce(sum(i.price), 0)
+  from {source} i where true
+ group by 1, 2, 3
+on conflict (day, brand, sku) do update set units = units + excluded.units, value = value + excluded.value;
+"""
+UTC_NOW_SQL = "strftime('%Y-%m-%dT%H:%M:%f', 'now') || '000+00:00'"   # format sama dengan _ts()
+TRIGGERS = f"""
+create trigger if not exists inventory_bump_version_ins after insert on inventory begin
+  update inventory_version set version = version + 1 where id = 1;
+  delete from inventory_deleted where sn = new.sn;
+end;
+create trigger if not exists inventory_bump_version_upd after update on inventory begin
+  update inventory_version set version = version + 1 where id = 1;
+end;
+create trigger if not exists inventory_record_deleted after delete on inventory begin
+  update inventory_version set version = version + 1 where id = 1;
+  insert or replace into inventory_deleted (sn, deleted_at) values (old.sn, {UTC_NOW_SQL});
+end;
+create trigger if not exists transactions_rollup_sales after insert on transactions begin
+{SALES_ROLLUP_SQL.format(source='(select new."timestamp" as "timestamp", new.item_details as item_details)')}
+end;
+create trigger if not exists inventory_rollup_intake after insert on inventory begin
+{INTAKE_ROLLUP_SQL.format(source='(select new.created_at as created_at, new.brand as brand, new.sku as sku, new.price as price)')}
+end;
+"""
+ROLLUP_SOURCES = {'sales_daily': (SALES_ROLLUP_SQL, ('transactions', 'transactions_archive')),
+                  'intake_daily': (INTAKE_ROLLUP_SQL, ('inventory', 'inventory_archive'))}
+GRAINS = {'day': "day", 'week': "date(day, '-' || ((strftime('%w', day) + 6) % 7) || ' days')",
+          'month': "strftime('%Y-%m-01', day)"}
+
+# Kolom yang ditambahkan setelah file DB lama dibuat (padanan sql/007)
+ADDED_COLS = [('inventory', 'import_batch_id', 'text'), ('inventory_archive', 'import_batch_id', 'text'),
+              ('import_logs', 'batch_id', 'text'), ('import_logs', 'total_value', 'integer'),
+              ('import_logs', 'dups', 'integer'), ('import_logs', 'failed_rows', 'integer'), ('import_logs', 'brands', 'text')]
+INDEXES = """
+create index if not exists inventory_import_batch_idx on inventory (import_batch_id);
+create unique index if not exists import_logs_batch_id_idx on import_logs (batch_id);
+create index if not exists transactions_ts_trx_idx on transactions ("timestamp", trx_id);
+"""
+
+TIMESTAMP_COLS = {'created_at', 'sold_at', 'updated_at', 'timestamp', 'deleted_at'}
+JSON_COLS = {'item_details', 'items_detail', 'brands'}
+TOUCH_UPDATED_AT = {'inventory'}    # padanan trigger sql/001
+PURGE_TABLES = {'inventory', 'transactions', 'import_logs', 'inventory_archive', 'transactions_archive', 'sales_daily', 'intake_daily', 'cart_reservations'}
+RESET_TABLES = PURGE_TABLES    # padanan sql/013
+MAX_PARAMS = 30000                  # di bawah SQLITE_MAX_VARIABLE_NUMBER
+
+
+def _ts(value):
+    if isinstance(value, str): value = datetime.fromisoformat(value)
+    elif not isinstance(value, datetime) and isinstance(value, date): value = datetime(value.year, value.month, value.day)
+    value = value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+    return value.strftime('%Y-%m-%dT%H:%M:%S.%f+00:00')
+
+def _now():
+    return _ts(datetime.now(timezone.utc))
+
+def _param(col, value):
+    if value is None or (isinstance(value, float) and value != value): return None   # None / NaN -> NULL
+    if col in TIMESTAMP_COLS: return _ts(value)
+    if col in JSON_COLS or isinstance(value, (dict, list)): return json.dumps(value, default=str)
+    if hasattr(value, 'item') and not isinstance(value, (str, bytes)): return value.item()   # skalar numpy
+    return value
+
+def _row(cursor, values):
+    out = {}
+    for (col, *_), v in zip(cursor.description, values):
+        out[col] = json.loads(v) if col in JSON_COLS and isinstance(v, str) else v
+    return out
+
+def _q(col): return '"' + col.replace('"', '""') + '"'
+
+
+class Response:
+    def __init__(self, data, count=None):
+        self.data, self.count = data, count
+
+
+class _Query:
+    _OPS = {'eq': '=', 'neq': '<>', 'gt': '>', 'gte': '>=', 'lt': '<', 'lte': '<='}
+
+    def __init__(self, db, table):
+        self._db, self.table = db, table
+        self.op, self.payload, self.columns, self.count = 'select', None, None, None
+        self.where, self.params, self.orders, self.offset, self.limit_n = [], [], [], 0, None
+
+    def select(self, columns="*", count=None):
+        self.columns = None if columns.strip() == "*" else [c.strip() for c in columns.split(",")]
+        self.count = count
+        return self
+
+    def insert(self, rows):
+        self.op, self.payload = 'insert', rows if isinstance(rows, list) else [rows]
+        return self
+
+    def update(self, changes):
+        self.op, self.payload = 'update', changes
+        return self
+
+    def delete(self):
+        self.op = 'delete'
+        return self
+
+    def _cmp(self, op, col, val):
+        if val is None and op in ('eq', 'neq'): self.where.append(f"{_q(col)} is {'not ' if op == 'neq' else ''}null")
+        else: self.where.append(f"{_q(col)} {self._OPS[op]} ?"); self.params.append(_param(col, val))
+        return self
+
+    def eq(self, col, val): return self._cmp('eq', col, val)
+    def neq(self, col, val): return self._cmp('neq', col, val)
+    def gt(self, col, val): return self._cmp('gt', col, val)
+    def gte(self, col, val): return self._cmp('gte', col, val)
+    def lt(self, col, val): return self._cmp('lt', col, val)
+    def lte(self, col, val): return self._cmp('lte', col, val)
+
+    def in_(self, col, vals):
+        vals = list(vals)
+        self.where.append(f"{_q(col)} in ({','.join('?' * len(vals))})" if vals else "0")
+        self.params.extend(_param(col, v) for v in vals)
+        return self
+
+    def ilike(self, col, pattern):
+        self.where.append(f"{_q(col)} like ?"); self.params.append(pattern)
+        return self
+
+    def or_(self, filters):
+        self.where.append(self._logic_sql(parse_or(filters)))
+        return self
+
+    def _logic_sql(self, node):
+        if node[0] in ('and', 'or'): return "(" + f" {node[0]} ".join(self._logic_sql(x) for x in node[1]) + ")"
+        op, col, val = node
+        self.params.append(_param(col, val))
+        return f"{_q(col)} {self._OPS[op]} ?"
+
+    def order(self, col, desc=False):
+        # Default Postgres: NULL di akhir untuk ASC, di awal untuk DESC
+        self.orders.append(f"{_q(col)} {'desc nulls first' if desc else 'asc nulls last'}")
+        return self
+
+    def limit(self, n):
+        self.limit_n = n
+        return self
+
+    def range(self, start, end):
+        self.offset, self.limit_n = start, end - start + 1
+        return self
+
+    def execute(self):
+        return self._db._execute(self)
+
+    def _where_sql(self):
+        return (" where " + " and ".join(self.where)) if self.where else ""
+
+
+class _Rpc:
+    def __init__(self, db, fn, params):
+        self._db, self.fn, self.params = db, fn, params
+
+    def execute(self):
+        handler = getattr(self._db, f"_rpc_{self.fn}", None)
+        if handler is None: raise sqlite3.OperationalError(f"function {self.fn} does not exist")
+        with self._db._tx() as conn: return Response(handler(conn, **self.params))
+
+
+class SQLiteBackend:
+    """Satu koneksi dipakai bersama semua thread, diserialkan lewat lock (tulis SQLite memang serial)."""
+
+    def __init__(self, path=':memory:'):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("pragma busy_timeout = 5000")
+        if path != ':memory:':
+            self._conn.execute("pragma journal_mode = wal")
+            self._conn.execute("pragma synchronous = normal")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        for table, col, typ in ADDED_COLS:
+            cols = {r[1] for r in self._conn.execute(f"pragma table_info({_q(table)})")}
+            if col not in cols: self._conn.execute(f"alter table {_q(table)} add column {_q(col)} {typ}")
+        self._conn.executescript(INDEXES)
+        # Rollup kosong pada DB lama: isi dulu dari data yang sudah ada, baru pasang trigger
+        for rollup, (sql, sources) in ROLLUP_SOURCES.items():
+            if self._conn.execute(f"select 1 from {rollup} limit 1").fetchone(): continue
+            for src in sources: self._conn.execute(sql.format(source=src))
+        self._conn.executescript(TRIGGERS)
+
+    def table(self, name):
+        return _Query(self, name)
+
+    def rpc(self, fn, params=None):
+        return _Rpc(self, fn, params or {})
+
+    def close(self):
+        with self._lock: self._conn.close()
+
+    @contextmanager
+    def _tx(self):
+        with self._lock:
+            self._conn.execute("begin immediate")
+            try: yield self._conn
+            except BaseException:
+                self._conn.execute("rollback"); raise
+            self._conn.execute("commit")
+
+    # --- builder -> SQL ---
+    def _execute(self, q):
+        t, where = _q(q.table), q._where_sql()
+        with self._tx() as conn:
+            if q.op == 'select':
+                cols = ", ".join(_q(c) for c in q.columns) if q.columns else "*"
+                sql = f"select {cols} from {t}{where}"
+                if q.orders: sql += " order by " + ", ".join(q.orders)
+                if q.limit_n is not None: sql += f" limit {int(q.limit_n)} offset {int(q.offset)}"
+                cur = conn.execute(sql, q.params)
+                data = [_row(cur, r) for r in cur.fetchall()]
+                count = conn.execute(f"select count(*) from {t}{where}", q.params).fetchone()[0] if q.count == 'exact' else None
+                return Response(data, count)
+            if q.op == 'insert': return Response(self._insert(conn, q.table, q.payload))
+            if q.op == 'delete':
+                cur = conn.execute(f"delete from {t}{where} returning *", q.params)
+                return Response([_row(cur, r) for r in cur.fetchall()])
+            changes = dict(q.payload)
+            if q.table in TOUCH_UPDATED_AT: changes['updated_at'] = _now()
+            sets = ", ".join(f"{_q(c)} = ?" for c in changes)
+            cur = conn.execute(f"update {t} set {sets}{where} returning *", [_param(c, v) for c, v in changes.items()] + q.params)
+            return Response([_row(cur, r) for r in cur.fetchall()])
+
+    def _insert(self, conn, table, rows):
+        if not rows: return []
+        touch = _now() if table in TOUCH_UPDATED_AT else None
+        cols = list(dict.fromkeys(c for r in rows for c in r))
+        if touch and 'updated_at' not in cols: cols.append('updated_at')
+        per = max(1, MAX_PARAMS // len(cols))
+        out = []
+        for i in range(0, len(rows), per):
+            chunk = rows[i:i + per]
+            params = [_param(c, touch if c == 'updated_at' and touch else r.get(c)) for r in chunk for c in cols]
+            values = ", ".join(["(" + ",".join("?" * len(cols)) + ")"] * len(chunk))
+            cur = conn.execute(f"insert into {_q(table)} ({', '.join(_q(c) for c in cols)}) values {values} returning *", params)
+            out.extend(_row(cur, r) for r in cur.fetchall())
+        return out
+
+    # --- RPC (padanan fungsi di sql/) ---
+    def _rpc_checkout(self, conn, p_trx_id, p_user, p_items, p_idempotency_key, p_sold_at=None):
+        prev = conn.execute('select trx_id, total_bill, "timestamp" from transactions where idempotency_key = ?', (p_idempotency_key,)).fetchone()
+        if prev:
+            return {'status': 'duplicate', 'trx_id': prev[0], 'total': prev[1], 'sold_at': prev[2], 'conflicts': []}
+        sns = [x['sn'] for x in p_items]
+        marks = ",".join("?" * len(sns))
+        ready = {r[0] for r in conn.execute(f"select sn from inventory where sn in ({marks}) and status = 'Ready'", sns)}
+        conflicts = [s for s in sns if s not in ready]
+        if conflicts: return {'status': 'conflict', 'conflicts': conflicts}
+        now = _param('sold_at', p_sold_at) or _now()
+        conn.execute(f"update inventory set status = 'Sold', sold_at = ?, updated_at = ? where sn in ({marks}) and status = 'Ready'", [now, _now()] + sns)
+        total = sum(int(x['price']) for x in p_items)
+        conn.execute('insert into transactions (trx_id, "timestamp", "user", total_bill, items_count, item_details, idempotency_key) values (?, ?, ?, ?, ?, ?, ?)',
+                     (p_trx_id, now, p_user, total, len(sns), json.dumps(p_items, default=str), p_idempotency_key))
+        return {'status': 'ok', 'trx_id': p_trx_id, 'total': total, 'sold_at': now, 'conflicts': []}
+
+    def _rpc_checkout_batch(self, conn, p_batch):
+        return [dict(self._rpc_checkout(conn, x['trx_id'], x['user'], x['items'], x['idempotency_key'], x.get('sold_at')),
+                     idempotency_key=x['idempotency_key']) for x in p_batch]
+
+    def _rpc_transactions_summary(self, conn, p_from=None, p_to=None):
+        omzet, count = conn.execute('select coalesce(sum(total_bill), 0), count(*) from transactions_all '
+                                    'where (? is null or "timestamp" >= ?) and (? is null or "timestamp" < ?)',
+                                    (_param('timestamp', p_from),) * 2 + (_param('timestamp', p_to),) * 2).fetchone()
+        return {'omzet': omzet, 'count': count}
+
+    def _rpc_sales_rollup(self, conn, p_from=None, p_to=None, p_grain='day'):
+        period = GRAINS[p_grain]
+        sql = f"""
+          select {period} as period, brand, sku, sum(units_sold) as units_sold, sum(revenue) as revenue,
+                 sum(units_in) as units_in, sum(value_in) as value_in
+            from (select day, brand, sku, units as units_sold, revenue, 0 as units_in, 0 as value_in from sales_daily
+                  union all
+                  select day, brand, sku, 0, 0, units, value from intake_daily)
+           where (?1 is null or day >= ?1) and (?2 is null or day <= ?2)
+           group by 1, 2, 3"""
+        cur = conn.execute(sql, (p_from, p_to))
+        return [_row(cur, r) for r in cur.fetchall()]
+
+    def _rpc_reserve_sns(self, conn, p_sns, p_holder, p_ttl_s=900):
+        sns = json.dumps(list(p_sns))
+        conn.execute("delete from cart_reservations where expires_at < ?", (_now(),))
+        conn.execute("insert into cart_reservations (sn, holder, expires_at) "
+                     "select sn, ?, ? from inventory where sn in (select value from json_each(?)) and status = 'Ready' "
+                     "on conflict (sn) do update set expires_at = excluded.expires_at where holder = excluded.holder",
+                     (p_holder, _ts(datetime.now(timezone.utc) + timedelta(seconds=p_ttl_s)), sns))
+        cur = conn.execute("select s.value, i.status, i.price, i.brand, i.sku, r.holder from json_each(?) s "
+                           "left join inventory i on i.sn = s.value left join cart_reservations r on r.sn = s.value", (sns,))
+        return [{'sn': sn, 'status': status, 'price': price, 'brand': brand, 'sku': sku,
+                 'held_by_other': holder is not None and holder != p_holder}
+                for sn, status, price, brand, sku, holder in cur.fetchall()]
+
+    def _rpc_release_sns(self, conn, p_holder, p_sns=None):
+        if p_sns is None: return conn.execute("delete from cart_reservations where holder = ?", (p_holder,)).rowcount
+        return conn.execute("delete from cart_reservations where holder = ? and sn in (select value from json_each(?))",
+                            (p_holder, json.dumps(list(p_sns)))).rowcount
+
+    def _rpc_purge_batch(self, conn, p_table, p_batch=5000):
+        if p_table not in PURGE_TABLES: raise sqlite3.OperationalError(f"Tabel tidak diizinkan: {p_table}")
+        return conn.execute(f"delete from {_q(p_table)} where rowid in (select rowid from {_q(p_table)} limit ?)", (p_batch,)).rowcount
+
+    def _rpc_truncate_tables(self, conn, p_tables):
+        bad = [t for t in p_tables if t not in RESET_TABLES]
+        if bad: raise sqlite3.OperationalError(f"Tabel tidak diizinkan: {bad[0]}")
+        for t in p_tables: conn.execute(f"delete from {_q(t)}")
+        if 'inventory' in p_tables:   # padanan trigger TRUNCATE sql/009
+            conn.execute("delete from inventory_deleted")
+            conn.execute("update inventory_version set reset = reset + 1, version = version + 1 where id = 1")
+
+    def _rpc_archive_sold(self, conn, p_before, p_batch=5000):
+        p_before = _param('timestamp', p_before)
+        moved = {}
+        for src, dst, cond in (('inventory', 'inventory_archive', "status = 'Sold' and sold_at < ?"),
+                               ('transactions', 'transactions_archive', '"timestamp" < ?')):
+            ids = [r[0] for r in conn.execute(f"select rowid from {src} where {cond} limit ?", (p_before, p_batch))]
+            if ids:
+                marks = ",".join("?" * len(ids))
+                conn.execute(f"insert into {dst} select * from {src} where rowid in ({marks})", ids)
+                conn.execute(f"delete from {src} where rowid in ({marks})", ids)
+            moved[src] = len(ids)
+        return moved
@@ -0,0 +1,156 @@
+# ==========================================
+# CHECKOUT QUEUE: write-ahead log lokal untuk transaksi kasir
+# Checkout ditulis dulu ke SQLite lokal (fsync, milidetik), lalu thread
+# latar mengirimnya ke server per batch dengan retry + backoff. Kasir tidak
+# pernah menunggu jaringan; konflik (SN sudah terjual di tempat lain) dicatat
+# di antrean untuk ditindaklanjuti dari UI.
+# ==========================================
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+SCHEMA = """
+create table if not exists checkout_queue (
+  idempotency_key text primary key, trx_id text not null, user text, items text not null,
+  total integer not null, created_at text not null, status text not null default 'pending',
+  attempts integer not null default 0, next_try real not null default 0, last_error text,
+  conflicts text, synced_at text);
+create index if not exists checkout_queue_status_idx on checkout_queue (status, created_at);
+"""
+
+PENDING, SYNCED, CONFLICT, DISMISSED = 'pending', 'synced', 'conflict', 'dismissed'
+FLUSH_BATCH = 20
+IDLE_WAIT = 5.0        # detik antar cek antrean saat tidak ada yang baru
+MAX_BACKOFF = 60.0
+KEEP_SYNCED_DAYS = 7
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+def _decode(row):
+    row = dict(row)
+    row['items'] = json.loads(row['items'])
+    row['conflicts'] = json.loads(row['conflicts']) if row['conflicts'] else []
+    return row
+
+
+class CheckoutQueue:
+    """`send(rows)` mengirim list transaksi antrean ke server dan mengembalikan hasil per
+    transaksi (dict dengan idempotency_key, status ok/duplicate/conflict, conflicts).
+    `on_result(row, result)` dipanggil untuk tiap transaksi yang sudah final."""
+
+    def __init__(self, path, send, on_result=None, batch=FLUSH_BATCH):
+        self.path = path
+        self._send = send
+        self._on_result = on_result or (lambda row, res: None)
+        self.batch = batch
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        if path != ':memory:':
+            self._conn.execute("pragma journal_mode = wal")
+            self._conn.execute("pragma synchronous = full")   # transaksi kasir harus tahan mati listrik
+        self._conn.executescript(SCHEMA)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self.last_error = None
+        self.last_ok = None
+
+    # --- KASIR ---
+    def enqueue(self, trx_id, user, items, idempotency_key, created_at=None):
+        """Simpan transaksi lokal lalu bangunkan flusher. Return row antrean."""
+        row = {'idempotency_key': idempotency_key, 'trx_id': trx_id, 'user': user, 'items': items,
+               'total': sum(int(x['price']) for x in items), 'created_at': created_at or _now()}
+        with self._lock:
+            self._conn.execute("insert or ignore into checkout_queue (idempotency_key, trx_id, user, items, total, created_at) values (?, ?, ?, ?, ?, ?)",
+                               (idempotency_key, trx_id, user, json.dumps(items, default=str), row['total'], row['created_at']))
+            saved = self._conn.execute("select * from checkout_queue where idempotency_key = ?", (idempotency_key,)).fetchone()
+        self._wake.set()
+        return _decode(saved)
+
+    def get(self, idempotency_key):
+        with self._lock:
+            row = self._conn.execute("select * from checkout_queue where idempotency_key = ?", (idempotency_key,)).fetchone()
+        return _decode(row) if row else None
+
+    def pending(self):
+        with self._lock:
+            return [_decode(r) for r in self._conn.execute("select * from checkout_queue where status = ? order by created_at", (PENDING,))]
+
+    def pending_sns(self):
+        return {x['sn'] for row in self.pending() for x in row['items']}
+
+    def conflicts(self):
+        with self._lock:
+            return [_decode(r) for r in self._conn.execute("select * from checkout_queue where status = ? order by created_at", (CONFLICT,))]
+
+    def dismiss(self, idempotency_key):
+        with self._lock:
+            self._conn.execute("update checkout_queue set status = ? where idempotency_key = ? and status = ?", (DISMISSED, idempotency_key, CONFLICT))
+
+    def status(self):
+        """Ringkasan untuk UI: jumlah pending, umur tertua (detik), konflik, error & sukses terakhir."""
+        with self._lock:
+            n, oldest = self._conn.execute("select count(*), min(created_at) from checkout_queue where status = ?", (PENDING,)).fetchone()
+            n_conflict = self._conn.execute("select count(*) from checkout_queue where status = ?", (CONFLICT,)).fetchone()[0]
+        age = (datetime.now(timezone.utc) - datetime.fromisoformat(oldest)).total_seconds() if oldest else 0
+        return {'pending': n, 'oldest_s': age, 'conflicts': n_conflict, 'last_error': self.last_error, 'last_ok': self.last_ok}
+
+    # --- FLUSH ---
+    def flush_once(self):
+        """Kirim satu batch yang sudah jatuh tempo. Return jumlah transaksi yang final."""
+        with self._lock:
+            rows = [_decode(r) for r in self._conn.execute(
+                "select * from checkout_queue where status = ? and next_try <= ? order by created_at limit ?", (PENDING, time.time(), self.batch))]
+        if not rows: return 0
+        try: results = {r['idempotency_key']: r for r in self._send(rows)}
+        except Exception as e:
+            self.last_error = str(e)
+            with self._lock:
+                for row in rows:
+                    delay = min(2 ** row['attempts'], MAX_BACKOFF)
+                    self._conn.execute("update checkout_queue set attempts = attempts + 1, next_try = ?, last_error = ? where idempotency_key = ?",
+                                       (time.time() + delay, str(e), row['idempotency_key']))
+            return 0
+        self.last_error, self.last_ok = None, time.time()
+        done = 0
+        for row in rows:
+            res = results.get(row['idempotency_key'])
+            if res is None: continue
+            status = CONFLICT if res['status'] == 'conflict' else SYNCED
+            with self._lock:
+                self._conn.execute("update checkout_queue set status = ?, conflicts = ?, synced_at = ?, last_error = null where idempotency_key = ?",
+                                   (status, json.dumps(res.get('conflicts') or []), _now(), row['idempotency_key']))
+            done += 1
+            try: self._on_result(row, res)
+            except Exception as e: print(f"Checkout Queue Callback Error: {e}")
+        return done
+
+    def _prune(self):
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=KEEP_SYNCED_DAYS)).isoformat()
+        with self._lock:
+            self._conn.execute("delete from checkout_queue where status in (?, ?) and synced_at < ?", (SYNCED, DISMISSED, cutoff))
+
+    def _run(self):
+        self._prune()
+        while not self._stop.is_set():
+            n = self.flush_once()
+            if n: continue   # mungkin masih ada batch berikutnya
+            self._wake.wait(IDLE_WAIT if self.last_error is None else 1.0)
+            self._wake.clear()
+
+    def start(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive(): return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="checkout-queue", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=5.0):
+        self._stop.set(); self._wake.set()
+        if self._thread: self._thread.join(timeout)
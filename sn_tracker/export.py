@@ -0,0 +1,75 @@
+# ==========================================
+# EXPORT BACKUP: tulis halaman baris dari DB langsung ke file
+# Tidak ada DataFrame penuh / BytesIO ganda: xlsx pakai constant_memory,
+# CSV di-gzip on the fly, Parquet ditulis per row group.
+# ==========================================
+
+import csv
+import gzip
+import io
+import itertools
+import json
+
+HEADER_FORMAT = {'bold': True, 'text_wrap': True, 'valign': 'top', 'fg_color': '#0095DA', 'font_color': '#FFFFFF', 'border': 1}
+MAX_COL_WIDTH = 60
+
+
+def _peek(pages):
+    """Ambil halaman pertama (untuk kolom & lebar) tanpa kehilangan isinya."""
+    pages = iter(pages)
+    first = next(pages, [])
+    return first, itertools.chain([first], pages) if first else iter(())
+
+def _cell(v):
+    if isinstance(v, (dict, list)): return json.dumps(v, ensure_ascii=False)
+    return v
+
+def column_widths(columns, sample):
+    """Lebar kolom dari sampel halaman pertama, bukan len() tiap sel di seluruh tabel."""
+    return [min(max([len(str(c))] + [len(str(r.get(c) if r.get(c) is not None else '')) for r in sample]) + 2, MAX_COL_WIDTH) for c in columns]
+
+def write_xlsx(out, sheets):
+    """sheets: list (nama_sheet, kolom atau None, iterator halaman list-of-dict)."""
+    import xlsxwriter
+    wb = xlsxwriter.Workbook(out, {'constant_memory': True})
+    header_format = wb.add_format(HEADER_FORMAT)
+    for name, columns, pages in sheets:
+        first, pages = _peek(pages)
+        columns = list(columns or (first[0].keys() if first else []))
+        ws = wb.add_worksheet(name)
+        for i, w in enumerate(column_widths(columns, first)): ws.set_column(i, i, w)
+        ws.write_row(0, 0, columns, header_format)
+        r = 1
+        for page in pages:
+            for row in page:
+                ws.write_row(r, 0, [_cell(row.get(c)) for c in columns]); r += 1
+    wb.close()
+
+def write_csv_gz(out, columns, pages):
+    first, pages = _peek(pages)
+    columns = list(columns or (first[0].keys() if first else []))
+    with io.TextIOWrapper(gzip.GzipFile(fileobj=out, mode='wb'), encoding='utf-8', newline='') as txt:
+        w = csv.writer(txt)
+        w.writerow(columns)
+        for page in pages: w.writerows([_cell(row.get(c)) for c in columns] for row in page)
+
+def write_parquet(out, columns, pages):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    first, pages = _peek(pages)
+    columns = list(columns or (first[0].keys() if first else []))
+    writer = None
+    try:
+        for page in pages:
+            rows = [{c: _cell(row.get(c)) for c in columns} for row in page]
+            if writer is None:
+                schema = pa.Table.from_pylist(rows).schema
+                # Kolom yang kosong semua di halaman pertama belum punya tipe; anggap string
+                schema = pa.schema([pa.field(f.name, pa.string()) if pa.types.is_null(f.type) else f for f in schema])
+                writer = pq.ParquetWriter(out, schema)
+            writer.write_table(pa.Table.from_pylist(rows, schema=writer.schema))
+        if writer is None:
+            # Tabel kosong: tetap file Parquet valid dengan kolomnya (tipe belum diketahui, anggap string)
+            pq.write_table(pa.table({c: pa.array([], pa.string()) for c in columns}), out)
+    finally:
+        if writer is not None: writer.close()
@@ -0,0 +1,129 @@
+# ==========================================
+# PERF: timing hot path (Supabase round trip & fungsi data)
+# Satu Profiler per proses. Tiap event dicatat ke ring buffer (p50/p95 rolling)
+# dan, bila SN_TRACKER_PERF_LOG di-set, ke file JSON lines.
+# ==========================================
+
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import pandas as pd
+
+_run_id = contextvars.ContextVar('perf_run_id', default=None)
+
+
+def start_run(run_id):
+    """Tandai rerun yang sedang berjalan; event berikutnya di thread ini ikut run_id ini."""
+    _run_id.set(run_id)
+
+def submit(pool, fn, *args):
+    """pool.submit yang membawa run_id ke worker thread (contextvar tidak diwarisi otomatis)."""
+    return pool.submit(contextvars.copy_context().run, fn, *args)
+
+def _size(data):
+    try: return len(json.dumps(data, default=str))
+    except Exception: return None
+
+def _rows(result):
+    if isinstance(result, (pd.DataFrame, list, dict)): return len(result)
+    if isinstance(result, tuple) and result and isinstance(result[0], (pd.DataFrame, list)): return len(result[0])
+    return None
+
+
+class Profiler:
+    def __init__(self, window=2000, log_path=None):
+        self._events = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.log_path = log_path
+
+    def record(self, kind, name, seconds, rows=None, nbytes=None, error=False):
+        ev = {'ts': time.time(), 'run': _run_id.get(), 'kind': kind, 'name': name,
+              'ms': round(seconds * 1000, 2), 'rows': rows, 'bytes': nbytes, 'error': error}
+        with self._lock:
+            self._events.append(ev)
+            if self.log_path:
+                try:
+                    with open(self.log_path, 'a', encoding='utf-8') as f: f.write(json.dumps(ev) + "\n")
+                except OSError: pass
+
+    def timed(self, name=None, kind='func'):
+        """Decorator: catat durasi & jumlah baris hasil sebuah fungsi data."""
+        def deco(fn):
+            label = name or fn.__name__
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                t = time.perf_counter()
+                try: result = fn(*args, **kwargs)
+                except Exception:
+                    self.record(kind, label, time.perf_counter() - t, error=True); raise
+                self.record(kind, label, time.perf_counter() - t, rows=_rows(result))
+                return result
+            return wrapper
+        return deco
+
+    def events(self):
+        with self._lock: return list(self._events)
+
+    def stats(self):
+        """Ringkasan per (kind, name) atas jendela rolling: count, p50, p95, max, rows, bytes."""
+        df = pd.DataFrame(self.events())
+        if df.empty: return df
+        g = df.groupby(['kind', 'name'])
+        out = g['ms'].agg(count='count', p50=lambda s: s.quantile(0.5), p95=lambda s: s.quantile(0.95), max='max', total='sum')
+        out['rows'] = g['rows'].sum(min_count=1)
+        out['bytes'] = g['bytes'].sum(min_count=1)
+        out['errors'] = g['error'].sum()
+        return out.reset_index().sort_values('total', ascending=False)
+
+    def run_breakdown(self, run_id):
+        return pd.DataFrame([e for e in self.events() if e['run'] == run_id])
+
+    def clear(self):
+        with self._lock: self._events.clear()
+
+
+class _Traced:
+    """Proxy builder PostgREST: meneruskan semua method, mengukur `.execute()`."""
+
+    def __init__(self, target, name, prof):
+        self._target, self._name, self._prof = target, name, prof
+
+    def __getattr__(self, attr):
+        val = getattr(self._target, attr)
+        if not callable(val): return val
+        def call(*args, **kwargs):
+            if attr == 'execute':
+                t = time.perf_counter()
+                try: res = val(*args, **kwargs)
+                except Exception:
+                    self._prof.record('db', self._name, time.perf_counter() - t, error=True); raise
+                data = getattr(res, 'data', None)
+                self._prof.record('db', self._name, time.perf_counter() - t,
+                                  rows=len(data) if isinstance(data, list) else None, nbytes=_size(data))
+                return res
+            out = val(*args, **kwargs)
+            if not hasattr(out, 'execute'): return out
+            # Nama = tabel.operasi pertama (select/insert/update/delete/upsert)
+            return _Traced(out, self._name if '.' in self._name else f"{self._name}.{attr}", self._prof)
+        return call
+
+
+class TracedClient:
+    """Bungkus client Supabase supaya setiap round trip tercatat di profiler."""
+
+    def __init__(self, client, prof):
+        self._client, self._prof = client, prof
+
+    def table(self, name): return _Traced(self._client.table(name), name, self._prof)
+
+    def rpc(self, fn, params=None): return _Traced(self._client.rpc(fn, params or {}), f"rpc.{fn}", self._prof)
+
+    def __getattr__(self, attr): return getattr(self._client, attr)
+
+
+profiler = Profiler(log_path=os.environ.get('SN_TRACKER_PERF_LOG'))
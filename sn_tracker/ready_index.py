@@ -0,0 +1,44 @@
+# ==========================================
+# READY INDEX: lookup stok Ready untuk Kasir
+# Dibangun sekali per versi inventory (lihat TableStore.derived), lalu
+# semua lookup di layar Kasir O(1) tanpa scan DataFrame.
+# ==========================================
+
+from sn_tracker.utils import format_rp, natural_sort_key
+
+
+class ReadyIndex:
+    """label produk -> SKU -> daftar SN (natural sort), dan SN -> baris."""
+
+    def __init__(self, df_ready):
+        self._sn = df_ready['sn'].astype(str).to_numpy()
+        self._brand = df_ready['brand'].astype(str).to_numpy()
+        self._sku = df_ready['sku'].astype(str).to_numpy()
+        self._price = df_ready['price'].astype('int64').to_numpy()
+        self._pos = {sn: i for i, sn in enumerate(self._sn)}
+        self._sku_pos = {str(k): v for k, v in df_ready.groupby('sku', observed=True, sort=False).indices.items()}
+        self._sorted = {}
+
+        # Label dibentuk dari kombinasi unik (brand, sku, price) saja, bukan per baris
+        combos = df_ready[['brand', 'sku', 'price']].astype({'brand': str, 'sku': str}).drop_duplicates()
+        self.products = {}
+        for brand, sku, price in combos.itertuples(index=False):
+            self.products[f"[{brand}] {sku} ({format_rp(price)})"] = {'brand': brand, 'sku': sku, 'price': int(price)}
+        self.labels = sorted(self.products)
+
+    def __len__(self): return len(self._sn)
+
+    def __contains__(self, sn): return sn in self._pos
+
+    def sns(self, sku):
+        """SN Ready untuk satu SKU, natural sort; diurutkan malas & di-memo per SKU."""
+        if sku not in self._sorted:
+            pos = self._sku_pos.get(sku, [])
+            self._sorted[sku] = sorted(self._sn[pos].tolist(), key=natural_sort_key) if len(pos) else []
+        return self._sorted[sku]
+
+    def row(self, sn):
+        """Baris siap masuk keranjang (tipe native, aman di-serialize ke JSON)."""
+        i = self._pos.get(sn)
+        if i is None: return None
+        return {'sn': self._sn[i], 'brand': self._brand[i], 'sku': self._sku[i], 'price': int(self._price[i])}
@@ -0,0 +1,99 @@
+# ==========================================
+# SEARCH INDEX: cari SN / SKU tanpa scan regex seluruh DataFrame
+# - SN: semua SN ternormalisasi digabung jadi satu teks, dicari dengan str.find
+#   (C speed) lalu offset dipetakan ke SN lewat bisect.
+# - SKU: kosakata SKU kecil (ribuan), masing-masing menunjuk ke set SN-nya.
+# Update inkremental: SN baru masuk "tail", SN terhapus ditandai tombstone,
+# teks SN dipadatkan ulang kalau tail/tombstone sudah besar.
+# ==========================================
+
+import heapq
+import threading
+from bisect import bisect_right
+from collections import Counter
+
+RANK_EXACT, RANK_SN_PREFIX, RANK_SKU_PREFIX, RANK_SN_SUB, RANK_SKU_SUB = range(5)
+COMPACT_AT = 5000
+
+
+def normalize(text): return str(text).strip().upper()
+
+
+class SearchIndex:
+    def __init__(self, df):
+        self._lock = threading.Lock()
+        self._brand = {}     # sn -> brand
+        self._sku_of = {}    # sn -> sku ternormalisasi
+        self._sku_sns = {}   # sku ternormalisasi -> set SN
+        self._tail = {}      # SN yang ditambah setelah teks dibangun
+        self._dead = set()   # SN di teks yang sudah dihapus/diganti
+        self._add_rows(df)
+        self._compact()
+
+    # --- UPDATE ---
+    def add(self, df):
+        with self._lock:
+            self._add_rows(df)
+            if len(self._tail) + len(self._dead) > COMPACT_AT: self._compact()
+
+    def _add_rows(self, df):
+        for sn, sku, brand in zip(df['sn'].astype(str), df['sku'].astype(str), df['brand'].astype(str)):
+            self._drop(sn)
+            sku_n = normalize(sku)
+            self._brand[sn] = brand
+            self._sku_of[sn] = sku_n
+            self._sku_sns.setdefault(sku_n, set()).add(sn)
+            self._tail[sn] = normalize(sn)
+
+    def remove(self, sns):
+        with self._lock:
+            for sn in sns: self._drop(sn)
+
+    def _drop(self, sn):
+        if sn not in self._brand: return
+        sku_n = self._sku_of.pop(sn)
+        self._sku_sns[sku_n].discard(sn)
+        if not self._sku_sns[sku_n]: del self._sku_sns[sku_n]
+        del self._brand[sn]
+        if self._tail.pop(sn, None) is None: self._dead.add(sn)
+
+    def _compact(self):
+        keys = sorted(self._brand)
+        self._keys = keys
+        self._starts, pos, parts = [], 0, []
+        for sn in keys:
+            n = normalize(sn)
+            self._starts.append(pos); parts.append(n); pos += len(n) + 1
+        self._text = "\n".join(parts) + "\n" if parts else ""
+        self._tail, self._dead = {}, set()
+
+    # --- QUERY ---
+    def query(self, q, brand=None, limit=200):
+        """Return (SN terurut relevansi [maks limit], total cocok, Counter brand)."""
+        qn = normalize(q)
+        if not qn or "\n" in qn: return [], 0, Counter()
+        with self._lock:
+            best = {}
+            def hit(sn, rank):
+                if rank < best.get(sn, 99): best[sn] = rank
+
+            pos = self._text.find(qn)
+            while pos != -1:
+                i = bisect_right(self._starts, pos) - 1
+                sn = self._keys[i]
+                if sn not in self._dead:
+                    start = self._starts[i]
+                    if pos == start: hit(sn, RANK_EXACT if self._text[start + len(qn)] == "\n" else RANK_SN_PREFIX)
+                    else: hit(sn, RANK_SN_SUB)
+                pos = self._text.find(qn, pos + 1)
+            for sn, sn_n in self._tail.items():
+                if qn in sn_n: hit(sn, RANK_EXACT if sn_n == qn else RANK_SN_PREFIX if sn_n.startswith(qn) else RANK_SN_SUB)
+            for sku_n, sns in self._sku_sns.items():
+                if qn in sku_n:
+                    rank = RANK_SKU_PREFIX if sku_n.startswith(qn) else RANK_SKU_SUB
+                    for sn in sns: hit(sn, rank)
+
+            facets = Counter(self._brand[sn] for sn in best)
+            if brand: best = {sn: r for sn, r in best.items() if self._brand[sn] == brand}
+            ranked = heapq.nsmallest(limit, best, key=lambda sn: (best[sn], sn))
+        return ranked, len(best), facets
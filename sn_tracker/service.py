@@ -0,0 +1,806 @@
+# ==========================================
+# SERVICE: operasi data inventory / transaksi / import log
+# Semua fungsi yang bicara ke database ada di sini supaya bisa di-import
+# tanpa menjalankan UI (benchmark, tool CLI, worker). Tidak bergantung pada
+# Streamlit: error dilempar ke pemanggil, UI yang menampilkannya.
+# Backend dipasang lewat configure() (lihat sn_tracker/backends).
+# ==========================================
+
+import tempfile
+import threading
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout, as_completed
+from datetime import datetime
+
+import pandas as pd
+
+from sn_tracker import perf
+from sn_tracker.checkout_queue import PENDING, CheckoutQueue
+from sn_tracker.export import write_xlsx, write_csv_gz, write_parquet
+from sn_tracker.perf import profiler
+from sn_tracker.ready_index import ReadyIndex
+from sn_tracker.search_index import SearchIndex
+from sn_tracker.store import TableStore
+from sn_tracker.utils import ttl_cache
+
+supabase = None   # backend aktif; di-set lewat configure()
+_store = None
+_store_lock = threading.Lock()
+_queue = None     # CheckoutQueue bila mode antrean offline aktif (enable_checkout_queue)
+_watch_interval = None   # detik antar cek versi inventory (enable_inventory_watch)
+
+
+def configure(client):
+    """Pasang backend (client Supabase, SQLiteBackend, atau stand-in bench) untuk semua fungsi
+    di modul ini. Store & cache milik backend sebelumnya dibuang."""
+    global supabase, _store
+    with _store_lock:
+        if _store is not None: _store.stop_watch()
+        supabase, _store = client, None
+    get_history_summary.clear()
+    get_sales_rollup.clear()
+    get_stock_aging.clear()
+    get_import_logs.clear()
+
+PREFETCH_WORKERS = 6
+_prefetch_pool = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="prefetch")
+
+
+def prefetch(*calls):
+    """Mulai beberapa fungsi data yang saling independen sekaligus (latency = query terlambat,
+    bukan jumlah semuanya). Tiap call = fungsi atau tuple (fn, *args). Return list Future.
+
+    Fungsi ber-cache (store, ttl_cache) ikut terisi, jadi pemanggilan biasa sesudahnya
+    langsung kena cache atau menunggu fetch yang sedang jalan, bukan query ulang.
+    """
+    return [perf.submit(_prefetch_pool, *(c if isinstance(c, tuple) else (c,))) for c in calls]
+
+def clear_cache():
+    """Full reload manual (tombol Refresh / setelah reset). Tulis biasa cukup apply delta ke store."""
+    inventory_store().reload()
+    get_history_summary.clear()
+    get_sales_rollup.clear()
+    get_stock_aging.clear()
+    get_import_logs.clear()
+
+# --- READ DATA (Cached) ---
+PAGE_SIZE = 1000          # <= max-rows default PostgREST, supaya tidak terpotong diam-diam
+FETCH_WORKERS = 4
+INVENTORY_COLS = ('sn', 'brand', 'sku', 'price', 'status')
+READY_COLS = ('sn', 'brand', 'sku', 'price')
+STORE_INVENTORY_COLS = ('sn', 'brand', 'sku', 'price', 'status', 'created_at', 'sold_at', 'updated_at')
+HISTORY_COLS = ('trx_id', 'timestamp', 'user', 'total_bill', 'items_count')
+HISTORY_PAGE = 50
+HISTORY_TABLE = 'transactions_all'   # transaksi + arsip (sql/011_transactions_all.sql)
+LOCAL_TZ = 'Asia/Jakarta'
+
+def compact_inventory(df):
+    """Dtype hemat memori: kategori untuk kolom berulang, int32 untuk harga."""
+    for c in ('brand', 'sku', 'status'):
+        if c in df.columns: df[c] = df[c].astype('category')
+    if 'price' in df.columns: df['price'] = pd.to_numeric(df['price'], errors='coerce').fillna(0).astype('int32')
+    return df
+
+def _select(table, columns, filters=None, count=None):
+    q = supabase.table(table).select(",".join(columns) if columns else "*", count=count)
+    for col, val in (filters or {}).items():
+        # Nilai tuple = (operator, nilai), mis. {'updated_at': ('gt', ts)}
+        q = getattr(q, val[0])(col, val[1]) if isinstance(val, tuple) else q.eq(col, val)
+    return q
+
+def iter_table_pages(table, columns=None, key='sn', filters=None, page_size=PAGE_SIZE, after=None, upto=None):
+    """Keyset pagination (WHERE key > last ORDER BY key): aman untuk tabel besar & streaming.
+    `after`/`upto` membatasi ke rentang kunci (after, upto]."""
+    last = after
+    while True:
+        q = _select(table, columns, filters).order(key)
+        if last is not None: q = q.gt(key, last)
+        if upto is not None: q = q.lte(key, upto)
+        rows = q.limit(page_size).execute().data
+        if not rows: break
+        yield rows
+        if len(rows) < page_size: break
+        last = rows[-1][key]
+
+def _key_bounds(table, key, filters, after, total, parts):
+    """Titik potong ruang kunci: kunci di posisi total*i/parts, satu baris kolom key saja per titik.
+    OFFSET hanya dipakai di sini (parts-1 kali, index-only), bukan untuk tiap halaman.
+    Urutan hasil map sudah urutan DB; tidak di-sort/dibandingkan ulang di Python karena
+    collation DB bisa berbeda dari perbandingan string Python."""
+    def at(offset):
+        rows = _select(table, [key], filters).order(key).range(offset, offset).execute().data
+        return rows[0][key] if rows else None
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        keys = pool.map(at, [total * i // parts for i in range(1, parts)])
+    bounds = [after]
+    for k in keys:
+        if k is not None and k != bounds[-1]: bounds.append(k)
+    return bounds + [None]
+
+@profiler.timed()
+def fetch_table_df(table, columns=None, key='sn', filters=None, page_size=PAGE_SIZE):
+    """Halaman pertama sekaligus hitung total; sisanya dibagi jadi FETCH_WORKERS rentang kunci
+    yang masing-masing di-keyset paralel. Tiap halaman O(page_size), dan baris yang dihapus
+    selama load tidak menggeser halaman lain (beda dengan window OFFSET)."""
+    first = _select(table, columns, filters, count='exact').order(key).limit(page_size).execute()
+    pages = {0: compact_inventory(pd.DataFrame(first.data))}
+    total = first.count or len(first.data)
+    if total > page_size and len(first.data) == page_size:
+        parts = max(1, min(FETCH_WORKERS, -(-(total - page_size) // page_size)))
+        bounds = _key_bounds(table, key, filters, first.data[-1][key], total, parts)
+        def fetch(lo, hi):
+            # Frame dibangun per halaman begitu datang, bukan dari satu list raksasa
+            frames = [compact_inventory(pd.DataFrame(rows)) for rows in iter_table_pages(table, columns, key, filters, page_size, after=lo, upto=hi)]
+            return pd.concat(frames, ignore_index=True) if frames else None
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+            futures = {perf.submit(pool, fetch, lo, hi): i for i, (lo, hi) in enumerate(zip(bounds, bounds[1:]), 1)}
+            for fut in as_completed(futures):
+                part = fut.result()
+                if part is not None: pages[futures[fut]] = part
+    df = pd.concat([pages[k] for k in sorted(pages)], ignore_index=True) if len(pages) > 1 else pages[0]
+    return df
+
+# Store per proses (bukan per sesi): load penuh sekali, lalu hanya tarik baris yang berubah
+# sejak high-water mark. Butuh kolom inventory.updated_at (lihat sql/001_inventory_updated_at.sql);
+# hapus & penanda versi dari sql/009_inventory_changes.sql.
+FULL_RELOAD_INTERVAL = 3600   # DELETE sudah ikut delta lewat inventory_deleted; ini jaring pengaman
+
+def _deleted_since(ts):
+    rows = [r for page in iter_table_pages('inventory_deleted', ['sn', 'deleted_at'], filters={'deleted_at': ('gt', ts)}) for r in page]
+    return pd.DataFrame(rows, columns=['sn', 'deleted_at'])
+
+def _inventory_version():
+    rows = supabase.table('inventory_version').select("version,reset").limit(1).execute().data
+    return rows[0] if rows else {}
+
+def inventory_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = TableStore(
+                'sn', 'updated_at', STORE_INVENTORY_COLS,
+                load_full=lambda: fetch_table_df('inventory', STORE_INVENTORY_COLS),
+                load_since=lambda ts: fetch_table_df('inventory', STORE_INVENTORY_COLS, filters={'updated_at': ('gt', ts)}),
+                load_deleted_since=_deleted_since,
+                prepare=compact_inventory, full_interval=FULL_RELOAD_INTERVAL)
+            if _queue is not None: _hold_queued(_store)
+            if _watch_interval: _store.watch(_inventory_version, _watch_interval)
+        return _store
+
+def enable_inventory_watch(interval=1.0):
+    """Cek versi inventory tiap `interval` detik; perubahan dari proses/kasir lain ditarik
+    sebagai delta, jadi SN yang terjual di kasir lain hilang dari index dalam ~1 detik."""
+    global _watch_interval
+    with _store_lock:
+        _watch_interval = interval
+        if _store is not None: _store.watch(_inventory_version, interval)
+
+def get_inventory_df(columns=INVENTORY_COLS, status=None):
+    def build(df):
+        if status: df = df[df['status'] == status]
+        return df[list(columns)].reset_index(drop=True)
+    return inventory_store().derived(('inventory', columns, status), build)
+
+@profiler.timed()
+def get_ready_index():
+    """Index Kasir, dibangun ulang hanya saat versi inventory berubah."""
+    return inventory_store().derived('ready_index', lambda df: ReadyIndex(get_inventory_df(READY_COLS, status='Ready')))
+
+SEARCH_LIMIT = 200
+
+@profiler.timed()
+def search_inventory(q, brand=None, limit=SEARCH_LIMIT):
+    """Cari SN/SKU lewat SearchIndex (dirawat inkremental oleh store).
+
+    Return (DataFrame hasil terurut relevansi, total cocok, Counter brand untuk facet).
+    """
+    sns, total, facets = inventory_store().index('search', SearchIndex).query(q, brand, limit)
+    df = get_inventory_df()
+    hits = df[df['sn'].isin(sns)]
+    rank = {sn: i for i, sn in enumerate(sns)}
+    return hits.iloc[hits['sn'].map(rank).argsort()], total, facets
+
+LOW_STOCK_THRESHOLD = 5
+
+def _fetch_stock_summary():
+    rows, offset = [], 0
+    while True:
+        page = supabase.table('stock_summary').select("brand,sku,price,units").order('brand').order('sku').order('price').range(offset, offset + PAGE_SIZE - 1).execute().data
+        rows.extend(page); offset += PAGE_SIZE
+        if len(page) < PAGE_SIZE: break
+    return compact_inventory(pd.DataFrame(rows, columns=['brand', 'sku', 'price', 'units']))
+
+@profiler.timed()
+def get_stock_summary():
+    """Unit Ready per (brand, sku, price).
+
+    Kalau store proses ini sudah ter-load, rekap dimaterialisasi sekali per versi inventory
+    (jadi ikut berubah tiap tulis, bukan dihitung ulang tiap rerun). Kalau belum, baca view
+    `stock_summary` (sql/002_stock_summary.sql) tanpa menarik tabel level-SN.
+    """
+    store = inventory_store()
+    if store.df is None:
+        try: return _fetch_stock_summary()
+        except Exception as e: print(f"Summary View Error: {e}")
+    return store.derived('stock_summary', lambda df: get_inventory_df(READY_COLS, status='Ready').groupby(['brand', 'sku', 'price'], observed=True).size().reset_index(name='units').sort_values(['brand', 'sku']).reset_index(drop=True))
+
+def stock_totals(summary):
+    return {'units': int(summary['units'].sum()), 'asset': int((summary['units'] * summary['price'].astype('int64')).sum()), 'products': len(summary)}
+
+def low_stock_skus(summary, by=('brand', 'sku')):
+    per = summary.groupby(list(by), observed=True)['units'].sum().reset_index()
+    return per[per['units'] < LOW_STOCK_THRESHOLD]
+
+@profiler.timed()
+def find_sn(sn):
+    """Lookup satu SN untuk scan kasir: index Ready di memori, fallback query ber-index PK (sn)."""
+    row = get_ready_index().row(sn)
+    if row: return row, 'Ready'
+    res = supabase.table('inventory').select(",".join(STORE_INVENTORY_COLS)).eq('sn', sn).limit(1).execute()
+    if not res.data: return None, None
+    r = res.data[0]
+    inventory_store().upsert([r]) # cache ketinggalan, sekalian disegarkan
+    status = inventory_store().held(sn).get('status', r['status'])   # terjual lokal, belum tersinkron
+    return {'sn': r['sn'], 'brand': r['brand'], 'sku': r['sku'], 'price': int(r['price'])}, status
+
+# --- RIWAYAT TRANSAKSI (paginated, tanpa item_details) ---
+def _day_bounds(date_from, date_to):
+    """Tanggal lokal -> rentang [awal hari, awal hari berikutnya) dalam ISO ber-timezone."""
+    p_from = pd.Timestamp(date_from, tz=LOCAL_TZ).isoformat() if date_from else None
+    p_to = (pd.Timestamp(date_to, tz=LOCAL_TZ) + pd.Timedelta(days=1)).isoformat() if date_to else None
+    return p_from, p_to
+
+@ttl_cache(60)
+@profiler.timed()
+def get_history_summary(date_from=None, date_to=None):
+    """Omzet & jumlah transaksi (termasuk arsip) via RPC transactions_summary (sql/011_transactions_all.sql)."""
+    p_from, p_to = _day_bounds(date_from, date_to)
+    return supabase.rpc('transactions_summary', {'p_from': p_from, 'p_to': p_to}).execute().data
+
+# --- ANALITIK (rollup sql/008_sales_rollup.sql, diolah di sn_tracker/analytics.py) ---
+ROLLUP_COLS = ['period', 'brand', 'sku', 'units_sold', 'revenue', 'units_in', 'value_in']
+AGING_COLS = ['brand', 'sku', 'age_from', 'units', 'value']
+
+@ttl_cache(60)
+@profiler.timed()
+def get_sales_rollup(date_from=None, date_to=None, grain='day'):
+    """Unit & omzet terjual + unit & nilai stok masuk per periode (day/week/month) x brand x SKU."""
+    params = {'p_from': date_from.isoformat() if date_from else None, 'p_to': date_to.isoformat() if date_to else None, 'p_grain': grain}
+    df = pd.DataFrame(supabase.rpc('sales_rollup', params).execute().data or [], columns=ROLLUP_COLS)
+    df['period'] = pd.to_datetime(df['period'])
+    for c in ROLLUP_COLS[3:]: df[c] = pd.to_numeric(df[c]).fillna(0).astype('int64')
+    return compact_inventory(df.sort_values(['period', 'brand', 'sku'], ignore_index=True))
+
+@ttl_cache(300)
+@profiler.timed()
+def get_stock_aging():
+    """Stok Ready per brand/SKU/kelompok umur (view stock_aging), tanpa menarik tabel level-SN."""
+    rows, offset = [], 0
+    while True:
+        page = supabase.table('stock_aging').select(",".join(AGING_COLS)).order('brand').order('sku').order('age_from').range(offset, offset + PAGE_SIZE - 1).execute().data
+        rows.extend(page); offset += PAGE_SIZE
+        if len(page) < PAGE_SIZE: break
+    return compact_inventory(pd.DataFrame(rows, columns=AGING_COLS))
+
+def _pg_quote(value):
+    """Nilai filter or_() PostgREST dikutip ganda: aman untuk koma, titik dua, dan kurung."""
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+@profiler.timed()
+def get_history_page(date_from=None, date_to=None, cursor=None, q="", limit=HISTORY_PAGE):
+    """Satu halaman riwayat terbaru-dulu, keyset pada (timestamp, trx_id) supaya transaksi dengan
+    timestamp sama tidak terlewat di batas halaman. Return (df, cursor berikutnya)."""
+    p_from, p_to = _day_bounds(date_from, date_to)
+    query = supabase.table(HISTORY_TABLE).select(",".join(HISTORY_COLS)).order('timestamp', desc=True).order('trx_id', desc=True).limit(limit)
+    if p_from: query = query.gte('timestamp', p_from)
+    if p_to: query = query.lt('timestamp', p_to)
+    if cursor:
+        ts, trx = (_pg_quote(x) for x in cursor)
+        # lte ikut dikirim supaya index timestamp tetap jadi batas scan; or_ hanya memilah yang seri
+        query = query.lte('timestamp', cursor[0]).or_(f"timestamp.lt.{ts},and(timestamp.eq.{ts},trx_id.lt.{trx})")
+    if q and q.strip(): query = query.ilike('trx_id', f"%{q.strip()}%")
+    rows = query.execute().data
+    return pd.DataFrame(rows, columns=list(HISTORY_COLS)), ((rows[-1]['timestamp'], rows[-1]['trx_id']) if len(rows) == limit else None)
+
+@profiler.timed()
+def get_transaction_detail(trx_id):
+    """item_details hanya diambil untuk transaksi yang dipilih."""
+    rows = supabase.table(HISTORY_TABLE).select("*").eq('trx_id', trx_id).limit(1).execute().data
+    return rows[0] if rows else None
+
+# --- LOG IMPORT (ringkasan + detail per halaman, sql/007_import_batches.sql) ---
+LOG_COLS = ('id', 'timestamp', 'user', 'method', 'total_items', 'batch_id', 'total_value', 'dups', 'failed_rows', 'brands')
+LOG_DETAIL_COLS = ('sn', 'brand', 'sku', 'price', 'status')
+LOG_DETAIL_PAGE = 100
+
+@ttl_cache(300)
+def get_import_logs():
+    """20 log terbaru, hanya ringkasan (tanpa daftar SN)."""
+    return supabase.table('import_logs').select(",".join(LOG_COLS)).order('timestamp', desc=True).limit(20).execute().data
+
+def _legacy_log_items(log_id):
+    # Log sebelum 007 tidak punya batch_id; daftar SN-nya masih di items_detail
+    rows = supabase.table('import_logs').select("items_detail").eq('id', log_id).limit(1).execute().data
+    return (rows[0].get('items_detail') if rows else None) or []
+
+@profiler.timed()
+def get_import_log_items(log, page=0, page_size=LOG_DETAIL_PAGE):
+    """Satu halaman SN milik sebuah log import. Return (DataFrame, total SN)."""
+    start = page * page_size
+    if log.get('batch_id'):
+        res = (supabase.table('inventory').select(",".join(LOG_DETAIL_COLS), count='exact')
+               .eq('import_batch_id', log['batch_id']).order('sn').range(start, start + page_size - 1).execute())
+        return pd.DataFrame(res.data, columns=list(LOG_DETAIL_COLS)), res.count or 0
+    items = _legacy_log_items(log['id'])
+    return pd.DataFrame(items[start:start + page_size], columns=list(LOG_DETAIL_COLS[:4])), len(items)
+
+def new_batch_id():
+    return uuid.uuid4().hex
+
+def log_import_activity(user, method, batch_id, added, total_value=0, brands=None, dups=0, failed_rows=0):
+    try:
+        log_data = {'timestamp': datetime.now().isoformat(), 'user': user, 'method': method, 'total_items': added,
+                    'batch_id': batch_id, 'total_value': int(total_value), 'brands': dict(brands or {}),
+                    'dups': int(dups), 'failed_rows': int(failed_rows)}
+        supabase.table('import_logs').insert(log_data).execute()
+        get_import_logs.clear()
+    except Exception as e: print(f"Log Error: {e}")
+
+# --- WRITE DATA ---
+
+@profiler.timed()
+def add_stock_batch(user, brand, sku, price, sn_list):
+    clean_sn_list = []
+    for sn in sn_list:
+        clean_sn = sn.strip().upper() 
+        if clean_sn: clean_sn_list.append(clean_sn)
+    clean_sn_list = list(set(clean_sn_list))
+    if not clean_sn_list: return 0, 0, []
+
+    try:
+        response = supabase.table('inventory').select("sn").in_("sn", clean_sn_list).execute()
+        existing_sns = [item['sn'] for item in response.data]
+    except: existing_sns = []
+
+    new_items = []
+    duplicate_items = []
+    batch_id = new_batch_id()
+    
+    for sn in clean_sn_list:
+        if sn in existing_sns: duplicate_items.append(sn)
+        else:
+            item = {'sn': sn, 'brand': brand, 'sku': sku, 'price': int(price), 'status': 'Ready', 'created_at': datetime.now().isoformat(), 'import_batch_id': batch_id}
+            new_items.append(item)
+    
+    if new_items:
+        supabase.table('inventory').insert(new_items).execute()
+        inventory_store().upsert(new_items)
+        log_import_activity(user, "Manual Input", batch_id, len(new_items), int(price) * len(new_items), {brand: len(new_items)}, len(duplicate_items))
+    return len(new_items), len(duplicate_items), duplicate_items
+
+IMPORT_WORKERS = 4        # batas request paralel ke Supabase saat import
+DUP_CHECK_BATCH = 500     # panjang URL in_(...) tetap aman
+INSERT_BATCH = 1000
+
+def build_inventory_records(df, created_at, batch_id=None):
+    """Rakit payload insert secara vectorized (tanpa iterrows, satu timestamp & batch per import).
+    Harga harus sudah lolos _valid_prices; sisa nilai tak terbaca membuat error, bukan jadi 0."""
+    out = pd.DataFrame({'sn': df['sn'], 'brand': df['brand'].astype(str), 'sku': df['sku'].astype(str),
+                        'price': pd.to_numeric(df['price']).astype('int64')})
+    out['status'] = 'Ready'
+    out['created_at'] = created_at
+    out['import_batch_id'] = batch_id
+    return out.to_dict('records')
+
+def _valid_prices(df, failed):
+    """Buang baris yang harganya tidak terbaca sebagai angka ("6.000.000", "Rp 6.000.000", kosong)
+    dan laporkan ke `failed`, supaya unit tidak terjual seharga Rp 0. Return df dengan harga numerik."""
+    price = pd.to_numeric(df['price'], errors='coerce')
+    bad = price.isna()
+    failed.extend({'tahap': 'validasi harga', 'batch': None, 'rows': 1, 'sn_awal': sn, 'error': f"harga tidak valid: {raw!r}"}
+                  for sn, raw in zip(df.loc[bad, 'sn'], df.loc[bad, 'price']))
+    return df[~bad].assign(price=price[~bad])
+
+def run_batches(fn, batches, progress=None, start=0.0, span=1.0, label=""):
+    """Jalankan fn(batch) lewat worker pool terbatas. Return ({idx: hasil}, {idx: error})."""
+    results, errors = {}, {}
+    if not batches: return results, errors
+    with ThreadPoolExecutor(max_workers=IMPORT_WORKERS) as pool:
+        futures = {perf.submit(pool, fn, b): i for i, b in enumerate(batches)}
+        for done, fut in enumerate(as_completed(futures), 1):
+            i = futures[fut]
+            try: results[i] = fut.result()
+            except Exception as e: errors[i] = str(e)
+            # progress dipanggil di thread script, bukan dari worker (st.* tidak thread-safe)
+            if progress: progress(start + span * done / len(batches), f"{label} {done}/{len(batches)}")
+    return results, errors
+
+def _import_chunk(df, created_at, batch_id, progress=None, start=0.0, span=1.0):
+    """Normalisasi + cek duplikat + insert satu DataFrame. Return (inserted, jumlah_dup, failed)."""
+    df.columns = [str(c).lower().strip() for c in df.columns]
+    df['sn'] = df['sn'].astype(str).str.strip().str.upper()
+    df = df[df['sn'] != ''].drop_duplicates(subset=['sn'])
+    failed = []
+    df = _valid_prices(df, failed)
+    sn_list = df['sn'].tolist()
+
+    # 1. Cek duplikat paralel
+    sn_batches = [sn_list[i:i + DUP_CHECK_BATCH] for i in range(0, len(sn_list), DUP_CHECK_BATCH)]
+    found, errors = run_batches(lambda b: [x['sn'] for x in supabase.table('inventory').select("sn").in_("sn", b).execute().data],
+                                sn_batches, progress, start, span * 0.3, "Cek duplikat")
+    existing = {sn for batch in found.values() for sn in batch}
+    unchecked = set()
+    for i, err in errors.items():
+        unchecked.update(sn_batches[i])
+        failed.append({'tahap': 'cek duplikat', 'batch': i + 1, 'rows': len(sn_batches[i]), 'sn_awal': sn_batches[i][0], 'error': err})
+    dups = int(df['sn'].isin(existing).sum())
+    df_new = df[~df['sn'].isin(existing) & ~df['sn'].isin(unchecked)]
+
+    # 2. Insert paralel per batch
+    records = build_inventory_records(df_new, created_at, batch_id)
+    rec_batches = [records[i:i + INSERT_BATCH] for i in range(0, len(records), INSERT_BATCH)]
+    _, errors = run_batches(lambda b: supabase.table('inventory').insert(b).execute(), rec_batches, progress, start + span * 0.3, span * 0.7, "Simpan")
+    inserted = [r for i, b in enumerate(rec_batches) if i not in errors for r in b]
+    for i, err in errors.items():
+        failed.append({'tahap': 'insert', 'batch': i + 1, 'rows': len(rec_batches[i]), 'sn_awal': rec_batches[i][0]['sn'], 'error': err})
+    if inserted: inventory_store().upsert(inserted)
+    return inserted, dups, failed
+
+def _import_result(added, dups, failed):
+    return {'ok': not failed, 'added': added, 'dups': dups, 'failed': failed, 'failed_rows': sum(f['rows'] for f in failed)}
+
+@profiler.timed()
+def import_stock_from_df(user, df, progress=None):
+    """Import stok massal. Batch yang gagal dilaporkan, batch lain tetap tersimpan.
+
+    Return dict: added, dups, failed (list per batch), failed_rows, ok.
+    """
+    batch_id = new_batch_id()
+    inserted, dups, failed = _import_chunk(df, datetime.now().isoformat(), batch_id, progress)
+    if inserted:
+        log_import_activity(user, "Excel Import", batch_id, len(inserted), sum(r['price'] for r in inserted),
+                            Counter(r['brand'] for r in inserted), dups, sum(f['rows'] for f in failed))
+    return _import_result(len(inserted), dups, failed)
+
+@profiler.timed()
+def import_stock_stream(user, chunks, progress=None):
+    """Versi streaming: `chunks` = iterator (DataFrame, fraksi) dari iter_upload_chunks.
+
+    Chunk diproses berurutan, jadi SN yang berulang di chunk berikutnya tertangkap oleh
+    cek duplikat ke DB. Yang ditahan di memori hanya angka ringkasan untuk log.
+    """
+    created_at, batch_id = datetime.now().isoformat(), new_batch_id()
+    added, dups, failed, value, brands = 0, 0, [], 0, Counter()
+    for n, (chunk, frac) in enumerate(chunks, 1):
+        ins, d, f = _import_chunk(chunk, created_at, batch_id)
+        added += len(ins); dups += d
+        failed.extend(dict(x, chunk=n) for x in f)
+        value += sum(r['price'] for r in ins)
+        brands.update(r['brand'] for r in ins)
+        if progress: progress(frac, f"Chunk {n}: +{added} tersimpan, {dups} duplikat")
+    if added: log_import_activity(user, "Excel Import", batch_id, added, value, brands, dups, sum(f['rows'] for f in failed))
+    return _import_result(added, dups, failed)
+
+def new_trx_id():
+    """ID unik lintas kasir (detik + acak), tidak tabrakan walau checkout di detik yang sama."""
+    return f"TRX-{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:6].upper()}"
+
+def refresh_rows(sns):
+    """Tarik ulang beberapa SN ke store (mis. setelah konflik checkout)."""
+    rows = supabase.table('inventory').select(",".join(STORE_INVENTORY_COLS)).in_('sn', list(sns)).execute().data
+    if rows: inventory_store().upsert(rows)
+
+@profiler.timed()
+def process_checkout(user, cart_items, idempotency_key=None):
+    """Checkout lewat RPC `checkout` (sql/003_checkout_rpc.sql) dalam satu round trip.
+
+    Hanya SN yang masih Ready yang di-flip ke Sold; bila ada yang sudah tidak Ready tidak ada
+    yang ditulis dan SN tersebut dikembalikan. Idempotency key yang sama = transaksi yang sama,
+    jadi retry setelah timeout tidak menagih dua kali. Return (trx_id, total, conflicts);
+    error koneksi/DB dilempar ke pemanggil.
+    """
+    sn_sold = [item['sn'] for item in cart_items]
+    if _queue is not None: return _queue_checkout(user, cart_items, idempotency_key or uuid.uuid4().hex)
+    params = {'p_trx_id': new_trx_id(), 'p_user': user, 'p_items': cart_items, 'p_idempotency_key': idempotency_key or uuid.uuid4().hex}
+    res = supabase.rpc('checkout', params).execute().data
+    if res['status'] == 'conflict':
+        try: refresh_rows(res['conflicts'])
+        except Exception as e: print(f"Refresh Error: {e}")
+        return None, 0, res['conflicts']
+    # O(keranjang): cukup terapkan perubahan ke store, tanpa download ulang tabel
+    inventory_store().update(sn_sold, {'status': 'Sold', 'sold_at': res['sold_at']})
+    get_history_summary.clear()
+    return res['trx_id'], res['total'], []
+
+# --- RESERVASI KERANJANG (sql/010_cart_reservations.sql) ---
+RESERVE_TTL = 900      # detik; diperpanjang tiap SN ditambah dan saat validasi sebelum bayar
+RESERVE_TIMEOUT = 1.5  # detik; batas tunggu kasir untuk reserve_sns saat antrean checkout aktif
+
+def _reserve(holder, sns, ttl=RESERVE_TTL):
+    rows = supabase.rpc('reserve_sns', {'p_sns': list(sns), 'p_holder': holder, 'p_ttl_s': ttl}).execute().data or []
+    return {r['sn']: r for r in rows}
+
+def _reserve_nonblocking(holder, sns):
+    """Mode antrean: kasir tidak boleh menunggu jaringan. Saat antrean melaporkan error
+    (offline) RPC dilewati; selain itu ditunggu paling lama RESERVE_TIMEOUT lalu dibiarkan
+    selesai di latar. Return None bila hasilnya tidak ditunggu. Tanpa antrean: sinkron."""
+    if _queue is None: return _reserve(holder, sns)
+    if _queue.last_error is not None: return None
+    job = perf.submit(_prefetch_pool, _reserve, holder, sns)
+    try: return job.result(timeout=RESERVE_TIMEOUT)
+    except FutureTimeout: return None
+
+def _reserve_problem(r):
+    if r.get('status') is None: return "tidak ditemukan"
+    if r['status'] != 'Ready': return r['status']
+    if r.get('held_by_other'): return "di keranjang kasir lain"
+    return None
+
+def _refresh_from_reserve(res):
+    # Status server yang lebih baru dari store lokal sekalian diterapkan
+    for status in {r['status'] for r in res.values() if r.get('status') not in (None, 'Ready')}:
+        inventory_store().update([sn for sn, r in res.items() if r.get('status') == status], {'status': status})
+
+@profiler.timed()
+def reserve_cart(holder, rows):
+    """Kunci SN untuk keranjang `holder` dalam satu round trip. Return (baris yang boleh masuk
+    keranjang, {sn: alasan ditolak}). Bila server tidak terjangkau (atau lambat saat antrean
+    checkout aktif) semua baris diterima tanpa reservasi; bentrok tetap tertangkap saat checkout."""
+    if not rows: return [], {}
+    try: res = _reserve_nonblocking(holder, [r['sn'] for r in rows])
+    except Exception as e:
+        print(f"Reserve Error: {e}"); return list(rows), {}
+    if res is None: return list(rows), {}
+    _refresh_from_reserve(res)
+    ok, failed = [], {}
+    for row in rows:
+        problem = _reserve_problem(res.get(row['sn'], {}))
+        if problem: failed[row['sn']] = problem
+        else: ok.append(row)
+    return ok, failed
+
+@profiler.timed()
+def validate_cart(holder, cart):
+    """Cek ulang seluruh keranjang sebelum bayar (satu round trip, sekaligus memperpanjang reservasi).
+
+    Return (keranjang baru, {sn: alasan dikeluarkan}, {sn: (harga lama, harga baru)}).
+    Keranjang baru memakai harga server terbaru.
+    """
+    if not cart: return [], {}, {}
+    try: res = _reserve_nonblocking(holder, [x['sn'] for x in cart])
+    except Exception as e:
+        print(f"Validate Cart Error: {e}"); return list(cart), {}, {}
+    if res is None: return list(cart), {}, {}
+    _refresh_from_reserve(res)
+    fresh, removed, repriced = [], {}, {}
+    for row in cart:
+        r = res.get(row['sn'], {})
+        problem = _reserve_problem(r)
+        if problem: removed[row['sn']] = problem; continue
+        if r.get('price') is not None and int(r['price']) != int(row['price']):
+            repriced[row['sn']] = (int(row['price']), int(r['price']))
+            row = dict(row, price=int(r['price']))
+        fresh.append(row)
+    return fresh, removed, repriced
+
+def release_cart(holder, sns=None):
+    """Lepas reservasi keranjang (semua, atau hanya `sns`)."""
+    try: return supabase.rpc('release_sns', {'p_holder': holder, 'p_sns': list(sns) if sns is not None else None}).execute().data
+    except Exception as e: print(f"Release Error: {e}")
+
+_release_on_final = {}   # idempotency_key -> (holder, sns): reservasi ditahan sampai transaksi antrean final
+
+def release_after_checkout(holder, sns, idempotency_key):
+    """Lepas reservasi SN yang baru dibayar, tanpa menunggu jaringan. Mode antrean: transaksi bisa
+    masih pending dan server masih melihat SN-nya Ready, jadi reservasi baru dilepas oleh
+    _on_checkout_final setelah server menjawab (kasir lain tidak bisa mengambil SN itu dulu)."""
+    sns = list(sns)
+    if _queue is not None:
+        # Daftar dulu baru cek status: flusher yang menyelesaikan transaksi di antaranya tetap melepasnya
+        _release_on_final[idempotency_key] = (holder, sns)
+        row = _queue.get(idempotency_key)
+        if row is not None and row['status'] == PENDING: return
+        if _release_on_final.pop(idempotency_key, None) is None: return
+    prefetch((release_cart, holder, sns))
+
+# --- ANTREAN CHECKOUT OFFLINE (sn_tracker/checkout_queue.py, sql/006_checkout_batch.sql) ---
+def enable_checkout_queue(path):
+    """Checkout dicatat ke antrean SQLite lokal lalu dikirim thread latar; kasir tidak menunggu server."""
+    global _queue
+    with _store_lock:
+        if _queue is not None and _queue.path == path: return _queue
+        if _queue is not None: _queue.stop()
+        _queue = CheckoutQueue(path, _send_checkouts, _on_checkout_final)
+        if _store is not None: _hold_queued(_store)
+    _queue.start()
+    return _queue
+
+def disable_checkout_queue():
+    """Matikan antrean (checkout kembali langsung ke server). Transaksi pending tetap di file antrean."""
+    global _queue
+    with _store_lock: queue, _queue = _queue, None
+    if queue is not None: queue.stop()
+
+def checkout_queue_status():
+    """Status sinkron untuk UI, atau None bila antrean tidak aktif."""
+    return _queue.status() if _queue is not None else None
+
+def checkout_conflicts():
+    return _queue.conflicts() if _queue is not None else []
+
+def dismiss_checkout_conflict(idempotency_key):
+    if _queue is not None: _queue.dismiss(idempotency_key)
+
+def _hold_queued(store):
+    # SN di transaksi yang belum terkirim tetap Sold di store walau server masih bilang Ready
+    for row in _queue.pending():
+        store.hold([x['sn'] for x in row['items']], {'status': 'Sold', 'sold_at': row['created_at']})
+
+def _queue_checkout(user, cart_items, key):
+    prev = _queue.get(key)
+    if prev: return prev['trx_id'], prev['total'], []   # klik ganda / rerun: transaksi yang sama
+    sns = [item['sn'] for item in cart_items]
+    queued = _queue.pending_sns()
+    df = inventory_store().df
+    sold_here = set(df.loc[df['sn'].isin(sns) & (df['status'] != 'Ready'), 'sn']) if df is not None else set()
+    conflicts = [sn for sn in sns if sn in queued or sn in sold_here]
+    if conflicts: return None, 0, conflicts
+    row = _queue.enqueue(new_trx_id(), user, cart_items, key)
+    inventory_store().hold(sns, {'status': 'Sold', 'sold_at': row['created_at']})
+    return row['trx_id'], row['total'], []
+
+def _send_checkouts(rows):
+    payload = [{'trx_id': r['trx_id'], 'user': r['user'], 'items': r['items'], 'idempotency_key': r['idempotency_key'],
+                'sold_at': r['created_at']} for r in rows]
+    return supabase.rpc('checkout_batch', {'p_batch': payload}).execute().data
+
+def _on_checkout_final(row, res):
+    sns = [x['sn'] for x in row['items']]
+    store = inventory_store()
+    store.release(sns)
+    job = _release_on_final.pop(row['idempotency_key'], None)
+    if job: release_cart(*job)   # reservasi keranjang baru dilepas setelah server menjawab
+    if res['status'] == 'conflict':
+        # Server menolak seluruh transaksi: kembalikan SN-nya ke kondisi server
+        refresh_rows(sns)
+        return
+    store.update(sns, {'status': 'Sold', 'sold_at': res['sold_at']})
+    get_history_summary.clear()
+
+def update_stock_price(sn, new_price):
+    supabase.table('inventory').update({'price': int(new_price)}).eq('sn', sn).execute(); inventory_store().update([sn], {'price': int(new_price)})
+
+def delete_stock(sn):
+    supabase.table('inventory').delete().eq('sn', sn).execute(); inventory_store().delete([sn])
+
+# --- OPERASI MASSAL ---
+BULK_BATCH = 500   # SN per statement in_(...)
+BULK_STATUSES = {'Retur': 'Returned', 'Rusak': 'Defective', 'Ready': 'Ready'}
+
+def _sn_chunks(sns):
+    sns = list(dict.fromkeys(x.strip().upper() for x in sns if x and x.strip()))
+    return [sns[i:i + BULK_BATCH] for i in range(0, len(sns), BULK_BATCH)]
+
+@profiler.timed()
+def bulk_reprice(new_price, sku=None, brand=None, sns=None):
+    """Ubah harga semua stok Ready per SKU, brand, atau daftar SN. Return jumlah baris terubah."""
+    changes = {'price': int(new_price)}
+    def run(q):
+        q = q.eq('status', 'Ready')
+        if sku: q = q.eq('sku', sku)
+        if brand: q = q.eq('brand', brand)
+        return q.execute().data
+    if sns: rows = [r for chunk in _sn_chunks(sns) for r in run(supabase.table('inventory').update(changes).in_('sn', chunk))]
+    elif sku or brand: rows = run(supabase.table('inventory').update(changes))
+    else: return 0
+    inventory_store().update([r['sn'] for r in rows], changes)
+    return len(rows)
+
+@profiler.timed()
+def bulk_delete(sns):
+    """Hapus daftar SN yang belum terjual (riwayat penjualan tidak ikut rusak). Return (terhapus, dilewati)."""
+    chunks = _sn_chunks(sns)
+    rows = [r for chunk in chunks for r in supabase.table('inventory').delete().in_('sn', chunk).neq('status', 'Sold').execute().data]
+    inventory_store().delete([r['sn'] for r in rows])
+    return len(rows), sum(len(c) for c in chunks) - len(rows)
+
+@profiler.timed()
+def bulk_set_status(sns, status):
+    """Tandai daftar SN sebagai Returned/Defective/Ready. SN Sold tidak disentuh (Sold -> Ready
+    akan membuatnya bisa terjual dua kali). Return (terubah, dilewati: sudah terjual / tidak ada)."""
+    chunks = _sn_chunks(sns)
+    rows = [r for chunk in chunks for r in supabase.table('inventory').update({'status': status}).in_('sn', chunk).neq('status', 'Sold').execute().data]
+    inventory_store().update([r['sn'] for r in rows], {'status': status})
+    return len(rows), sum(len(c) for c in chunks) - len(rows)
+
+@profiler.timed()
+def delete_import_batch(log):
+    """Hapus SN satu batch import yang belum terjual. Return (terhapus, dilewati)."""
+    if not log.get('batch_id'): return bulk_delete([x['sn'] for x in _legacy_log_items(log['id'])])
+    rows = supabase.table('inventory').delete().eq('import_batch_id', log['batch_id']).neq('status', 'Sold').execute().data
+    inventory_store().delete([r['sn'] for r in rows])
+    return len(rows), max((log.get('total_items') or 0) - len(rows), 0)
+
+RESET_BATCH = 5000   # baris per statement, jauh di bawah statement timeout Supabase
+
+def count_rows(table):
+    return supabase.table(table).select("*", count='exact').limit(1).execute().count or 0
+
+@profiler.timed()
+def purge_table(table, progress=None):
+    """DELETE bertahap via RPC purge_batch (sql/005_reset_archive.sql). Return jumlah terhapus."""
+    total, deleted = count_rows(table), 0
+    while True:
+        n = supabase.rpc('purge_batch', {'p_table': table, 'p_batch': RESET_BATCH}).execute().data or 0
+        deleted += n
+        if progress: progress(min(deleted / total, 1.0) if total else 1.0, f"{table}: {deleted}/{total} baris terhapus")
+        if n < RESET_BATCH: return deleted
+
+# Ikut direset bersama tabelnya: arsip (dihitung transactions_all), rollup, dan reservasi keranjang
+RESET_WITH = {'transactions': ('transactions_archive', 'sales_daily'),
+              'inventory': ('inventory_archive', 'intake_daily', 'cart_reservations')}
+
+def factory_reset(table_name, progress=None):
+    try:
+        for t in (table_name, *RESET_WITH.get(table_name, ())): purge_table(t, progress)
+    finally: clear_cache()   # sebagian batch mungkin sudah terhapus walau gagal
+
+def factory_reset_all():
+    """Reset pabrik: satu TRUNCATE untuk semua tabel, instan berapapun ukurannya."""
+    tables = ['inventory', 'transactions', 'import_logs', *(t for ts in RESET_WITH.values() for t in ts)]
+    try: supabase.rpc('truncate_tables', {'p_tables': tables}).execute()
+    finally: clear_cache()
+
+@profiler.timed()
+def archive_sold(before, progress=None):
+    """Pindahkan inventory Sold & transaksi sebelum `before` ke tabel arsip, per batch."""
+    p_before = pd.Timestamp(before, tz=LOCAL_TZ).isoformat()
+    moved = {'inventory': 0, 'transactions': 0}
+    while True:
+        res = supabase.rpc('archive_sold', {'p_before': p_before, 'p_batch': RESET_BATCH}).execute().data
+        for k in moved: moved[k] += res[k]
+        if progress: progress(None, f"Diarsipkan: {moved['inventory']} SN terjual, {moved['transactions']} transaksi")
+        if res['inventory'] < RESET_BATCH and res['transactions'] < RESET_BATCH: break
+    clear_cache()
+    return moved
+
+# --- FUNGSI HELPER EXCEL RAPI ---
+@profiler.timed()
+def format_excel(writer, df, sheet_name):
+    df.to_excel(writer, sheet_name=sheet_name, index=False, startrow=1, header=False)
+    workbook = writer.book
+    worksheet = writer.sheets[sheet_name]
+    header_format = workbook.add_format({'bold': True, 'text_wrap': True, 'valign': 'top', 'fg_color': '#0095DA', 'font_color': '#FFFFFF', 'border': 1})
+    for col_num, value in enumerate(df.columns.values):
+        worksheet.write(0, col_num, value, header_format)
+        max_len = max(df[value].astype(str).str.len().max() if not df.empty else 0, len(str(value))) + 2
+        worksheet.set_column(col_num, col_num, max_len)
+
+# --- BACKUP STREAMING ---
+BACKUP_FORMATS = {"Excel (.xlsx)": 'xlsx', "CSV (.csv.gz)": 'csv.gz', "Parquet (.parquet)": 'parquet'}
+BACKUP_HIST_COLS = ['trx_id', 'waktu_lokal', 'user', 'total_bill', 'items_count']
+SPOOL_MAX = 16 * 1024 * 1024   # di atas ini file backup pindah ke disk
+
+def _history_backup_pages():
+    for page in iter_table_pages(HISTORY_TABLE, HISTORY_COLS, key='trx_id'):
+        waktu = pd.to_datetime([r['timestamp'] for r in page], utc=True).tz_convert(LOCAL_TZ).astype(str)
+        yield [dict(r, waktu_lokal=w) for r, w in zip(page, waktu)]
+
+@profiler.timed()
+def build_backup(fmt):
+    """Backup lengkap tanpa memuat tabel ke DataFrame. Return list (nama_file, file siap baca, mime)."""
+    fmt = BACKUP_FORMATS[fmt]
+    stamp = datetime.now().strftime('%Y%m%d')
+    if fmt == 'xlsx':
+        f = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX)
+        write_xlsx(f, [('Stok Gudang', None, iter_table_pages('inventory')), ('Riwayat Transaksi', BACKUP_HIST_COLS, _history_backup_pages())])
+        f.seek(0)
+        return [(f"Backup_Toko_{stamp}.xlsx", f, "application/vnd.ms-excel")]
+    writer, mime = (write_csv_gz, "application/gzip") if fmt == 'csv.gz' else (write_parquet, "application/octet-stream")
+    files = []
+    for name, cols, pages in [('Stok', None, iter_table_pages('inventory')), ('Riwayat', BACKUP_HIST_COLS, _history_backup_pages())]:
+        f = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX)
+        writer(f, cols, pages); f.seek(0)
+        files.append((f"Backup_{name}_{stamp}.{fmt}", f, mime))
+    return files
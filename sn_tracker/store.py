@@ -0,0 +1,309 @@
+# ==========================================
+# TABLE STORE: snapshot DataFrame per proses + delta sync
+# Dipakai app.py lewat @st.cache_resource, jadi satu instance untuk semua sesi.
+# Hanya satu fetch ke server yang berjalan per store (single-flight); pembaca
+# lain tetap dilayani snapshot terakhir selama sync/reload berjalan di latar.
+# ==========================================
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def set_at(df, pos, col, values):
+    """Ganti kolom `col` dengan salinan yang berisi `values` di posisi `pos`. Hanya kolom itu yang
+    disalin; kolom lain tetap berbagi memori dengan frame asal (copy-on-write per kolom)."""
+    s = df[col].copy() if col in df.columns else pd.Series(None, index=df.index, dtype=object)
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        vals = pd.unique(pd.Series(np.atleast_1d(np.asarray(values, dtype=object))).dropna())
+        new = [v for v in vals if v not in s.cat.categories]
+        if new: s = s.cat.add_categories(new)
+    try: s.iloc[pos] = values
+    except (TypeError, ValueError):   # dtype kolom tidak bisa menampung nilai baru (mis. NaN di kolom str)
+        s = s.astype(object); s.iloc[pos] = values
+    df[col] = s
+
+
+class TableStore:
+    """Salinan tabel di memori yang disinkron inkremental lewat high-water mark.
+
+    - `load_full()` mengembalikan seluruh tabel (dipakai saat start & full reload berkala).
+    - `load_since(ts)` mengembalikan baris dengan `hwm_col > ts` saja.
+    - `load_deleted_since(ts)` (opsional) mengembalikan DataFrame key + `deleted_at` untuk
+      baris yang dihapus proses lain, jadi DELETE ikut tersinkron tanpa full reload.
+    - Tulis lokal (`upsert`/`update`/`delete`) langsung diterapkan ke frame, tanpa reload.
+      Tulis yang terjadi selama fetch dicatat lalu diputar ulang di atas hasil fetch.
+    - Tulis yang belum sampai ke server (`hold`) diterapkan ulang di atas setiap reload/sync
+      sampai `release`, jadi data server yang masih lama tidak menimpanya.
+    - `watch(load_version)` memantau penanda versi tabel yang murah dibaca; begitu berubah,
+      delta langsung ditarik (token `reset` berubah = full reload).
+
+    Frame diganti copy-on-write, jadi pembaca yang memegang snapshot lama tetap aman. Tulis titik
+    (checkout, fallback find_sn) mencari baris lewat index key dan hanya menyalin kolom yang
+    berubah; menambah baris baru tetap membangun ulang frame.
+    """
+
+    def __init__(self, key, hwm_col, columns, load_full, load_since, prepare=None,
+                 sync_interval=15, full_interval=600, overlap=5, load_deleted_since=None):
+        self.key = key
+        self.hwm_col = hwm_col
+        self.columns = list(columns)
+        self._load_full = load_full
+        self._load_since = load_since
+        self._load_deleted = load_deleted_since
+        self._prepare = prepare or (lambda df: df)
+        self.sync_interval = sync_interval    # detik antar delta sync
+        self.full_interval = full_interval    # full reload menangkap DELETE dari proses lain
+        self.overlap = overlap                # toleransi commit yang telat terlihat
+        self._lock = threading.RLock()         # state frame; dipegang singkat
+        self._fetch_lock = threading.Lock()    # satu fetch ke server per store
+        self._journal = None                   # tulis lokal selama fetch berjalan
+        self._refreshing = False
+        self._watch_stop = None
+        self.df = None
+        self.hwm = None
+        self.deleted_hwm = None
+        self._deletes_seen = {}   # key -> deleted_at tombstone yang sudah diterapkan (jendela overlap)
+        self.version = 0
+        self.loaded_at = 0.0
+        self.synced_at = 0.0
+        self._derived = {}
+        self._indexes = {}
+        self._held = {}    # key -> perubahan lokal yang belum dikonfirmasi server
+        self._key_index = None   # (frame, pd.Index kolom key) untuk mencari posisi baris
+
+    # --- READ ---
+    def snapshot(self):
+        """Frame terkini. Hanya load pertama yang menunggu server; sync/reload berkala jalan
+        di thread latar dan pembaca mendapat snapshot terakhir sampai selesai."""
+        if self.df is None: self.reload()
+        else:
+            now = time.monotonic()
+            if now - self.loaded_at > self.full_interval: self._refresh_async(self.reload)
+            elif now - self.synced_at > self.sync_interval: self._refresh_async(self.sync)
+        return self.df
+
+    def derived(self, name, build):
+        """Hasil turunan (filter, index, rekap) di-cache per versi frame.
+
+        Frame & versi dibaca bersamaan; hasil disimpan di bawah versi frame yang dipakai build,
+        jadi tulis yang masuk selama build membuat hasil itu basi, bukan ikut dianggap terkini.
+        """
+        self.snapshot()
+        with self._lock:
+            df, version = self.df, self.version
+            hit = self._derived.get(name)
+            if hit and hit[0] == version: return hit[1]
+        value = build(df)
+        with self._lock:
+            cur = self._derived.get(name)
+            if cur is None or cur[0] < version: self._derived[name] = (version, value)
+        return value
+
+    def index(self, name, build):
+        """Index yang dirawat inkremental: dibangun sekali dari snapshot, lalu tiap
+        upsert/delete diteruskan ke `index.add(rows)` / `index.remove(keys)`."""
+        df = self.snapshot()
+        with self._lock:
+            if name not in self._indexes: self._indexes[name] = build(df)
+            return self._indexes[name]
+
+    # --- SYNC ---
+    def reload(self):
+        """Full reload. Pemanggil yang datang saat reload lain berjalan cukup menunggu hasilnya."""
+        asked = time.monotonic()
+        with self._fetch_lock:
+            if self.df is not None and self.loaded_at >= asked: return
+            self._start_journal()
+            try: frame = self._frame(self._load_full())
+            except BaseException:
+                self._stop_journal(); raise
+            with self._lock:
+                journal = self._stop_journal()
+                self._indexes = {}
+                self._set(frame)
+                self.hwm = self.deleted_hwm = self._max_hwm(frame)
+                self._deletes_seen = {}
+                self._apply_held()
+                self._replay(journal)
+                self.loaded_at = self.synced_at = time.monotonic()
+
+    def sync(self):
+        """Tarik baris yang berubah (dan yang dihapus) sejak high-water mark."""
+        if self.df is None: return self.reload()
+        asked = time.monotonic()
+        with self._fetch_lock:
+            if self.synced_at >= asked: return
+            hwm = self.hwm if self.hwm is not None else pd.Timestamp(0, tz='UTC')
+            del_hwm = self.deleted_hwm if self.deleted_hwm is not None else hwm
+            self._start_journal()
+            try:
+                delta = self._load_since((hwm - pd.Timedelta(seconds=self.overlap)).isoformat())
+                gone = self._load_deleted((del_hwm - pd.Timedelta(seconds=self.overlap)).isoformat()) if self._load_deleted else None
+            except BaseException:
+                self._stop_journal(); raise
+            with self._lock:
+                journal = self._stop_journal()
+                # Hapus dulu: baris yang dihapus lalu diinsert ulang ada di delta dan harus tetap ada
+                if gone is not None and not gone.empty:
+                    self.deleted_hwm = max(del_hwm, self._max_hwm(gone, 'deleted_at') or del_hwm)
+                    keys = self._new_deletes(gone)
+                    if keys: self.delete(keys)
+                if delta is not None and not delta.empty:
+                    self.upsert(delta)
+                    self.hwm = max(hwm, self._max_hwm(delta) or hwm)
+                self._replay(journal)
+                self.synced_at = time.monotonic()
+
+    def watch(self, load_version, interval=1.0):
+        """Thread latar yang membaca `load_version()` tiap `interval` detik. Token berupa dict;
+        perubahan `reset` memicu full reload, perubahan lain memicu delta sync."""
+        self.stop_watch()
+        stop = self._watch_stop = threading.Event()
+        def run():
+            last, error = None, None
+            while not stop.is_set():
+                try:
+                    token = load_version()
+                    if last is not None and token != last and self.df is not None:
+                        if token.get('reset') != last.get('reset'): self.reload()
+                        else: self.sync()
+                    last, error = token, None
+                except Exception as e:
+                    if str(e) != error: print(f"Watch Error ({self.key}): {e}")
+                    error = str(e)
+                stop.wait(interval if error is None else self.sync_interval)
+        threading.Thread(target=run, name=f"watch-{self.key}", daemon=True).start()
+
+    def stop_watch(self):
+        if self._watch_stop is not None: self._watch_stop.set()
+
+    # --- WRITE (lokal) ---
+    def upsert(self, rows):
+        """Baris yang sudah ada ditimpa per kolom di posisinya; baris baru ditambahkan di akhir.
+        Store yang belum di-load tidak disentuh: load pertama sudah membawa baris ini dari server."""
+        rows = self._frame(pd.DataFrame(rows))
+        if rows.empty: return
+        with self._lock:
+            if self._journal is not None: self._journal.append(('upsert', rows))
+            if self.df is None: return
+            pos = self._positions(rows[self.key])
+            if pos is None:   # key dobel di frame: buang semua salinannya lalu tambahkan ulang
+                df, pos = self.df[~self.df[self.key].isin(rows[self.key])], np.full(len(rows), -1)
+            else: df = self.df.copy(deep=False)
+            found = pos >= 0
+            if found.any():
+                old = rows[found]
+                for col in self.columns:
+                    if col == self.key: continue
+                    v = old[col]
+                    set_at(df, pos[found], col, (v.astype(object) if isinstance(v.dtype, pd.CategoricalDtype) else v).to_numpy())
+            if not found.all():
+                # Baris baru mengubah bentuk frame: satu-satunya jalur yang menyalin semua kolom
+                df = self._frame(pd.concat([df.astype(object), rows[~found].astype(object)], ignore_index=True))
+                self._set(df)
+            else: self._set(df, keep_positions=True)
+            for ix in self._indexes.values(): ix.add(rows)
+            self._apply_held(rows[self.key])
+
+    def update(self, keys, changes):
+        with self._lock:
+            if self._journal is not None: self._journal.append(('update', list(keys), changes))
+            if self.df is None: return
+            pos = self._positions(list(keys))
+            pos = np.flatnonzero(self.df[self.key].isin(list(keys))) if pos is None else pos[pos >= 0]
+            if not len(pos): return
+            df = self.df.copy(deep=False)
+            for col, val in changes.items(): set_at(df, pos, col, val)
+            self._set(df, keep_positions=True)
+            for ix in self._indexes.values(): ix.add(df.iloc[pos])
+
+    def delete(self, keys):
+        with self._lock:
+            if self._journal is not None: self._journal.append(('delete', list(keys)))
+            if self.df is None: return
+            mask = self.df[self.key].isin(list(keys))
+            if mask.any(): self._set(self.df[~mask].reset_index(drop=True))
+            for ix in self._indexes.values(): ix.remove(list(keys))
+
+    def hold(self, keys, changes):
+        with self._lock:
+            for k in keys: self._held[k] = dict(self._held.get(k, {}), **changes)
+            self.update(keys, changes)
+
+    def release(self, keys):
+        with self._lock:
+            for k in keys: self._held.pop(k, None)
+
+    def held(self, key):
+        with self._lock: return dict(self._held.get(key, {}))
+
+    # --- INTERNAL ---
+    def _refresh_async(self, fn):
+        with self._lock:
+            if self._refreshing or self._fetch_lock.locked(): return
+            self._refreshing = True
+        def run():
+            try: fn()
+            except Exception as e: print(f"Sync Error ({self.key}): {e}")
+            finally: self._refreshing = False
+        threading.Thread(target=run, name=f"refresh-{self.key}", daemon=True).start()
+
+    def _start_journal(self):
+        with self._lock: self._journal = []
+
+    def _stop_journal(self):
+        with self._lock:
+            journal, self._journal = self._journal or [], None
+        return journal
+
+    def _replay(self, journal):
+        for op, *args in journal: getattr(self, op)(*args)
+
+    def _apply_held(self, keys=None):
+        keys = self._held.keys() if keys is None else [k for k in keys if k in self._held]
+        groups = {}
+        for k in keys: groups.setdefault(tuple(sorted(self._held[k].items())), []).append(k)
+        for changes, ks in groups.items(): self.update(ks, dict(changes))
+
+    def _new_deletes(self, gone):
+        """Key dari tombstone yang belum pernah diterapkan dan tidak kalah baru dari barisnya di
+        frame. Jendela overlap membuat tombstone lama terbaca lagi tiap sync; tanpa saringan ini
+        SN yang dihapus lalu diinsert ulang ikut terhapus lagi dari store."""
+        at = pd.to_datetime(gone['deleted_at'], utc=True, errors='coerce')
+        fresh = {k: t for k, t in zip(gone[self.key], at) if self._deletes_seen.get(k) != t}
+        self._deletes_seen.update(fresh)
+        cutoff = self.deleted_hwm - pd.Timedelta(seconds=self.overlap) if self.deleted_hwm is not None else None
+        if cutoff is not None: self._deletes_seen = {k: t for k, t in self._deletes_seen.items() if pd.isna(t) or t >= cutoff}
+        if not fresh or self.df is None: return list(fresh)
+        rows = self.df.loc[self.df[self.key].isin(list(fresh)), [self.key, self.hwm_col]]
+        live = dict(zip(rows[self.key], pd.to_datetime(rows[self.hwm_col], utc=True, errors='coerce')))
+        return [k for k, t in fresh.items() if not (k in live and pd.notna(live[k]) and pd.notna(t) and live[k] >= t)]
+
+    def _frame(self, df):
+        for c in self.columns:
+            if c not in df.columns: df[c] = None
+        return self._prepare(df[self.columns].copy())
+
+    def _positions(self, keys):
+        """Posisi baris tiap key (-1 = tidak ada) lewat Index hash pada kolom key. Index dibangun
+        sekali per bentuk frame, jadi tulis titik cukup O(jumlah key), bukan scan seluruh kolom.
+        None bila frame berisi key dobel (pemanggil memakai jalur isin)."""
+        if self._key_index is None or self._key_index[0] is not self.df:
+            self._key_index = (self.df, pd.Index(self.df[self.key]))
+        ix = self._key_index[1]
+        return ix.get_indexer(pd.Index(list(keys))) if ix.is_unique else None
+
+    def _set(self, df, keep_positions=False):
+        # Kolom key tidak berubah (tulis titik): index posisi tetap berlaku untuk frame baru
+        self._key_index = (df, self._key_index[1]) if keep_positions and self._key_index is not None else None
+        self.df = df
+        self.version += 1
+
+    def _max_hwm(self, df, col=None):
+        col = col or self.hwm_col
+        if df is None or df.empty or col not in df.columns: return None
+        ts = pd.to_datetime(df[col], utc=True, errors='coerce').max()
+        return None if pd.isna(ts) else ts
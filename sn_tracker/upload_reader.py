@@ -0,0 +1,58 @@
+# ==========================================
+# UPLOAD READER: baca CSV/XLSX stok per chunk
+# Memori tetap kecil untuk file ratusan ribu baris; tiap chunk langsung
+# bisa diproses pipeline import sebelum file selesai dibaca.
+# ==========================================
+
+import pandas as pd
+
+IMPORT_COLS = ('brand', 'sku', 'price', 'sn')
+CHUNK_ROWS = 5000
+
+
+def _norm(c): return str(c).strip().lower()
+
+def _check_cols(found):
+    missing = [c for c in IMPORT_COLS if c not in found]
+    if missing: raise ValueError(f"Kolom wajib tidak ada: {', '.join(missing)}")
+
+def iter_upload_chunks(file, name, chunk_rows=CHUNK_ROWS):
+    """Yield (DataFrame[brand, sku, price, sn], fraksi_progress) per chunk.
+
+    Semua kolom dibaca sebagai string supaya SN seperti '00123' tidak berubah jadi angka;
+    harga dikonversi belakangan oleh pembuat record import.
+    """
+    if name.lower().endswith('.csv'): yield from _iter_csv(file, chunk_rows)
+    else: yield from _iter_xlsx(file, chunk_rows)
+
+def _iter_csv(file, chunk_rows):
+    size = getattr(file, 'size', None)
+    reader = pd.read_csv(file, chunksize=chunk_rows, dtype=str, keep_default_na=False,
+                         usecols=lambda c: _norm(c) in IMPORT_COLS)
+    checked = False
+    for chunk in reader:
+        chunk.columns = [_norm(c) for c in chunk.columns]
+        if not checked: _check_cols(chunk.columns); checked = True
+        yield chunk[list(IMPORT_COLS)], (file.tell() / size if size else None)
+
+def _iter_xlsx(file, chunk_rows):
+    from openpyxl import load_workbook
+    wb = load_workbook(file, read_only=True, data_only=True)
+    try:
+        ws = wb.active
+        rows = ws.iter_rows(values_only=True)
+        header = [_norm(c) for c in next(rows, ())]
+        _check_cols(header)
+        idx = [header.index(c) for c in IMPORT_COLS]
+        total = ws.max_row or 0
+        buf, read = [], 1
+        for row in rows:
+            read += 1
+            if not any(v is not None for v in row): continue
+            buf.append(['' if i >= len(row) or row[i] is None else str(row[i]) for i in idx])
+            if len(buf) >= chunk_rows:
+                yield pd.DataFrame(buf, columns=list(IMPORT_COLS)), (read / total if total else None)
+                buf = []
+        if buf: yield pd.DataFrame(buf, columns=list(IMPORT_COLS)), 1.0
+    finally:
+        wb.close()
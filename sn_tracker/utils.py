@@ -0,0 +1,49 @@
+import functools
+import re
+import threading
+import time
+
+
+def natural_sort_key(s):
+    return [int(text) if text.isdigit() else text.lower() for text in re.split('([0-9]+)', s)]
+
+def format_rp(val): return f"Rp {val:,.0f}".replace(",", ".")
+
+def ttl_cache(seconds):
+    """Memo per argumen dengan masa berlaku (pengganti st.cache_data di luar UI). `fn.clear()` mengosongkan.
+
+    Panggilan bersamaan dengan argumen sama menunggu satu eksekusi (prefetch + render tidak dobel query).
+    Entri kedaluwarsa dibuang setiap kali ada tulis, lock per argumen dibuang begitu eksekusinya selesai,
+    jadi filter tanggal yang terus berganti tidak menumpuk di memori.
+    """
+    def deco(fn):
+        memo, inflight, lock = {}, {}, threading.Lock()
+        generation = [0]   # dinaikkan clear(): hasil panggilan yang mulai sebelum clear tidak disimpan
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            with lock:
+                hit = memo.get(key)
+                if hit and time.monotonic() - hit[0] < seconds: return hit[1]
+                key_lock = inflight.setdefault(key, threading.Lock())
+            try:
+                with key_lock:
+                    with lock: hit = memo.get(key)
+                    if hit and time.monotonic() - hit[0] < seconds: return hit[1]
+                    with lock: gen = generation[0]
+                    value = fn(*args, **kwargs)
+                    with lock:
+                        now = time.monotonic()
+                        for k in [k for k, (t, _) in memo.items() if now - t >= seconds]: del memo[k]
+                        if generation[0] == gen: memo[key] = (now, value)
+                return value
+            finally:
+                # Penunggu yang sudah memegang key_lock tetap aman: mereka menemukan hasilnya di memo
+                with lock:
+                    if inflight.get(key) is key_lock: del inflight[key]
+        def clear():
+            with lock: memo.clear(); generation[0] += 1
+        wrapper.clear = clear
+        wrapper.cache_info = lambda: {'memo': len(memo), 'inflight': len(inflight)}
+        return wrapper
+    return deco
@@ -0,0 +1,21 @@
+# ==========================================
+# VIEWS: halaman UI Streamlit, di-import app.py saat menunya dibuka
+# Tiap modul halaman menyediakan:
+#   queries()            -> fungsi data yang dibutuhkan bagian yang sedang tampil,
+#                           dimulai app.py bersamaan dengan rekap stok sidebar
+#   render(stok_summary) -> menggambar halaman
+# Hanya bagian (section) yang dipilih yang dieksekusi. Daerah interaktif
+# (scan, pencarian, tabel berhalaman) dibungkus st.fragment sehingga
+# interaksi di dalamnya hanya me-rerun daerah itu, bukan seluruh app.
+# ==========================================
+
+import streamlit as st
+
+
+def current_section(sections, key):
+    """Bagian yang akan tampil di rerun ini (dibaca sebelum widget-nya digambar, untuk queries())."""
+    return st.session_state.get(key, sections[0])
+
+def section_nav(sections, key):
+    """Pengganti st.tabs: st.tabs mengeksekusi isi semua tab tiap rerun, ini hanya yang dipilih."""
+    return st.radio("Bagian", sections, horizontal=True, key=key, label_visibility="collapsed")
@@ -0,0 +1,224 @@
+# ==========================================
+# HALAMAN ADMIN TOOLS: ringkasan, analitik, backup, danger zone, performa
+# Query & library tiap bagian (plotly untuk grafik, engine Excel untuk format SO)
+# baru dimuat saat bagian itu dibuka.
+# ==========================================
+
+import io
+import time
+from datetime import datetime, date, timedelta
+
+import pandas as pd
+import streamlit as st
+
+from sn_tracker import analytics
+from sn_tracker.perf import profiler
+from sn_tracker.service import (
+    BACKUP_FORMATS, HISTORY_PAGE,
+    get_history_summary, get_history_page, get_transaction_detail, get_sales_rollup, get_stock_aging,
+    factory_reset, factory_reset_all, archive_sold, format_excel, build_backup, prefetch)
+from sn_tracker.utils import format_rp
+from sn_tracker.views import section_nav
+
+SECTIONS = ["📊 Ringkasan", "📈 Analitik", "💾 Database", "🔥 Danger Zone", "⏱️ Performa"]
+HISTORY_COLS = ['trx_id', 'timestamp', 'user', 'total_bill']
+
+
+def queries():
+    # Query Ringkasan/Analitik bergantung filter tanggal, dimulai di bagiannya sendiri
+    return ()
+
+# Fragment: filter tanggal, cari ID & paging hanya me-rerun ringkasan
+@st.fragment
+def ringkasan():
+    c_f1, c_f2 = st.columns(2)
+    d_from = c_f1.date_input("Dari Tanggal", value=date.today() - timedelta(days=30))
+    d_to = c_f2.date_input("Sampai Tanggal", value=date.today())
+    # Cursor per halaman disimpan sebagai stack supaya bisa mundur
+    if st.session_state.get('hist_filter') != (d_from, d_to):
+        st.session_state.hist_filter = (d_from, d_to); st.session_state.hist_cursors = [None]
+    cursors = st.session_state.hist_cursors
+    # Empat query bagian ini independen: jalan bersamaan, bukan berurutan
+    jobs = prefetch(get_history_summary, (get_history_summary, d_from, d_to),
+                    (get_history_page, d_from, d_to, None, st.session_state.get('q_trx', ""), 20),
+                    (get_history_page, d_from, d_to, cursors[-1]))
+    try: semua, ringkas = jobs[0].result(), jobs[1].result()
+    except Exception as e: st.error(f"Gagal memuat ringkasan: {e}"); semua = ringkas = {'omzet': 0, 'count': 0}
+    if semua['count']:
+        m1, m2, m3 = st.columns(3)
+        m1.metric("Omzet Total", format_rp(semua['omzet']))
+        m2.metric("Omzet Periode", format_rp(ringkas['omzet']))
+        m3.metric("Transaksi Periode", ringkas['count'])
+
+        st.divider()
+        st.subheader("🕵️‍♀️ Cek Detail Transaksi")
+        st.text_input("Cari ID Transaksi:", placeholder="Ketik sebagian ID, mis. TRX-20250101", key='q_trx')
+        try: hasil, _ = jobs[2].result()
+        except Exception as e: st.error(f"Gagal mencari transaksi: {e}"); hasil = pd.DataFrame(columns=HISTORY_COLS)
+        selected_trx = st.selectbox("Pilih ID Transaksi:", ["-- Pilih --"] + hasil['trx_id'].tolist())
+        trx_data = get_transaction_detail(selected_trx) if selected_trx != "-- Pilih --" else None
+        if trx_data:
+            c_info1, c_info2, c_info3 = st.columns(3)
+            ts_str = pd.to_datetime(trx_data['timestamp']).strftime("%d %b %Y, %H:%M")
+            c_info1.info(f"User: {trx_data['user']}")
+            c_info2.info(f"Waktu: {ts_str}")
+            c_info3.success(f"Total: {format_rp(trx_data['total_bill'])}")
+            if 'item_details' in trx_data and trx_data['item_details']:
+                items = trx_data['item_details']
+                if isinstance(items, list):
+                    df_items = pd.DataFrame(items)
+                    cols_wanted = ['sku', 'brand', 'sn', 'price']
+                    cols_avail = [c for c in cols_wanted if c in df_items.columns]
+                    st.write("##### 📋 Daftar Barang Terjual:")
+                    st.dataframe(df_items[cols_avail], use_container_width=True, column_config={"price": st.column_config.NumberColumn("Harga", format="Rp %d")})
+                else: st.warning("Format detail item tidak dikenali.")
+            else: st.warning("Detail item tidak tersedia.")
+        st.divider()
+        st.subheader("Riwayat Transaksi")
+        try: df_page, next_cursor = jobs[3].result()
+        except Exception as e: st.error(f"Gagal memuat riwayat: {e}"); df_page, next_cursor = pd.DataFrame(columns=HISTORY_COLS), None
+        st.dataframe(df_page[HISTORY_COLS], use_container_width=True, hide_index=True)
+        c_prev, c_hal, c_next = st.columns([1, 2, 1])
+        c_prev.button("⬅️ Sebelumnya", disabled=len(cursors) == 1, use_container_width=True, on_click=cursors.pop)
+        c_hal.caption(f"Halaman {len(cursors)} · {HISTORY_PAGE} transaksi per halaman")
+        c_next.button("Berikutnya ➡️", disabled=next_cursor is None, use_container_width=True, on_click=cursors.append, args=(next_cursor,))
+    else: st.info("Belum ada transaksi")
+
+# Fragment: ganti periode / grain hanya me-rerun grafik (dari rollup harian, bukan item_details transaksi)
+@st.fragment
+def analitik(stok_summary):
+    import plotly.express as px   # hanya dipakai di sini; tidak ikut dimuat saat app start
+    c_a1, c_a2, c_a3 = st.columns([2, 2, 3])
+    a_from = c_a1.date_input("Dari", value=date.today() - timedelta(days=90), key='an_from')
+    a_to = c_a2.date_input("Sampai", value=date.today(), key='an_to')
+    grain = analytics.GRAINS[c_a3.radio("Periode:", list(analytics.GRAINS), horizontal=True, key='an_grain')]
+    jobs = prefetch((get_sales_rollup, a_from, a_to, grain), get_stock_aging)
+    try: rollup, aging = jobs[0].result(), jobs[1].result()
+    except Exception as e: st.error(f"Gagal memuat analitik: {e}"); rollup = aging = None
+    if rollup is not None:
+        tot = analytics.totals(rollup)
+        st_brand = analytics.sell_through(rollup, stok_summary)
+        base = tot['units_sold'] + int(st_brand['ready'].sum())
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("Omzet", format_rp(tot['revenue']))
+        m2.metric("Unit Terjual", f"{tot['units_sold']:,}")
+        m3.metric("Unit Masuk", f"{tot['units_in']:,}")
+        m4.metric("Sell-through", f"{tot['units_sold'] / base:.0%}" if base else "-")
+
+        per = analytics.by_period(rollup, grain)
+        st.plotly_chart(px.bar(per, x='period', y='revenue', labels={'period': '', 'revenue': 'Omzet'}, title="Omzet per Periode"), use_container_width=True)
+        st.plotly_chart(px.line(per, x='period', y=['units_sold', 'units_in'], labels={'period': '', 'value': 'Unit', 'variable': ''}, title="Unit Terjual vs Masuk"), use_container_width=True)
+
+        c_b, c_s = st.columns(2)
+        brand = analytics.by_brand(rollup)
+        c_b.plotly_chart(px.bar(brand[brand['revenue'] > 0], x='brand', y='revenue', labels={'brand': '', 'revenue': 'Omzet'}, title="Omzet per Brand"), use_container_width=True)
+        with c_s:
+            st.write("##### 🏆 SKU Terlaris")
+            st.dataframe(analytics.top_skus(rollup)[['brand', 'sku', 'units_sold', 'revenue']], use_container_width=True, hide_index=True,
+                         column_config={"units_sold": "Terjual", "revenue": st.column_config.NumberColumn("Omzet", format="Rp %d")})
+
+        st.write("##### 🔄 Sell-through per Brand")
+        st.dataframe(st_brand.assign(sell_through=st_brand['sell_through'] * 100), use_container_width=True, hide_index=True,
+                     column_config={"sell_through": st.column_config.ProgressColumn("Sell-through", format="%.0f%%", min_value=0, max_value=100)})
+    if aging is not None and not aging.empty:
+        st.write("##### ⏳ Umur Stok Ready")
+        c_g1, c_g2 = st.columns([1, 2])
+        c_g1.dataframe(analytics.aging_totals(aging), use_container_width=True, hide_index=True,
+                       column_config={"value": st.column_config.NumberColumn("Nilai", format="Rp %d")})
+        c_g2.plotly_chart(px.bar(analytics.aging_by_brand(aging), x='brand', y='units', color='umur', labels={'brand': '', 'units': 'Unit', 'umur': 'Umur'}), use_container_width=True)
+
+def database(stok_summary):
+    st.markdown('<div class="admin-card-blue"><div class="admin-header">📥 Backup Data</div><p>Simpan data secara berkala ke Excel untuk arsip pribadi.</p>', unsafe_allow_html=True)
+
+    # Tombol 1: Backup Lengkap (Stok + History), di-stream halaman demi halaman dari DB
+    fmt_backup = st.radio("Format Backup:", list(BACKUP_FORMATS), horizontal=True)
+    if st.button("DOWNLOAD DATABASE LENGKAP", use_container_width=True):
+        try:
+            with st.spinner("Menyiapkan backup..."): files = build_backup(fmt_backup)
+            for i, (fname, f, mime) in enumerate(files):
+                with f: st.download_button(label=f"Klik disini untuk Simpan {fname}", data=f.read(), file_name=fname, mime=mime, key=f"dl_btn_{i}", on_click="ignore")
+            st.toast("File Backup Siap!", icon="📂")
+        except ImportError as e: st.error(f"Format ini butuh library tambahan: {e}")
+        except Exception as e: st.error(f"Backup gagal: {e}")
+
+    # Tombol 2: Backup Format SO
+    st.markdown("<br>", unsafe_allow_html=True)
+    if st.button("DOWNLOAD FORMAT SO (.xlsx)", use_container_width=True):
+        if not stok_summary.empty:
+            df_so = stok_summary.groupby(['brand', 'sku'], observed=True)['units'].sum().reset_index(name='Quantity')
+            df_so['Owner'] = 'Konsinyasi'
+            df_so['Jenis'] = 'Stok'
+            df_so = df_so[['brand', 'sku', 'Owner', 'Jenis', 'Quantity']]
+            df_so.columns = ['Brand', 'SKU', 'Owner', 'Jenis', 'Quantity']
+            buffer_so = io.BytesIO()
+            with pd.ExcelWriter(buffer_so, engine='xlsxwriter') as writer:
+                format_excel(writer, df_so, 'Data Stock Opname')
+            st.download_button(label="Klik disini untuk Simpan File SO", data=buffer_so.getvalue(), file_name=f"Format_SO_{datetime.now().strftime('%Y%m%d')}.xlsx", mime="application/vnd.ms-excel", key="dl_so_btn")
+            st.toast("File SO Siap!", icon="📋")
+        else: st.warning("Tidak ada stok Ready.")
+    st.markdown('</div>', unsafe_allow_html=True)
+
+def danger_zone():
+    st.markdown('<div class="admin-card-red"><div class="admin-header" style="color:#dc2626">⚠️ Danger Zone</div><p>Hapus data permanen. Hati-hati!</p>', unsafe_allow_html=True)
+    hapus_opsi = st.radio("Pilih Data yang akan dihapus:", ["-- Pilih Tindakan --", "1. Hapus Riwayat Transaksi Saja", "2. Hapus Stok Barang Saja", "3. RESET PABRIK (Semua Data)", "4. Arsipkan Data Terjual Lama"])
+    if hapus_opsi != "-- Pilih Tindakan --":
+        st.warning(f"Anda akan melakukan: {hapus_opsi}")
+        if "4." in hapus_opsi:
+            arsip_sebelum = st.date_input("Arsipkan yang terjual sebelum:", value=date.today() - timedelta(days=180))
+            st.caption("SN Sold & transaksi dipindah ke tabel arsip (inventory_archive / transactions_archive), tidak dihapus.")
+        pin_konfirm = st.text_input("Masukkan PIN Konfirmasi:", type="password")
+        if st.button("🔥 JALANKAN PENGHAPUSAN 🔥", type="primary", use_container_width=True):
+            if pin_konfirm == "123456":
+                bar = st.progress(0.0, text="Memulai...")
+                lapor = lambda f, t: bar.progress(1.0 if f is None else f, text=t)
+                with st.spinner("Sedang menghapus..."):
+                    try:
+                        if "1." in hapus_opsi:
+                            factory_reset('transactions', lapor)
+                            st.toast("Riwayat Transaksi Dihapus!", icon="🗑️")
+                            st.success("Riwayat Transaksi Telah Dihapus.")
+                        elif "2." in hapus_opsi:
+                            factory_reset('inventory', lapor)
+                            st.toast("Stok Dihapus!", icon="🗑️")
+                            st.success("Stok Barang Telah Dikosongkan.")
+                        elif "3." in hapus_opsi:
+                            factory_reset_all()
+                            st.toast("Reset Total Berhasil!", icon="🚀")
+                            st.success("RESET TOTAL BERHASIL! Aplikasi kembali seperti baru.")
+                        elif "4." in hapus_opsi:
+                            moved = archive_sold(arsip_sebelum, lapor)
+                            st.success(f"Arsip selesai: {moved['inventory']} SN terjual & {moved['transactions']} transaksi dipindahkan.")
+                    except Exception as e: st.error(f"Gagal: {e}")
+                    time.sleep(2); st.rerun()
+            else: st.error("PIN Salah!")
+    st.markdown('</div>', unsafe_allow_html=True)
+
+# Fragment: Reset Statistik tidak me-rerun app (rerun app sendiri ikut tercatat di statistik)
+@st.fragment
+def performa():
+    st.markdown('<div class="admin-card-blue"><div class="admin-header">⏱️ Performa</div><p>Durasi round trip Supabase & fungsi data (jendela rolling, semua sesi di proses ini).</p>', unsafe_allow_html=True)
+    perf_stats = profiler.stats()
+    if not perf_stats.empty:
+        ms_col = st.column_config.NumberColumn(format="%.1f ms")
+        st.dataframe(perf_stats, use_container_width=True, hide_index=True, column_config={"p50": ms_col, "p95": ms_col, "max": ms_col, "total": ms_col})
+        st.subheader("Rincian Rerun Sebelumnya (sesi ini)")
+        rincian = profiler.run_breakdown(f"{st.session_state.perf_sid}:{st.session_state.perf_run - 1}")
+        if not rincian.empty:
+            st.caption(f"{len(rincian)} event, total {rincian['ms'].sum():.0f} ms (DB: {rincian.loc[rincian['kind'] == 'db', 'ms'].sum():.0f} ms)")
+            st.dataframe(rincian[['kind', 'name', 'ms', 'rows', 'bytes', 'error']], use_container_width=True, hide_index=True)
+        else: st.info("Rerun sebelumnya tidak memanggil DB / fungsi data.")
+    else: st.info("Belum ada data.")
+    if profiler.log_path: st.caption(f"Log metrik: {profiler.log_path}")
+    st.button("Reset Statistik", on_click=profiler.clear)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+def render(stok_summary):
+    if st.session_state.user_role != "ADMIN": return
+    st.title("🔧 Admin Tools")
+    bagian = section_nav(SECTIONS, 'admin_section')
+
+    if bagian == "📊 Ringkasan": ringkasan()
+    elif bagian == "📈 Analitik": analitik(stok_summary)
+    elif bagian == "💾 Database": database(stok_summary)
+    elif bagian == "🔥 Danger Zone": danger_zone()
+    elif bagian == "⏱️ Performa": performa()
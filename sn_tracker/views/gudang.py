@@ -0,0 +1,190 @@
+# ==========================================
+# HALAMAN GUDANG: rekap stok, pencarian SN, input stok, log import, edit/hapus
+# Hanya bagian yang dipilih yang dieksekusi; tabel level-SN (get_inventory_df)
+# hanya disentuh bagian yang memang menampilkannya.
+# ==========================================
+
+import time
+
+import pandas as pd
+import streamlit as st
+
+from sn_tracker.service import (
+    BULK_STATUSES, LOG_DETAIL_PAGE, LOW_STOCK_THRESHOLD,
+    get_inventory_df, stock_totals, search_inventory, get_import_logs, get_import_log_items, delete_import_batch,
+    add_stock_batch, import_stock_stream, update_stock_price, delete_stock, bulk_reprice, bulk_delete, bulk_set_status)
+from sn_tracker.upload_reader import iter_upload_chunks
+from sn_tracker.utils import format_rp
+from sn_tracker.views import current_section, section_nav
+
+SECTIONS = ["📊 Dashboard Stok", "🔍 Cek Detail", "➕ Input Barang", "📜 Riwayat Import", "🛠️ Edit/Hapus"]
+TEMPLATE_CSV = pd.DataFrame([{'brand': 'SAMSUNG', 'sku': 'GALAXY A55 5G', 'price': 6000000, 'sn': 'SN1001'}]).to_csv(index=False).encode('utf-8')
+
+
+def queries():
+    admin = st.session_state.user_role == "ADMIN"
+    return {"🔍 Cek Detail": (get_inventory_df,),
+            "📜 Riwayat Import": (get_import_logs,) if admin else (),
+            "🛠️ Edit/Hapus": (get_inventory_df,) if admin else ()}.get(current_section(SECTIONS, 'gudang_section'), ())
+
+def dashboard(stok_summary):
+    st.subheader("Ringkasan Stok")
+    if not stok_summary.empty:
+        stok_rekap = stok_summary.rename(columns={'units': 'Total Stok'})
+        totals = stock_totals(stok_summary)
+        stok_tipis = stok_rekap[stok_rekap['Total Stok'] < LOW_STOCK_THRESHOLD]
+        if not stok_tipis.empty:
+            st.error(f"⚠️ PERHATIAN: {len(stok_tipis)} Barang Stoknya Menipis (< 5 unit)")
+            with st.expander("Klik untuk Lihat Detail Barang Menipis", expanded=False):
+                st.dataframe(stok_tipis, use_container_width=True, column_config={"price": st.column_config.NumberColumn("Harga", format="Rp %d"), "Total Stok": st.column_config.ProgressColumn("Sisa Stok", format="%d", min_value=0, max_value=5, help="Segera restock!")}, hide_index=True)
+            st.markdown("---")
+        c1, c2, c3 = st.columns(3)
+        with c1: st.markdown(f"""<div class="metric-box"><div class="metric-label">TOTAL UNIT</div><div class="metric-value">{totals['units']}</div></div>""", unsafe_allow_html=True)
+        with c2: st.markdown(f"""<div class="metric-box"><div class="metric-label">NILAI ASET</div><div class="metric-value">{format_rp(totals['asset'])}</div></div>""", unsafe_allow_html=True)
+        with c3: st.markdown(f"""<div class="metric-box"><div class="metric-label">JENIS PRODUK</div><div class="metric-value">{totals['products']}</div></div>""", unsafe_allow_html=True)
+        st.markdown("<br>", unsafe_allow_html=True)
+        max_stok = int(stok_rekap['Total Stok'].max())
+        st.dataframe(stok_rekap, use_container_width=True, column_config={"price": st.column_config.NumberColumn("Harga", format="Rp %d"), "Total Stok": st.column_config.ProgressColumn("Stok", format="%d", min_value=0, max_value=max_stok)}, hide_index=True)
+    # Tabel level-SN hanya dibuka untuk membedakan "tidak ada Ready" dari "database kosong"
+    elif not get_inventory_df().empty: st.info("Gudang Kosong.")
+    else: st.info("Database Kosong.")
+
+# Fragment: mengetik kata kunci / ganti brand hanya me-rerun hasil pencarian
+@st.fragment
+def cek_detail():
+    st.markdown('<div class="info-card"><div class="info-header">🔍 Pencarian Detail SN</div>', unsafe_allow_html=True)
+    df_master = get_inventory_df()
+    if not df_master.empty:
+        c_s1, c_s2 = st.columns(2)
+        with c_s1: q = st.text_input("Cari SN/SKU:", placeholder="Ketik nomor SN...")
+        with c_s2: fb = st.selectbox("Brand", ["All"] + sorted(df_master['brand'].unique().tolist()))
+        dv = df_master
+        is_filtered = False
+        if q:
+            dv, total, facets = search_inventory(q, None if fb == "All" else fb)
+            is_filtered = True
+            st.caption(" · ".join(f"{br}: {n}" for br, n in facets.most_common()))
+        elif fb != "All":
+            dv = dv[dv['brand'] == fb]; total = len(dv)
+            is_filtered = True
+        col_config = {"price": st.column_config.NumberColumn("Harga", format="Rp %d"), "sn": "Serial Number", "sku": "Nama Barang"}
+        if is_filtered:
+            st.success(f"Ditemukan {total} barang." + (f" Menampilkan {len(dv)} paling relevan." if total > len(dv) else ""))
+            st.dataframe(dv[['sn','sku','brand','price','status']], use_container_width=True, column_config=col_config, hide_index=True)
+        else:
+            # Tabel penuh dikirim ke browser hanya bila diminta, bukan disembunyikan di expander
+            if st.toggle(f"📋 Tampilkan Semua Data ({len(dv)} Barang)"):
+                st.dataframe(dv[['sn','sku','brand','price','status']], use_container_width=True, column_config=col_config, hide_index=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+def input_barang():
+    st.markdown('<div class="info-card"><div class="info-header">➕ Input Stok Baru</div>', unsafe_allow_html=True)
+    mode = st.radio("Metode:", ["Manual", "Upload Excel"], horizontal=True)
+    st.divider()
+    if mode == "Manual":
+        with st.form("in", clear_on_submit=True):
+            c1,c2,c3 = st.columns(3); b=c1.text_input("Brand"); s=c2.text_input("SKU"); p=c3.number_input("Harga", step=5000)
+            sn = st.text_area("List SN (Enter pemisah):", help="Sistem otomatis ubah ke Huruf Besar & Tolak Duplikat.")
+            if st.form_submit_button("SIMPAN", type="primary"):
+                if b and s and sn:
+                    try: added, dups, dup_list = add_stock_batch(st.session_state.user_role, b, s, p, sn.strip().split('\n'))
+                    except Exception as e: st.error(f"Error Database: {e}"); added, dups, dup_list = 0, 0, []
+                    if added > 0: st.toast(f"Berhasil input {added} item baru!", icon="✅"); st.success(f"✅ Berhasil input {added} item baru.")
+                    if dups > 0: st.toast(f"Ada {dups} item duplikat ditolak.", icon="⚠️"); st.error(f"❌ Gagal {dups} item karena Duplikat."); st.write("List Duplikat:", dup_list)
+                    time.sleep(2); st.rerun()
+    else:
+        st.download_button("📥 Download Template Excel/CSV", data=TEMPLATE_CSV, file_name="template_stok.csv", mime="text/csv")
+        uf = st.file_uploader("Upload File CSV/Excel", type=['xlsx','csv'])
+        if uf and st.button("PROSES IMPORT", type="primary"):
+            bar = st.progress(0.0, text="Memulai import...")
+            try: res = import_stock_stream(st.session_state.user_role, iter_upload_chunks(uf, uf.name), progress=lambda f, t: bar.progress(min(f or 0.0, 1.0), text=t))
+            except ValueError as e: res = None; st.error(f"File tidak valid: {e}")
+            if res and res['ok']: st.toast(f"Import Selesai! (+{res['added']})", icon="✅"); st.success(f"✅ Import Selesai! Berhasil: {res['added']}, Duplikat: {res['dups']}"); time.sleep(2); st.rerun()
+            elif res:
+                st.warning(f"⚠️ Import Sebagian. Tersimpan: {res['added']}, Duplikat: {res['dups']}, Gagal: {res['failed_rows']} baris")
+                st.dataframe(pd.DataFrame(res['failed']), use_container_width=True, hide_index=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+def _geser_halaman(key, step):
+    st.session_state[key] = st.session_state.get(key, 0) + step
+
+# Fragment: buka daftar SN / pindah halaman hanya me-rerun log import
+@st.fragment
+def riwayat_import():
+    logs = get_import_logs()
+    if logs:
+        for log in logs:
+            ts = pd.to_datetime(log['timestamp']).strftime("%d %b %Y %H:%M")
+            with st.expander(f"{ts} | {log['method']} | {log['total_items']} Item"):
+                if log.get('batch_id'):
+                    st.caption(f"Oleh {log['user']} · Nilai {format_rp(log.get('total_value') or 0)} · Duplikat {log.get('dups') or 0} · Gagal {log.get('failed_rows') or 0} baris")
+                    if log.get('brands'): st.caption(" · ".join(f"{b}: {n}" for b, n in sorted(log['brands'].items(), key=lambda x: -x[1])))
+                # Daftar SN baru diambil saat diminta, per halaman
+                if st.toggle("Tampilkan daftar SN", key=f"log_detail_{log['id']}"):
+                    pk = f"log_page_{log['id']}"
+                    hal = st.session_state.get(pk, 0)
+                    df_items, total = get_import_log_items(log, hal)
+                    st.dataframe(df_items, use_container_width=True, hide_index=True)
+                    n_hal = max(1, -(-total // LOG_DETAIL_PAGE))
+                    c_prev, c_hal, c_next = st.columns([1, 3, 1])
+                    c_prev.button("⬅️", key=f"{pk}_prev", disabled=hal == 0, on_click=_geser_halaman, args=(pk, -1))
+                    c_hal.caption(f"Halaman {hal + 1}/{n_hal} · {total} SN")
+                    c_next.button("➡️", key=f"{pk}_next", disabled=hal + 1 >= n_hal, on_click=_geser_halaman, args=(pk, 1))
+    else: st.info("Kosong")
+
+# Fragment: PIN, pencarian & form massal tidak me-rerun seluruh halaman; tulis tetap me-rerun app
+@st.fragment
+def edit_hapus():
+    st.markdown('<div class="danger-card"><div class="danger-header">⚠️ Edit & Hapus Data</div>', unsafe_allow_html=True)
+    if st.text_input("PIN Admin:", type="password") == "123456":
+        df_master = get_inventory_df()
+        mode_edit = st.radio("Mode:", ["Per SN", "Massal"], horizontal=True)
+        if mode_edit == "Massal":
+            aksi = st.selectbox("Aksi Massal:", ["Ubah Harga per SKU", "Ubah Harga per Brand", "Ubah Harga per Daftar SN", "Hapus Daftar SN", "Hapus per Batch Import", "Ubah Status Daftar SN"])
+            target_sns, sku_t, brand_t, log_t, status_t, harga_t = [], None, None, None, None, None
+            if aksi == "Ubah Harga per SKU": sku_t = st.selectbox("SKU:", sorted(df_master['sku'].astype(str).unique()))
+            elif aksi == "Ubah Harga per Brand": brand_t = st.selectbox("Brand:", sorted(df_master['brand'].astype(str).unique()))
+            elif aksi == "Hapus per Batch Import":
+                logs = get_import_logs()
+                log_t = st.selectbox("Batch Import:", logs, format_func=lambda l: f"{pd.to_datetime(l['timestamp']).strftime('%d %b %Y %H:%M')} | {l['method']} | {l['total_items']} Item") if logs else None
+            else: target_sns = st.text_area("Daftar SN (Enter pemisah):").split('\n')
+            if aksi.startswith("Ubah Harga"): harga_t = st.number_input("Harga Baru", step=5000, min_value=0)
+            if aksi == "Ubah Status Daftar SN": status_t = BULK_STATUSES[st.selectbox("Status Baru:", list(BULK_STATUSES))]
+            if st.button("JALANKAN", type="primary"):
+                try:
+                    with st.spinner("Memproses..."):
+                        if aksi.startswith("Ubah Harga"): st.success(f"✅ {bulk_reprice(harga_t, sku=sku_t, brand=brand_t, sns=target_sns)} stok Ready diubah harganya.")
+                        elif aksi == "Ubah Status Daftar SN":
+                            diubah, lewat = bulk_set_status(target_sns, status_t)
+                            st.success(f"✅ {diubah} SN diubah ke {status_t}." + (f" {lewat} dilewati (sudah terjual / tidak ada)." if lewat else ""))
+                        else:
+                            terhapus, lewat = delete_import_batch(log_t) if log_t else bulk_delete(target_sns)
+                            st.success(f"✅ {terhapus} SN dihapus." + (f" {lewat} dilewati (sudah terjual / tidak ada)." if lewat else ""))
+                except Exception as e: st.error(f"Gagal: {e}")
+        else:
+            src = st.text_input("Cari SN Edit:")
+            if src and not df_master.empty:
+                de, total, _ = search_inventory(src, limit=20)
+                if total > len(de): st.caption(f"Menampilkan {len(de)} dari {total} hasil, perjelas pencarian.")
+                for i, r in de.iterrows():
+                    with st.expander(f"{r['sku']} ({r['sn']})"):
+                        np = st.number_input("Harga", value=int(r['price']), key=f"p{r['sn']}")
+                        if st.button("Update", key=f"u{r['sn']}"): update_stock_price(r['sn'], np); st.toast("Harga berhasil diupdate!", icon="✅"); time.sleep(1); st.rerun()
+                        if st.button("Hapus", key=f"d{r['sn']}", type="primary"): delete_stock(r['sn']); st.toast("Data berhasil dihapus!", icon="🗑️"); time.sleep(1); st.rerun()
+    st.markdown('</div>', unsafe_allow_html=True)
+
+def render(stok_summary):
+    st.title("📦 Manajemen Gudang")
+    bagian = section_nav(SECTIONS, 'gudang_section')
+    admin = st.session_state.user_role == "ADMIN"
+
+    if bagian == "📊 Dashboard Stok": dashboard(stok_summary)
+    elif bagian == "🔍 Cek Detail": cek_detail()
+    elif bagian == "➕ Input Barang":
+        if admin: input_barang()
+        else: st.warning("Khusus Admin")
+    elif bagian == "📜 Riwayat Import":
+        st.subheader("Log Import")
+        if admin: riwayat_import()
+    elif bagian == "🛠️ Edit/Hapus":
+        if admin: edit_hapus()
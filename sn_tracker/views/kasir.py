@@ -0,0 +1,130 @@
+# ==========================================
+# HALAMAN KASIR: pilih produk / scan SN -> keranjang -> bayar
+# Pemilih produk dan panel keranjang masing-masing fragment: memilih produk
+# atau scan beruntun tidak me-rerun sidebar dan panel lainnya.
+# ==========================================
+
+import re
+import time
+import uuid
+
+import pandas as pd
+import streamlit as st
+
+from sn_tracker.service import (
+    find_sn, get_ready_index, reserve_cart, validate_cart, release_cart, release_after_checkout, process_checkout,
+    checkout_conflicts, dismiss_checkout_conflict, prefetch)
+from sn_tracker.utils import format_rp
+
+
+def queries():
+    return (get_ready_index,)
+
+def on_scan_sn():
+    """Callback Enter di kotak scan: resolve SN langsung ke keranjang (boleh beberapa SN sekaligus)."""
+    raw = st.session_state.scan_sn
+    st.session_state.scan_sn = ""
+    in_cart = {x['sn'] for x in st.session_state.keranjang}
+    found, failed = [], []
+    for sn in (x for x in re.split(r'[\s,;]+', raw.upper()) if x):
+        if sn in in_cart: failed.append(f"{sn} (sudah di keranjang)"); continue
+        try: row, status = find_sn(sn)
+        except Exception as e: failed.append(f"{sn} (gagal cek: {e})"); continue
+        if row is None: failed.append(f"{sn} (tidak ditemukan)")
+        elif status != 'Ready': failed.append(f"{sn} ({status})")
+        else: found.append(row); in_cart.add(sn)
+    # Semua SN hasil scan dikunci sekaligus, satu round trip
+    ok, ditolak = reserve_cart(st.session_state.cart_id, found)
+    st.session_state.keranjang.extend(ok)
+    added = [x['sn'] for x in ok]
+    failed += [f"{sn} ({alasan})" for sn, alasan in ditolak.items()]
+    if failed: st.session_state.scan_msg = ('error', "❌ " + ", ".join(failed))
+    elif added: st.session_state.scan_msg = ('success', f"✅ {', '.join(added)} masuk keranjang")
+    else: st.session_state.scan_msg = None
+
+# Fragment: memilih produk / SN hanya me-rerun panel ini; TAMBAH me-rerun app supaya keranjang ikut
+@st.fragment
+def product_panel():
+    st.info("💡 Ketik Nama Barang, atau Scan Barcode SN di kotak Keranjang")
+    ready_idx = get_ready_index()
+    if len(ready_idx):
+        pilih_barang = st.selectbox("Pilih Produk:", ["-- Pilih Produk --"] + ready_idx.labels, key=f"sb_{st.session_state.search_key}", label_visibility="collapsed")
+        if pilih_barang != "-- Pilih Produk --":
+            item = ready_idx.products.get(pilih_barang)
+            if item:
+                sku = item['sku']
+                sn_cart = {x['sn'] for x in st.session_state.keranjang}
+                avail = [x for x in ready_idx.sns(sku) if x not in sn_cart]
+                st.markdown(f"""<div class="product-card-container"><span class="product-badge">{item['brand']}</span><span class="product-stock">Stok Tersedia: {len(avail)}</span><div class="product-title">{sku}</div><div class="big-price-tag">{format_rp(item['price'])}</div></div>""", unsafe_allow_html=True)
+                col_sn, col_add = st.columns([2, 1])
+                with col_sn:
+                    p_sn = st.multiselect("Pilih SN:", avail, placeholder="Pilih Nomor SN...", label_visibility="collapsed")
+                with col_add:
+                    if st.button("TAMBAH ➕", type="primary", use_container_width=True):
+                        if p_sn:
+                            ok, ditolak = reserve_cart(st.session_state.cart_id, [ready_idx.row(s) for s in p_sn])
+                            st.session_state.keranjang.extend(ok)
+                            if ditolak: st.session_state.scan_msg = ('error', "❌ " + ", ".join(f"{sn} ({alasan})" for sn, alasan in ditolak.items()))
+                            st.session_state.search_key += 1; st.toast(f"{len(ok)} barang masuk keranjang!", icon="🛒"); time.sleep(0.1); st.rerun()
+                        else: st.warning("Pilih SN dulu")
+            else: st.warning("Barang tidak ditemukan.")
+    else: st.warning("Stok Gudang Kosong.")
+
+# Fragment: scan beruntun hanya me-rerun panel keranjang, bukan seluruh halaman
+@st.fragment
+def cart_panel():
+    st.markdown("### Keranjang")
+    st.text_input("Scan SN", key="scan_sn", on_change=on_scan_sn, placeholder="🔫 Scan / ketik SN lalu Enter", label_visibility="collapsed")
+    if st.session_state.get('scan_msg'):
+        level, text = st.session_state.scan_msg
+        getattr(st, level)(text)
+    if st.session_state.keranjang:
+        with st.container(height=450, border=True):
+            st.caption("Klik tombol kecil di kanan SN untuk Copy.")
+            for i, x in enumerate(st.session_state.keranjang):
+                st.markdown(f"**{x['sku']}**")
+                c_sn_code, c_price = st.columns([2.5, 1])
+                with c_sn_code: st.code(x['sn'], language="text")
+                with c_price: st.markdown(f"<div style='text-align:right; margin-top: 5px; font-weight:bold;'>{format_rp(x['price'])}</div>", unsafe_allow_html=True)
+                st.divider()
+        with st.container(border=True):
+            tot = sum(item['price'] for item in st.session_state.keranjang)
+            st.markdown(f"<div style='text-align:right'>Total Tagihan<br><span class='big-price'>{format_rp(tot)}</span></div>", unsafe_allow_html=True)
+            if st.button("✅ BAYAR SEKARANG", type="primary", use_container_width=True):
+                # Cek ulang keranjang ke server (status, reservasi, harga) sebelum uang diterima
+                cart, dikeluarkan, harga_baru = validate_cart(st.session_state.cart_id, st.session_state.keranjang)
+                if dikeluarkan or harga_baru:
+                    st.session_state.keranjang = cart
+                    pesan = [f"{sn} dikeluarkan ({alasan})" for sn, alasan in dikeluarkan.items()]
+                    pesan += [f"{sn} harga berubah {format_rp(lama)} → {format_rp(baru)}" for sn, (lama, baru) in harga_baru.items()]
+                    st.session_state.scan_msg = ('error', "⚠️ Keranjang diperbarui, cek lalu bayar lagi: " + "; ".join(pesan)); st.rerun()
+                try: tid, tbil, konflik = process_checkout(st.session_state.user_role, st.session_state.keranjang, st.session_state.checkout_key)
+                except Exception as e: st.error(f"Transaksi Gagal: {e}"); tid, tbil, konflik = None, 0, []
+                if konflik:
+                    st.session_state.keranjang = [x for x in st.session_state.keranjang if x['sn'] not in konflik]
+                    st.session_state.scan_msg = ('error', f"❌ Sudah terjual di kasir lain, dikeluarkan dari keranjang: {', '.join(konflik)}"); st.rerun()
+                if tid: release_after_checkout(st.session_state.cart_id, [x['sn'] for x in st.session_state.keranjang], st.session_state.checkout_key); st.session_state.keranjang = []; st.session_state.scan_msg = None; st.session_state.checkout_key = uuid.uuid4().hex; st.balloons(); st.toast("Transaksi Berhasil Disimpan!", icon="✅"); st.success("Transaksi Sukses!"); st.session_state.last_trx = {'id': tid, 'total': tbil}; st.rerun()
+            if st.button("❌ Batal", use_container_width=True): prefetch((release_cart, st.session_state.cart_id, [x['sn'] for x in st.session_state.keranjang])); st.session_state.keranjang = []; st.session_state.scan_msg = None; st.session_state.checkout_key = uuid.uuid4().hex; st.toast("Keranjang dibersihkan.", icon="🗑️"); st.rerun()
+    else:
+        with st.container(border=True):
+            if 'last_trx' in st.session_state and st.session_state.last_trx:
+                st.success("✅ Transaksi Berhasil!")
+                st.write(f"ID: {st.session_state.last_trx['id']}")
+                st.write(f"Total: {format_rp(st.session_state.last_trx['total'])}")
+                if st.button("Tutup"): del st.session_state.last_trx; st.rerun(scope="fragment")
+            else: st.info("Keranjang Kosong")
+
+def render(stok_summary):
+    st.title("🛒 Kasir")
+    konflik_trx = checkout_conflicts()
+    if konflik_trx:
+        with st.expander(f"⚠️ {len(konflik_trx)} transaksi ditolak server (SN sudah terjual di kasir lain)", expanded=True):
+            for k in konflik_trx:
+                st.markdown(f"**{k['trx_id']}** · {k['user']} · {format_rp(k['total'])} · SN bentrok: `{', '.join(k['conflicts'])}`")
+                st.dataframe(pd.DataFrame(k['items']), use_container_width=True, hide_index=True)
+                if st.button("✔️ Sudah ditangani", key=f"dismiss_{k['idempotency_key']}"): dismiss_checkout_conflict(k['idempotency_key']); st.rerun()
+    c_product, c_cart = st.columns([1.8, 1])
+    with c_product:
+        product_panel()
+    with c_cart:
+        cart_panel()
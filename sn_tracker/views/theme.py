@@ -0,0 +1,94 @@
+# ==========================================
+# THEME: CSS app, dipadatkan sekali saat import
+# app.py menyuntikkannya tiap full rerun (elemen Streamlit tidak bertahan antar
+# run); versi padat memperkecil payload ke browser tiap kali.
+# ==========================================
+
+import re
+
+_CSS = """
+/* VARIABEL DINAMIS */
+:root {
+    --brand-blue: #0095DA;
+    --brand-yellow: #F99D1C;
+    --card-bg: var(--secondary-background-color);
+    --border-color: rgba(128, 128, 128, 0.2);
+}
+
+div.stButton > button[kind="primary"] {
+    background: linear-gradient(90deg, #0095DA 0%, #007bb5 100%);
+    border: none; color: white !important; font-weight: 700;
+    padding: 10px 20px; border-radius: 8px;
+    box-shadow: 0 2px 5px rgba(0, 0, 0, 0.1);
+    transition: all 0.3s ease;
+}
+div.stButton > button[kind="primary"]:hover {
+    transform: translateY(-2px);
+    box-shadow: 0 4px 10px rgba(0, 149, 218, 0.3);
+}
+div.stButton > button[data-testid="baseButton-secondary"] {
+    border: 1px solid #ff4b4b; color: #ff4b4b; border-radius: 8px;
+}
+div.stButton > button[data-testid="baseButton-secondary"]:hover {
+    background-color: #ff4b4b; color: white; border-color: #ff4b4b;
+}
+
+.product-card-container {
+    background-color: var(--card-bg); padding: 25px; border-radius: 12px;
+    border: 1px solid var(--border-color); border-left: 6px solid var(--brand-blue);
+    box-shadow: 0 4px 6px rgba(0,0,0,0.05); margin-bottom: 20px; color: var(--text-color);
+}
+.product-title { font-size: 22px; font-weight: 700; margin-bottom: 5px; }
+.product-badge {
+    background-color: rgba(0, 149, 218, 0.15); color: var(--brand-blue);
+    padding: 4px 10px; border-radius: 12px; font-size: 12px; font-weight: 700; margin-right: 5px;
+}
+.product-stock {
+    background-color: rgba(46, 125, 50, 0.15); color: #4caf50;
+    padding: 4px 10px; border-radius: 12px; font-size: 12px; font-weight: 700;
+}
+.big-price-tag { font-size: 36px; font-weight: 800; color: var(--brand-yellow); margin-top: 15px; margin-bottom: 10px; }
+
+.metric-box {
+    background-color: var(--card-bg); padding: 20px; border-radius: 12px;
+    border: 1px solid var(--border-color); border-left: 4px solid var(--brand-blue);
+    text-align: center; color: var(--text-color);
+}
+.metric-label { font-size: 14px; opacity: 0.7; font-weight: 600; text-transform: uppercase; }
+.metric-value { font-size: 28px; font-weight: 800; margin-top: 5px; }
+
+.info-card {
+    padding: 20px; background-color: var(--card-bg); border: 1px solid var(--border-color);
+    border-radius: 12px; box-shadow: 0 2px 8px rgba(0,0,0,0.05); margin-bottom: 20px;
+}
+.info-header {
+    font-weight: 700; font-size: 16px; color: var(--brand-blue);
+    margin-bottom: 15px; border-bottom: 1px solid var(--border-color); padding-bottom: 10px;
+}
+
+.admin-card-blue {
+    padding: 20px; border: 1px solid #0095DA; background-color: rgba(0, 149, 218, 0.05);
+    border-radius: 10px; margin-bottom: 15px; color: var(--text-color);
+}
+.admin-card-red {
+    padding: 20px; border: 1px solid #ff4b4b; background-color: rgba(255, 75, 75, 0.05);
+    border-radius: 10px; margin-bottom: 15px; color: var(--text-color);
+}
+.admin-header { font-weight: 700; font-size: 18px; margin-bottom: 10px; display: flex; align-items: center; gap: 10px; }
+
+.stCode { font-family: 'Courier New', monospace; font-weight: bold; }
+div[data-testid="stExpander"] { border: 1px solid var(--border-color); background-color: var(--card-bg); border-radius: 8px; }
+
+.sidebar-alert {
+    background-color: rgba(255, 75, 75, 0.1); border: 1px solid #ff4b4b; color: #ff4b4b;
+    padding: 12px; border-radius: 8px; font-size: 14px; font-weight: 600;
+    margin-top: 10px; margin-bottom: 10px;
+}
+"""
+
+def minify(css):
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    return re.sub(r'\s*([{};:,>])\s*', r'\1', css).replace(';}', '}').strip()
+
+CSS = f"<style>{minify(_CSS)}</style>"
@@ -0,0 +1,23 @@
+-- ==========================================
+-- 001: inventory.updated_at untuk delta sync
+-- Jalankan sekali di Supabase SQL Editor.
+-- Store di app.py hanya menarik baris dengan updated_at > high-water mark.
+-- ==========================================
+
+alter table inventory add column if not exists updated_at timestamptz not null default now();
+
+create or replace function touch_updated_at() returns trigger
+language plpgsql as $$
+begin
+  new.updated_at := now();
+  return new;
+end;
+$$;
+
+drop trigger if exists inventory_touch_updated_at on inventory;
+create trigger inventory_touch_updated_at
+  before insert or update on inventory
+  for each row execute function touch_updated_at();
+
+create index if not exists inventory_updated_at_idx on inventory (updated_at);
+create index if not exists transactions_timestamp_idx on transactions ("timestamp");
@@ -0,0 +1,13 @@
+-- ==========================================
+-- 002: rekap stok Ready di sisi server
+-- Sidebar, Dashboard Stok & Format SO cukup baca view ini (ratusan baris),
+-- bukan tabel inventory level-SN.
+-- ==========================================
+
+create index if not exists inventory_status_sku_idx on inventory (status, brand, sku, price);
+
+create or replace view stock_summary as
+select brand, sku, price, count(*)::int as units
+from inventory
+where status = 'Ready'
+group by brand, sku, price;
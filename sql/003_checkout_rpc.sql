@@ -0,0 +1,49 @@
+-- ==========================================
+-- 003: checkout atomik & idempotent
+-- Satu round trip: kunci baris SN, tolak yang sudah tidak Ready,
+-- flip ke Sold dan catat transaksi dalam satu transaksi Postgres.
+-- Panggilan ulang dengan idempotency key yang sama mengembalikan transaksi lama.
+-- ==========================================
+
+alter table transactions add column if not exists idempotency_key text;
+create unique index if not exists transactions_idempotency_key_idx on transactions (idempotency_key);
+
+create or replace function checkout(p_trx_id text, p_user text, p_items jsonb, p_idempotency_key text)
+returns jsonb
+language plpgsql as $$
+declare
+  v_prev transactions%rowtype;
+  v_sns text[];
+  v_conflicts text[];
+  v_total bigint;
+  v_now timestamptz := now();
+begin
+  select * into v_prev from transactions where idempotency_key = p_idempotency_key;
+  if found then
+    return jsonb_build_object('status', 'duplicate', 'trx_id', v_prev.trx_id, 'total', v_prev.total_bill,
+                              'sold_at', v_prev."timestamp", 'conflicts', '[]'::jsonb);
+  end if;
+
+  select array_agg(x->>'sn'), coalesce(sum((x->>'price')::bigint), 0)
+    into v_sns, v_total
+    from jsonb_array_elements(p_items) x;
+
+  -- Kunci baris supaya dua kasir tidak bisa menjual SN yang sama bersamaan
+  perform 1 from inventory where sn = any(v_sns) for update;
+
+  select coalesce(array_agg(s), '{}') into v_conflicts
+    from unnest(v_sns) s
+   where not exists (select 1 from inventory i where i.sn = s and i.status = 'Ready');
+  if cardinality(v_conflicts) > 0 then
+    return jsonb_build_object('status', 'conflict', 'conflicts', to_jsonb(v_conflicts));
+  end if;
+
+  update inventory set status = 'Sold', sold_at = v_now where sn = any(v_sns) and status = 'Ready';
+
+  insert into transactions (trx_id, "timestamp", "user", total_bill, items_count, item_details, idempotency_key)
+  values (p_trx_id, v_now, p_user, v_total, cardinality(v_sns), p_items, p_idempotency_key);
+
+  return jsonb_build_object('status', 'ok', 'trx_id', p_trx_id, 'total', v_total,
+                            'sold_at', v_now, 'conflicts', '[]'::jsonb);
+end;
+$$;
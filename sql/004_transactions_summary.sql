@@ -0,0 +1,14 @@
+-- ==========================================
+-- 004: agregat riwayat transaksi
+-- Omzet & jumlah transaksi dihitung di server; app tidak perlu
+-- mengunduh semua transaksi (apalagi item_details) hanya untuk dua angka.
+-- ==========================================
+
+create or replace function transactions_summary(p_from timestamptz default null, p_to timestamptz default null)
+returns jsonb
+language sql stable as $$
+  select jsonb_build_object('omzet', coalesce(sum(total_bill), 0), 'count', count(*))
+    from transactions
+   where (p_from is null or "timestamp" >= p_from)
+     and (p_to is null or "timestamp" < p_to);
+$$;
@@ -0,0 +1,68 @@
+-- ==========================================
+-- 005: reset bertahap & arsip data lama
+-- purge_batch    : hapus maksimal p_batch baris per panggilan (tidak kena statement timeout,
+--                  app bisa menampilkan progress).
+-- truncate_tables: reset pabrik instan dalam satu statement.
+-- archive_sold   : pindahkan inventory Sold & transaksi lama ke tabel dingin supaya
+--                  tabel panas tetap kecil.
+-- ==========================================
+
+create table if not exists inventory_archive (like inventory including defaults including indexes);
+create table if not exists transactions_archive (like transactions including defaults including indexes);
+
+create or replace function purge_batch(p_table text, p_batch int default 5000)
+returns int
+language plpgsql as $$
+declare
+  n int;
+begin
+  if p_table not in ('inventory', 'transactions', 'import_logs', 'inventory_archive', 'transactions_archive') then
+    raise exception 'Tabel tidak diizinkan: %', p_table;
+  end if;
+  execute format('delete from %I where ctid in (select ctid from %I limit %s)', p_table, p_table, p_batch);
+  get diagnostics n = row_count;
+  return n;
+end;
+$$;
+
+create or replace function truncate_tables(p_tables text[])
+returns void
+language plpgsql as $$
+declare
+  t text;
+begin
+  foreach t in array p_tables loop
+    if t not in ('inventory', 'transactions', 'import_logs') then
+      raise exception 'Tabel tidak diizinkan: %', t;
+    end if;
+  end loop;
+  execute 'truncate table ' || (select string_agg(format('%I', t), ', ') from unnest(p_tables) t);
+end;
+$$;
+
+create or replace function archive_sold(p_before timestamptz, p_batch int default 5000)
+returns jsonb
+language plpgsql as $$
+declare
+  n_inv int;
+  n_trx int;
+begin
+  with moved as (
+    delete from inventory
+     where ctid in (select ctid from inventory where status = 'Sold' and sold_at < p_before limit p_batch)
+    returning *
+  )
+  insert into inventory_archive select * from moved;
+  get diagnostics n_inv = row_count;
+
+  with moved as (
+    delete from transactions
+     where ctid in (select ctid from transactions where "timestamp" < p_before limit p_batch)
+    returning *
+  )
+  insert into transactions_archive select * from moved;
+  get diagnostics n_trx = row_count;
+
+  return jsonb_build_object('inventory', n_inv, 'transactions', n_trx);
+end;
+$$;
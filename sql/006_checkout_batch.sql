@@ -0,0 +1,65 @@
+-- ==========================================
+-- 006: sinkron antrean checkout offline
+-- checkout() menerima waktu jual asli (p_sold_at) karena transaksi dari antrean
+-- lokal bisa sampai di server beberapa menit/jam setelah terjadi.
+-- checkout_batch() mengirim banyak transaksi antrean dalam satu round trip;
+-- tiap transaksi tetap atomik & idempotent lewat checkout().
+-- ==========================================
+
+drop function if exists checkout(text, text, jsonb, text);
+
+create or replace function checkout(p_trx_id text, p_user text, p_items jsonb, p_idempotency_key text,
+                                    p_sold_at timestamptz default null)
+returns jsonb
+language plpgsql as $$
+declare
+  v_prev transactions%rowtype;
+  v_sns text[];
+  v_conflicts text[];
+  v_total bigint;
+  v_now timestamptz := coalesce(p_sold_at, now());
+begin
+  select * into v_prev from transactions where idempotency_key = p_idempotency_key;
+  if found then
+    return jsonb_build_object('status', 'duplicate', 'trx_id', v_prev.trx_id, 'total', v_prev.total_bill,
+                              'sold_at', v_prev."timestamp", 'conflicts', '[]'::jsonb);
+  end if;
+
+  select array_agg(x->>'sn'), coalesce(sum((x->>'price')::bigint), 0)
+    into v_sns, v_total
+    from jsonb_array_elements(p_items) x;
+
+  perform 1 from inventory where sn = any(v_sns) for update;
+
+  select coalesce(array_agg(s), '{}') into v_conflicts
+    from unnest(v_sns) s
+   where not exists (select 1 from inventory i where i.sn = s and i.status = 'Ready');
+  if cardinality(v_conflicts) > 0 then
+    return jsonb_build_object('status', 'conflict', 'conflicts', to_jsonb(v_conflicts));
+  end if;
+
+  update inventory set status = 'Sold', sold_at = v_now where sn = any(v_sns) and status = 'Ready';
+
+  insert into transactions (trx_id, "timestamp", "user", total_bill, items_count, item_details, idempotency_key)
+  values (p_trx_id, v_now, p_user, v_total, cardinality(v_sns), p_items, p_idempotency_key);
+
+  return jsonb_build_object('status', 'ok', 'trx_id', p_trx_id, 'total', v_total,
+                            'sold_at', v_now, 'conflicts', '[]'::jsonb);
+end;
+$$;
+
+create or replace function checkout_batch(p_batch jsonb)
+returns jsonb
+language plpgsql as $$
+declare
+  x jsonb;
+  v_out jsonb := '[]'::jsonb;
+begin
+  for x in select * from jsonb_array_elements(p_batch) loop
+    v_out := v_out || jsonb_build_array(
+      checkout(x->>'trx_id', x->>'user', x->'items', x->>'idempotency_key', (x->>'sold_at')::timestamptz)
+      || jsonb_build_object('idempotency_key', x->>'idempotency_key'));
+  end loop;
+  return v_out;
+end;
+$$;
@@ -0,0 +1,18 @@
+-- ==========================================
+-- 007: log import ringkas
+-- SN hasil import ditandai import_batch_id; import_logs cukup menyimpan ringkasan
+-- (jumlah, nilai, brand, duplikat, gagal), bukan salinan semua baris di items_detail.
+-- Detail log dibaca per halaman dari inventory saat dibutuhkan.
+-- ==========================================
+
+alter table inventory add column if not exists import_batch_id text;
+alter table inventory_archive add column if not exists import_batch_id text;
+create index if not exists inventory_import_batch_idx on inventory (import_batch_id);
+
+alter table import_logs add column if not exists batch_id text;
+alter table import_logs add column if not exists total_value bigint;
+alter table import_logs add column if not exists dups int;
+alter table import_logs add column if not exists failed_rows int;
+alter table import_logs add column if not exists brands jsonb;
+create unique index if not exists import_logs_batch_id_idx on import_logs (batch_id);
+create index if not exists import_logs_timestamp_idx on import_logs ("timestamp");
@@ -0,0 +1,129 @@
+-- ==========================================
+-- 008: rollup penjualan & stok masuk
+-- sales_daily / intake_daily diisi trigger per statement saat transaksi dan
+-- inventory di-insert (checkout, import, input manual), jadi dashboard tidak
+-- perlu membongkar item_details setiap kali dibuka.
+-- sales_rollup() mengembalikan rollup per hari/minggu/bulan x brand x SKU.
+-- stock_aging   : umur stok Ready (sejak created_at) per brand/SKU.
+-- Hari dihitung di zona waktu toko (Asia/Jakarta, sama dengan LOCAL_TZ di app).
+-- ==========================================
+
+create table if not exists sales_daily (
+  day date not null, brand text not null, sku text not null,
+  units int not null default 0, revenue bigint not null default 0,
+  primary key (day, brand, sku));
+
+create table if not exists intake_daily (
+  day date not null, brand text not null, sku text not null,
+  units int not null default 0, value bigint not null default 0,
+  primary key (day, brand, sku));
+
+create or replace function rollup_sales()
+returns trigger
+language plpgsql as $$
+begin
+  insert into sales_daily (day, brand, sku, units, revenue)
+  select (n."timestamp" at time zone 'Asia/Jakarta')::date, coalesce(x->>'brand', ''), coalesce(x->>'sku', ''),
+         count(*), coalesce(sum((x->>'price')::bigint), 0)
+    from new_rows n cross join lateral jsonb_array_elements(n.item_details) x
+   group by 1, 2, 3
+  on conflict (day, brand, sku) do update
+    set units = sales_daily.units + excluded.units, revenue = sales_daily.revenue + excluded.revenue;
+  return null;
+end;
+$$;
+
+create or replace function rollup_intake()
+returns trigger
+language plpgsql as $$
+begin
+  insert into intake_daily (day, brand, sku, units, value)
+  select (coalesce(n.created_at, now()) at time zone 'Asia/Jakarta')::date, coalesce(n.brand, ''), coalesce(n.sku, ''),
+         count(*), coalesce(sum(n.price), 0)
+    from new_rows n
+   group by 1, 2, 3
+  on conflict (day, brand, sku) do update
+    set units = intake_daily.units + excluded.units, value = intake_daily.value + excluded.value;
+  return null;
+end;
+$$;
+
+drop trigger if exists transactions_rollup_sales on transactions;
+create trigger transactions_rollup_sales after insert on transactions
+  referencing new table as new_rows for each statement execute function rollup_sales();
+
+drop trigger if exists inventory_rollup_intake on inventory;
+create trigger inventory_rollup_intake after insert on inventory
+  referencing new table as new_rows for each statement execute function rollup_intake();
+
+-- Isi awal dari data yang sudah ada (termasuk arsip). Aman dijalankan ulang.
+truncate sales_daily, intake_daily;
+
+insert into sales_daily (day, brand, sku, units, revenue)
+select (t."timestamp" at time zone 'Asia/Jakarta')::date, coalesce(x->>'brand', ''), coalesce(x->>'sku', ''),
+       count(*), coalesce(sum((x->>'price')::bigint), 0)
+  from (select "timestamp", item_details from transactions
+        union all select "timestamp", item_details from transactions_archive) t
+ cross join lateral jsonb_array_elements(t.item_details) x
+ group by 1, 2, 3;
+
+insert into intake_daily (day, brand, sku, units, value)
+select (coalesce(i.created_at, now()) at time zone 'Asia/Jakarta')::date, coalesce(i.brand, ''), coalesce(i.sku, ''),
+       count(*), coalesce(sum(i.price), 0)
+  from (select created_at, brand, sku, price from inventory
+        union all select created_at, brand, sku, price from inventory_archive) i
+ group by 1, 2, 3;
+
+create or replace function sales_rollup(p_from date default null, p_to date default null, p_grain text default 'day')
+returns jsonb
+language sql stable as $$
+  select coalesce(jsonb_agg(jsonb_build_object(
+           'period', period, 'brand', brand, 'sku', sku, 'units_sold', units_sold, 'revenue', revenue,
+           'units_in', units_in, 'value_in', value_in)), '[]'::jsonb)
+    from (select date_trunc(p_grain, day::timestamp)::date as period, brand, sku,
+                 sum(units_sold) as units_sold, sum(revenue) as revenue, sum(units_in) as units_in, sum(value_in) as value_in
+            from (select day, brand, sku, units as units_sold, revenue, 0 as units_in, 0::bigint as value_in from sales_daily
+                  union all
+                  select day, brand, sku, 0, 0, units, value from intake_daily) x
+           where (p_from is null or day >= p_from) and (p_to is null or day <= p_to)
+           group by 1, 2, 3) r;
+$$;
+
+create or replace view stock_aging as
+select brand, sku,
+       case when age <= 30 then 0 when age <= 60 then 31 when age <= 90 then 61 when age <= 180 then 91 else 181 end as age_from,
+       count(*)::int as units, sum(price)::bigint as value
+from (select brand, sku, price, extract(day from now() - created_at) as age from inventory where status = 'Ready') r
+group by 1, 2, 3;
+
+-- Reset pabrik ikut mengosongkan rollup (lihat factory_reset di sn_tracker/service.py)
+create or replace function purge_batch(p_table text, p_batch int default 5000)
+returns int
+language plpgsql as $$
+declare
+  n int;
+begin
+  if p_table not in ('inventory', 'transactions', 'import_logs', 'inventory_archive', 'transactions_archive',
+                     'sales_daily', 'intake_daily') then
+    raise exception 'Tabel tidak diizinkan: %', p_table;
+  end if;
+  execute format('delete from %I where ctid in (select ctid from %I limit %s)', p_table, p_table, p_batch);
+  get diagnostics n = row_count;
+  return n;
+end;
+$$;
+
+create or replace function truncate_tables(p_tables text[])
+returns void
+language plpgsql as $$
+declare
+  t text;
+begin
+  foreach t in array p_tables loop
+    if t not in ('inventory', 'transactions', 'import_logs', 'sales_daily', 'intake_daily') then
+      raise exception 'Tabel tidak diizinkan: %', t;
+    end if;
+  end loop;
+  execute 'truncate table ' || (select string_agg(format('%I', t), ', ') from unnest(p_tables) t);
+end;
+$$;
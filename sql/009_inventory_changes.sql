@@ -0,0 +1,76 @@
+-- ==========================================
+-- 009: penanda perubahan inventory untuk store bersama
+-- inventory_version : satu baris; `version` naik tiap statement yang mengubah
+--                     inventory, `reset` naik saat TRUNCATE. App membaca baris ini
+--                     tiap ~1 detik (murah) dan baru menarik delta bila berubah.
+-- inventory_deleted : tombstone SN yang dihapus, supaya DELETE dari kasir/admin
+--                     lain ikut tersinkron lewat delta, bukan menunggu full reload.
+--                     Disimpan 1 hari (jauh di atas interval full reload app).
+--                     SN yang diinsert ulang dibuang dari tombstone, supaya tidak ikut
+--                     terhapus lagi dari store (hapus batch import lalu import ulang).
+-- Baris versi di-update dalam transaksi penulis, sehingga versi baru hanya terlihat setelah
+-- perubahannya ter-commit (tidak ada delta yang terlewat).
+-- ==========================================
+
+create table if not exists inventory_version (
+  id int primary key default 1 check (id = 1),
+  version bigint not null default 0,
+  reset bigint not null default 0,
+  changed_at timestamptz not null default now());
+insert into inventory_version (id) values (1) on conflict do nothing;
+
+create table if not exists inventory_deleted (
+  sn text primary key,
+  deleted_at timestamptz not null default now());
+create index if not exists inventory_deleted_at_idx on inventory_deleted (deleted_at);
+
+create or replace function bump_inventory_version()
+returns trigger
+language plpgsql as $$
+begin
+  if tg_op = 'TRUNCATE' then
+    delete from inventory_deleted;
+    update inventory_version set reset = reset + 1, version = version + 1, changed_at = now() where id = 1;
+  else
+    update inventory_version set version = version + 1, changed_at = now() where id = 1;
+  end if;
+  return null;
+end;
+$$;
+
+create or replace function record_inventory_deleted()
+returns trigger
+language plpgsql as $$
+begin
+  insert into inventory_deleted (sn, deleted_at)
+  select sn, now() from old_rows
+  on conflict (sn) do update set deleted_at = excluded.deleted_at;
+  delete from inventory_deleted where deleted_at < now() - interval '1 day';
+  return null;
+end;
+$$;
+
+create or replace function clear_inventory_tombstones()
+returns trigger
+language plpgsql as $$
+begin
+  delete from inventory_deleted d using new_rows n where d.sn = n.sn;
+  return null;
+end;
+$$;
+
+drop trigger if exists inventory_bump_version on inventory;
+create trigger inventory_bump_version after insert or update or delete on inventory
+  for each statement execute function bump_inventory_version();
+
+drop trigger if exists inventory_bump_version_truncate on inventory;
+create trigger inventory_bump_version_truncate after truncate on inventory
+  for each statement execute function bump_inventory_version();
+
+drop trigger if exists inventory_record_deleted on inventory;
+create trigger inventory_record_deleted after delete on inventory
+  referencing old table as old_rows for each statement execute function record_inventory_deleted();
+
+drop trigger if exists inventory_clear_tombstones on inventory;
+create trigger inventory_clear_tombstones after insert on inventory
+  referencing new table as new_rows for each statement execute function clear_inventory_tombstones();
@@ -0,0 +1,53 @@
+-- ==========================================
+-- 010: reservasi SN keranjang kasir
+-- SN yang masuk keranjang dikunci untuk keranjang itu (holder) selama TTL, jadi
+-- kasir lain tidak bisa memasukkan unit yang sama. reserve_sns() dipakai saat SN
+-- ditambahkan dan sekali lagi sebelum bayar: satu round trip yang memperpanjang
+-- reservasi sekaligus mengembalikan status & harga terbaru tiap SN.
+-- Reservasi kedaluwarsa dibersihkan oleh reserve_sns() sendiri.
+-- ==========================================
+
+create table if not exists cart_reservations (
+  sn text primary key,
+  holder text not null,
+  expires_at timestamptz not null);
+create index if not exists cart_reservations_holder_idx on cart_reservations (holder);
+create index if not exists cart_reservations_expires_idx on cart_reservations (expires_at);
+
+create or replace function reserve_sns(p_sns text[], p_holder text, p_ttl_s int default 900)
+returns jsonb
+language plpgsql as $$
+declare
+  v_out jsonb;
+begin
+  delete from cart_reservations where expires_at < now();
+
+  insert into cart_reservations (sn, holder, expires_at)
+  select i.sn, p_holder, now() + make_interval(secs => p_ttl_s)
+    from inventory i
+   where i.sn = any(p_sns) and i.status = 'Ready'
+  on conflict (sn) do update set expires_at = excluded.expires_at
+   where cart_reservations.holder = excluded.holder;   -- milik keranjang lain tidak direbut
+
+  select coalesce(jsonb_agg(jsonb_build_object(
+           'sn', s, 'status', i.status, 'price', i.price, 'brand', i.brand, 'sku', i.sku,
+           'held_by_other', r.holder is not null and r.holder <> p_holder)), '[]'::jsonb)
+    into v_out
+    from unnest(p_sns) s
+    left join inventory i on i.sn = s
+    left join cart_reservations r on r.sn = s;
+  return v_out;
+end;
+$$;
+
+create or replace function release_sns(p_holder text, p_sns text[] default null)
+returns int
+language plpgsql as $$
+declare
+  n int;
+begin
+  delete from cart_reservations where holder = p_holder and (p_sns is null or sn = any(p_sns));
+  get diagnostics n = row_count;
+  return n;
+end;
+$$;
@@ -0,0 +1,22 @@
+-- ==========================================
+-- 011: riwayat transaksi termasuk arsip
+-- archive_sold (005) memindahkan transaksi lama ke transactions_archive. Omzet
+-- total dan riwayat harus tetap menghitung transaksi itu, sama seperti rollup 008.
+-- transactions_all menggabungkan keduanya; ORDER BY + LIMIT tetap memakai index
+-- timestamp masing-masing tabel (arsip ikut index-nya lewat `like ... including
+-- indexes`), jadi halaman riwayat tidak men-scan arsip.
+-- ==========================================
+
+create or replace view transactions_all as
+  select * from transactions
+  union all
+  select * from transactions_archive;
+
+create or replace function transactions_summary(p_from timestamptz default null, p_to timestamptz default null)
+returns jsonb
+language sql stable as $$
+  select jsonb_build_object('omzet', coalesce(sum(total_bill), 0), 'count', count(*))
+    from transactions_all
+   where (p_from is null or "timestamp" >= p_from)
+     and (p_to is null or "timestamp" < p_to);
+$$;
@@ -0,0 +1,9 @@
+-- ==========================================
+-- 012: index untuk cursor riwayat (timestamp, trx_id)
+-- get_history_page mengurutkan timestamp desc, trx_id desc dan melanjutkan dari
+-- pasangan terakhir, supaya transaksi dengan timestamp sama tidak terlewat.
+-- Index gabungan membuat urutan itu langsung dari index (dibaca mundur), tanpa sort.
+-- ==========================================
+
+create index if not exists transactions_ts_trx_idx on transactions ("timestamp", trx_id);
+create index if not exists transactions_archive_ts_trx_idx on transactions_archive ("timestamp", trx_id);
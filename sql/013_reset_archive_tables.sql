@@ -0,0 +1,40 @@
+-- ==========================================
+-- 013: reset ikut mengosongkan arsip & reservasi keranjang
+-- Sejak 011 omzet total & riwayat membaca transactions_all (termasuk arsip),
+-- jadi "Hapus Riwayat" / "RESET PABRIK" harus ikut mengosongkan arsip; kalau
+-- tidak, omzet & riwayat tetap menampilkan penjualan lama sementara rollup
+-- sales_daily sudah kosong. Reservasi keranjang untuk SN yang sudah tidak ada
+-- juga ikut dibuang. Mengganti daftar tabel yang diizinkan di 008.
+-- ==========================================
+
+create or replace function purge_batch(p_table text, p_batch int default 5000)
+returns int
+language plpgsql as $$
+declare
+  n int;
+begin
+  if p_table not in ('inventory', 'transactions', 'import_logs', 'inventory_archive', 'transactions_archive',
+                     'sales_daily', 'intake_daily', 'cart_reservations') then
+    raise exception 'Tabel tidak diizinkan: %', p_table;
+  end if;
+  execute format('delete from %I where ctid in (select ctid from %I limit %s)', p_table, p_table, p_batch);
+  get diagnostics n = row_count;
+  return n;
+end;
+$$;
+
+create or replace function truncate_tables(p_tables text[])
+returns void
+language plpgsql as $$
+declare
+  t text;
+begin
+  foreach t in array p_tables loop
+    if t not in ('inventory', 'transactions', 'import_logs', 'inventory_archive', 'transactions_archive',
+                 'sales_daily', 'intake_daily', 'cart_reservations') then
+      raise exception 'Tabel tidak diizinkan: %', t;
+    end if;
+  end loop;
+  execute 'truncate table ' || (select string_agg(format('%I', t), ', ') from unnest(p_tables) t);
+end;
+$$;